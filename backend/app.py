@@ -1,15 +1,57 @@
-from flask import Flask, jsonify, send_from_directory
+# Imported first so boot timings include loading Flask and the data modules
+from startup import boot_timeline
+from flask import Flask, Response, g, jsonify, request, send_from_directory
 from flask_cors import CORS
+from werkzeug.wsgi import wrap_file
+import hashlib
 import os
+import threading
 import time
 
+import numpy as np
+
 # Import data fetching functions from get_data module
 from get_data import (
     fetch_players, 
+    get_injuries,
+    get_bio,
     get_season_info,
     get_last_season,
+    get_available_seasons,
+    upstream_flight,
+    upstream_client,
+    get_join_index,
+    load_player_cache,
+    patch_player_injuries,
+    patch_player_bios,
+    refresh_rosters,
+    roster_tracker,
+    get_game_log_store,
+    ingest_game_logs,
+    ESPN_TEAM_IDS,
     NBA_API_AVAILABLE
 )
+from refresher import BackgroundRefresher
+from serialization import BodyCache, choose_encoding, iter_ndjson, serialize_payload
+from player_table import columnar_payload, parse_fields, rows_payload
+from season_store import SeasonStore, season_start_year
+from injury_feed import InjuryFeed, diff_injuries
+from rankings import RankingCache, parse_flag, parse_weights
+from projections import SEASON_GAMES, ProjectionEngine, band
+from game_logs import WINDOWS
+from comparison import (
+    SORT_KEYS as COMPARISON_SORT_KEYS, STAT_FIELDS as COMPARISON_STAT_FIELDS, ComparisonCache
+)
+from similarity import FEATURES as SIMILARITY_FEATURES, MAX_K as SIMILAR_MAX_K, MIN_GAMES as SIMILAR_MIN_GAMES
+from draft import (
+    DEFAULT_SIMULATIONS as DEFAULT_DRAFT_SIMULATIONS, DEFAULT_TEAMS, MAX_SIMULATIONS as MAX_DRAFT_SIMULATIONS,
+    MAX_TEAMS, DraftSimulator, parse_slots
+)
+from single_flight import SingleFlight
+from scoring import POSITION_BUCKETS
+from metrics import (
+    CACHE_REQUESTS, CONTENT_TYPE, ENDPOINT_LATENCY, PAYLOAD_SIZE, SNAPSHOT_AGE, render_all
+)
 
 
 app = Flask(__name__, static_folder='../frontend', static_url_path='')
@@ -19,30 +61,427 @@ CORS(app)
 cache = {
     'data': None,
     'timestamp': 0,
-    'duration': 3600  # Cache for 1 hour
+    'duration': 3600,  # Cache for 1 hour
+    'refresh_ahead': 300  # Rebuild 5 minutes before expiry
 }
 
 # Cache for injury data
 injury_cache = {
     'data': None,
     'timestamp': 0,
-    'duration': 21600  # Cache for 6 hours
+    'duration': 21600,  # Cache for 6 hours
+    'refresh_interval': 120  # Poll ESPN for injury changes every 2 minutes
 }
 
 # Cache for player bio data
 bio_cache = {
     'data': None,
     'timestamp': 0,
-    'duration': 86400  # Cache for 24 hours
+    'duration': 86400,  # Cache for 24 hours
+    'refresh_interval': 300  # Re-check a rolling batch of the stalest team rosters every 5 minutes
 }
 
 # Cache for last season data 
 last_season_cache = {
     'data': None,
     'timestamp': 0,
-    'duration': 604800  # Cache for 7 days
+    'duration': 604800,  # Cache for 7 days
+    'refresh_ahead': 3600,  # Rebuild 1 hour before expiry
+    'eager': False  # Only fetched once someone asks for last season
 }
 
+def fetch_current_players():
+    return fetch_players(cache, injury_cache, bio_cache)
+
+def fetch_last_season_players():
+    last_season = get_last_season()['stats_season']
+    return fetch_players(last_season_cache, injury_cache, bio_cache, season=last_season)
+
+# Change feed of injury deltas found by the injury poller
+injury_feed = InjuryFeed()
+
+def poll_injuries():
+    """
+    Fetch the latest ESPN injuries, diff them against the previous response and
+    patch only the affected players in every cached player snapshot.
+    """
+    previous = injury_cache['data']
+    previous_timestamp = injury_cache['timestamp']
+    current = get_injuries(injury_cache, force=True)
+    if injury_cache['timestamp'] == previous_timestamp:
+        # ESPN failed and the old data was kept, let the refresher back off
+        return None
+    
+    # The first poll only establishes a baseline
+    if previous is None:
+        injury_feed.record([])
+        return True
+    
+    changes = diff_injuries(previous, current)
+    snapshot = cache.get('snapshot')
+    for change in changes:
+        row = snapshot['index'].row_for(change['espn_id'], change['name']) if snapshot else None
+        change['player_id'] = snapshot['data']['players'][row]['player_id'] if row is not None else None
+    injury_feed.record(changes)
+    
+    if changes:
+        patched = sum(patch_player_injuries(cache_dict, changes) for cache_dict in player_caches())
+        print(f"🚑 {len(changes)} injury changes, patched {patched} players")
+    return True
+
+def player_caches():
+    """Player caches that follow live injuries and rosters (historical seasons keep the data they were built with)"""
+    return [cache, last_season_cache]
+
+def refresh_bio(team_abbrs=None):
+    """
+    Incrementally refresh rosters (a rolling batch of stale teams, or the given teams)
+    and patch only the players whose bio changed. Returns the number of players patched.
+    """
+    changed = refresh_rosters(bio_cache, team_abbrs)
+    if not changed:
+        return 0
+    patched = sum(patch_player_bios(cache_dict, changed) for cache_dict in player_caches())
+    print(f"📺 {len(changed)} bio changes, patched {patched} players")
+    return patched
+
+def poll_rosters():
+    """Refresher job for bio data: a full fetch when empty, then rolling per-team refreshes"""
+    if bio_cache['data'] is None:
+        return get_bio(bio_cache, force=True)
+    refresh_bio()
+    return True
+
+# Per-game logs for the current season, appended incrementally
+game_log_cache = {
+    'data': None,
+    'timestamp': 0,
+    'duration': 86400,
+    'refresh_interval': 3600  # Look for newly finished games every hour
+}
+
+def poll_game_logs():
+    """Append the current season's new games to its game log store"""
+    stats_season = get_season_info()['stats_season']
+    ingest_game_logs(stats_season)
+    game_log_cache['data'] = get_game_log_store(stats_season).stats()
+    game_log_cache['timestamp'] = time.time()
+    return True
+
+# Picks up snapshots published by other worker processes between refreshes
+shared_sync_cache = {
+    'data': None,
+    'timestamp': 0,
+    'duration': float('inf'),
+    'refresh_interval': 10  # Check the snapshot store every 10 seconds
+}
+
+def sync_shared_snapshots():
+    """Load player snapshots another worker has written since ours were built"""
+    seasons = {
+        'players': (cache, get_season_info()['stats_season']),
+        'last_season': (last_season_cache, get_last_season()['stats_season'])
+    }
+    loaded = [
+        name for name, (cache_dict, stats_season) in seasons.items()
+        if cache_dict['data'] is not None and load_player_cache(cache_dict, stats_season)
+    ]
+    shared_sync_cache['data'] = {'loaded': loaded}
+    shared_sync_cache['timestamp'] = time.time()
+    return True
+
+# Custom-weight rankings, keyed by weight vector, age adjustment and season
+ranking_cache = RankingCache()
+
+# Monte Carlo projections, simulated once per snapshot on a process pool
+projection_engine = ProjectionEngine()
+projection_flight = SingleFlight()
+columnar_flight = SingleFlight()
+projected_flight = SingleFlight()
+projected_bodies = BodyCache()
+
+# VORP and snake draft simulations per league settings
+draft_simulator = DraftSimulator()
+
+# Season-over-season joins and deltas per snapshot pair
+comparison_cache = ComparisonCache()
+
+# Background refresher keeps every cache warm (policies can be overridden with env vars)
+refresher = BackgroundRefresher()
+refresher.register('players', cache, fetch_current_players)
+refresher.register('injuries', injury_cache, poll_injuries)
+refresher.register('bio', bio_cache, poll_rosters)
+refresher.register('last_season', last_season_cache, fetch_last_season_players)
+refresher.register('shared_sync', shared_sync_cache, sync_shared_snapshots)
+refresher.register('game_logs', game_log_cache, poll_game_logs)
+
+# Historical seasons, persisted permanently and kept in memory under an LRU budget
+season_store = SeasonStore(
+    lambda entry, season: fetch_players(entry, injury_cache, bio_cache, season=season)
+)
+
+# How the server gets its first player snapshot: 'snapshot' serves the last one persisted to
+# disk right away (marked stale when old) and refreshes in the background, 'fetch' blocks
+# startup on a full upstream fetch
+BOOT_MODE = os.environ.get('BOOT_MODE', 'snapshot')
+boot_lock = threading.Lock()
+
+def boot():
+    """
+    Load the current season's last persisted snapshot, however old, so the first request is
+    served from disk instead of waiting on upstream; the refresher rebuilds it in the
+    background once due. Runs once per process.
+    """
+    if 'mode' in boot_timeline.info:
+        return
+    with boot_lock:
+        if 'mode' in boot_timeline.info:
+            return
+        if BOOT_MODE == 'fetch':
+            fetch_current_players()
+        elif cache['data'] is None:
+            load_player_cache(cache, get_season_info()['stats_season'], allow_stale=True)
+        boot_timeline.mark('snapshot_loaded')
+        boot_timeline.info['mode'] = BOOT_MODE
+        boot_timeline.info['booted_stale'] = cache['data'] is not None and refresher.is_stale('players')
+
+def record_snapshot_request(name, snapshot):
+    """Count a player cache lookup as a hit, a stale hit or a miss (snapshot is None)"""
+    if snapshot is None:
+        CACHE_REQUESTS.inc(cache=name, result='miss')
+    else:
+        CACHE_REQUESTS.inc(cache=name, result='stale' if refresher.is_stale(name) else 'hit')
+
+def peek_snapshot(name, cache_dict, record=True):
+    """
+    Return the last good snapshot of a player cache without ever blocking,
+    scheduling a background refresh when it is due. None on a cold cache.
+    record=False leaves counting the lookup to the caller.
+    """
+    snapshot = cache_dict.get('snapshot')
+    if record:
+        record_snapshot_request(name, snapshot)
+    if snapshot and refresher.is_due(name):
+        refresher.trigger(name)
+    return snapshot
+
+def get_snapshot(name, cache_dict, fetch):
+    """Like peek_snapshot, but a cold (empty) cache fetches inline"""
+    snapshot = peek_snapshot(name, cache_dict)
+    if snapshot:
+        return snapshot
+
+    fetch()
+    return cache_dict.get('snapshot')
+
+def unknown_season(season):
+    """404 response for a season outside the available range, None if it is valid"""
+    available_seasons = get_available_seasons()
+    if season_start_year(season) is None or season not in available_seasons:
+        return jsonify({
+            'error': 'Unknown season',
+            'message': f'Season must be one of: {", ".join(available_seasons)}'
+        }), 404
+    return None
+
+def unknown_format(wire_format):
+    """400 response for an unsupported ?format=, None if it is valid"""
+    if wire_format not in PLAYER_FORMATS:
+        return jsonify({
+            'error': 'Unknown format',
+            'message': f'format must be one of: {", ".join(PLAYER_FORMATS)}'
+        }), 400
+    return None
+
+def serialize_columnar(snapshot):
+    """Serialize a snapshot in the columnar format unless a coalesced caller already did"""
+    if 'columnar_body' not in snapshot:
+        snapshot['columnar_body'] = serialize_payload(columnar_payload(snapshot['data']))
+    return snapshot['columnar_body']
+
+def peek_body(snapshot, wire_format='rows'):
+    """A snapshot's pre-serialized body in a wire format, None if it hasn't been serialized yet (or is unknown)"""
+    if wire_format == 'columnar':
+        return snapshot.get('columnar_body')
+    return snapshot['body'] if wire_format == 'rows' else None
+
+def snapshot_body(snapshot, wire_format='rows'):
+    """A snapshot's pre-serialized body in a wire format; the columnar one is serialized on first use"""
+    body = peek_body(snapshot, wire_format)
+    if body is None:
+        body = columnar_flight.do(snapshot['body']['etag'], serialize_columnar, snapshot)
+    return body
+
+def serialize_projection(key, snapshot, wire_format, fields):
+    """Serialize a snapshot projected to fields unless a coalesced caller already did"""
+    body = projected_bodies.get(key)
+    if body is None:
+        payload = columnar_payload if wire_format == 'columnar' else rows_payload
+        body = serialize_payload(payload(snapshot['data'], fields))
+        projected_bodies.put(key, body)
+    return body
+
+def ndjson_response(snapshot, fields):
+    """Stream a snapshot's players in rank order as NDJSON, one (projected) player per line"""
+    etag = hashlib.sha256(repr((snapshot['body']['etag'], fields)).encode('utf-8')).hexdigest()[:32]
+    headers = {
+        'ETag': f'W/"{etag}"',
+        'Cache-Control': PLAYERS_CACHE_CONTROL,
+        'X-Total-Count': str(len(snapshot['data']['players'])),
+        'X-Stats-Season': snapshot['data']['stats_season']
+    }
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=headers)
+
+    # Rows are materialized one at a time as the stream is read, so the first chunk doesn't wait on the rest
+    players = snapshot['data']['players']
+    rows = (players.row(row, fields) for row in snapshot['index'].orders['fantasy'].tolist())
+    return Response(iter_ndjson(rows), headers=headers, mimetype='application/x-ndjson')
+
+def freshness_headers(name, snapshot):
+    """Age of a served snapshot, flagged stale once past its cache duration (e.g. right after booting from disk)"""
+    headers = {'X-Snapshot-Age': str(int(time.time() - snapshot['timestamp']))}
+    if refresher.is_stale(name):
+        headers['X-Snapshot-Stale'] = 'true'
+    return headers
+
+def player_list_response(snapshot, wire_format, name=None):
+    """
+    A player list snapshot in the requested wire format, projected to ?fields= when given.
+    name is the refresher job of a TTL cache, whose freshness is sent along in headers.
+    """
+    try:
+        fields = parse_fields(request.args.get('fields'), snapshot['data']['players'].names)
+    except ValueError as e:
+        return jsonify({'error': 'Invalid fields', 'message': str(e)}), 400
+
+    if wire_format == 'ndjson':
+        response = ndjson_response(snapshot, fields)
+    elif fields is None:
+        response = serialized_response(snapshot_body(snapshot, wire_format))
+    else:
+        key = (snapshot['body']['etag'], wire_format, fields)
+        body = projected_bodies.get(key)
+        if body is None:
+            body = projected_flight.do(key, serialize_projection, key, snapshot, wire_format, fields)
+        response = serialized_response(body)
+
+    if name:
+        response.headers.update(freshness_headers(name, snapshot))
+    return response
+
+def season_cache_name(season):
+    """Refresher job name of the TTL cache holding a season, None for historical seasons"""
+    if season == get_season_info()['stats_season']:
+        return 'players'
+    if season == get_last_season()['stats_season']:
+        return 'last_season'
+    return None
+
+def season_snapshot(season):
+    """Snapshot for any available season"""
+    # The current and last season keep their own TTL caches, older seasons never change
+    name = season_cache_name(season)
+    if name == 'players':
+        return get_snapshot('players', cache, fetch_current_players)
+    if name == 'last_season':
+        return get_snapshot('last_season', last_season_cache, fetch_last_season_players)
+    return season_store.get(season)
+
+def project_snapshot(snapshot):
+    """Simulate a snapshot's projections unless a coalesced caller already did"""
+    if 'projections' not in snapshot:
+        # Seeded by the body's content hash so every worker projects the same snapshot identically
+        players = snapshot['data']['players'].records()
+        snapshot['projections'] = projection_engine.project(players, snapshot['body']['etag'])
+    return snapshot['projections']
+
+def snapshot_projections(snapshot):
+    """Projection bands for a snapshot, simulated on first use and kept with the snapshot"""
+    projections = snapshot.get('projections')
+    if projections is None:
+        projections = projection_flight.do(snapshot['body']['etag'], project_snapshot, snapshot)
+    return projections
+
+# Players listed per pick only when they are still there in at least 5% of simulated drafts
+MIN_AVAILABILITY = 0.05
+
+# Projected quantities the projections endpoint can sort by (P50, best first)
+PROJECTION_SORT_KEYS = ['value', 'season_points', 'games']
+
+# Wire formats of the player list endpoints: one object per player, one array per field,
+# or one player per line streamed in rank order
+PLAYER_FORMATS = ('rows', 'columnar', 'ndjson')
+
+# Largest page the query endpoint will return
+MAX_QUERY_LIMIT = 500
+
+# Browsers may reuse a player payload for a minute, then revalidate with the ETag
+PLAYERS_CACHE_CONTROL = 'public, max-age=60, stale-while-revalidate=300'
+
+def negotiate_body(body, if_none_match, accept_encodings):
+    """
+    Pick the status, headers and bytes for a pre-serialized snapshot body,
+    answering 304 when the client's ETag still matches. Shared by the Flask
+    views and the async server.
+    """
+    headers = {
+        'ETag': f'W/"{body["etag"]}"',
+        'Cache-Control': PLAYERS_CACHE_CONTROL,
+        'Vary': 'Accept-Encoding'
+    }
+
+    if if_none_match.contains_weak(body['etag']):
+        return 304, headers, b''
+
+    headers['Content-Type'] = 'application/json'
+    encoding = choose_encoding(body, accept_encodings)
+    if encoding:
+        headers['Content-Encoding'] = encoding
+        return 200, headers, body[encoding]
+    return 200, headers, body['raw']
+
+def serialized_response(body):
+    """Serve a pre-serialized snapshot body, streaming memory-mapped bodies from their files"""
+    status, headers, payload = negotiate_body(body, request.if_none_match, request.accept_encodings)
+
+    # Shared bodies go out through wsgi.file_wrapper (sendfile on gunicorn) instead of being copied
+    path = body.get('files', {}).get(headers.get('Content-Encoding', 'raw')) if status == 200 else None
+    if path:
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            pass  # Generation pruned since we mapped it, fall back to the mapped bytes
+        else:
+            headers['Content-Length'] = str(len(payload))
+            return Response(wrap_file(request.environ, f), status=status, headers=headers,
+                            direct_passthrough=True)
+
+    if isinstance(payload, memoryview):
+        payload = payload.tobytes()
+    return Response(payload, status=status, headers=headers)
+
+# Time every request by route for the endpoint latency histograms
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+    # WSGI servers like gunicorn never run __main__, boot and start the refresher in each worker instead
+    if app.config.get('START_REFRESHER', True):
+        boot()
+        refresher.start()
+
+@app.after_request
+def record_latency(response):
+    boot_timeline.mark('first_request')
+    start_time = g.pop('request_start', None)
+    if start_time is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        ENDPOINT_LATENCY.observe(
+            time.perf_counter() - start_time,
+            endpoint=endpoint, method=request.method, status=response.status_code
+        )
+    return response
+
 # Serve the frontend
 @app.route('/')
 def index():
@@ -54,13 +493,89 @@ def health_check():
     season_info = get_season_info()
     last_season_info = get_last_season()
     
+    join_report = get_join_index().last_report
+    
+    # Per-source timings of the last player fetch
+    snapshot = cache.get('snapshot') or {}
+    last_fetch = {
+        'timings': snapshot.get('timings'),
+        'generation': snapshot.get('sequence'),
+        'degraded_sources': snapshot.get('degraded', [])
+    }
+    
     return jsonify({
         "status": "ok", 
         "nba_api_available": NBA_API_AVAILABLE,
         "season_info": season_info,
-        "last_season_info": last_season_info
+        "last_season_info": last_season_info,
+        "available_seasons": get_available_seasons(),
+        "season_store": season_store.stats(),
+        "coalesced_requests": upstream_flight.stats(),
+        "circuit_breakers": upstream_client.stats(),
+        "rosters": roster_tracker.stats(),
+        "rankings_cache": ranking_cache.stats(),
+        "projected_bodies": projected_bodies.stats(),
+        "projections": projection_engine.stats(),
+        "draft_simulations": draft_simulator.stats(),
+        "comparisons": comparison_cache.stats(),
+        "game_logs": game_log_cache['data'],
+        "boot": boot_timeline.report(),
+        "last_fetch": last_fetch,
+        "join_report": {
+            "matched": join_report['matched'],
+            "unmatched": len(join_report['unmatched']),
+            "methods": join_report['methods']
+        }
     })
 
+# API endpoint exposing metrics in the Prometheus text format
+@app.route('/api/metrics')
+def metrics():
+    # Ages and payload sizes are sampled at scrape time
+    now = time.time()
+    cache_dicts = {
+        'players': cache,
+        'injuries': injury_cache,
+        'bio': bio_cache,
+        'last_season': last_season_cache
+    }
+    SNAPSHOT_AGE.clear()
+    PAYLOAD_SIZE.clear()
+    for name, cache_dict in cache_dicts.items():
+        if cache_dict['data'] is not None:
+            SNAPSHOT_AGE.set(now - cache_dict['timestamp'], cache=name)
+        snapshot = cache_dict.get('snapshot')
+        if snapshot:
+            for encoding in ('raw', 'gzip', 'br'):
+                if snapshot['body'].get(encoding):
+                    PAYLOAD_SIZE.set(len(snapshot['body'][encoding]), cache=name, encoding=encoding)
+    
+    return Response(render_all(), content_type=CONTENT_TYPE)
+
+# API endpoint to re-check one team's ESPN roster right away (e.g. after a trade or signing)
+@app.route('/api/rosters/<team>/refresh', methods=['POST'])
+def refresh_team_roster(team):
+    team = team.upper()
+    if team not in ESPN_TEAM_IDS:
+        return jsonify({
+            'error': 'Unknown team',
+            'message': f'Team must be one of: {", ".join(ESPN_TEAM_IDS)}'
+        }), 404
+
+    if bio_cache['data'] is None:
+        get_bio(bio_cache)
+    patched = refresh_bio([team])
+    return jsonify({
+        'team': team,
+        'players_patched': patched,
+        'rosters': roster_tracker.stats()
+    })
+
+# API endpoint listing NBA players that could not be joined to ESPN bio data
+@app.route('/api/join-report')
+def join_report():
+    return jsonify(get_join_index().last_report)
+
 # API endpoint to get player stats 
 @app.route('/api/players')
 def get_players():
@@ -72,23 +587,24 @@ def get_players():
             "message": "Run: pip3 install nba_api flask flask-cors"
         }), 500
 
-    # Check cache first
-    current_time = time.time()
-    
-    if cache['data'] and (current_time - cache['timestamp']) < cache['duration']:
-        cache_age = current_time - cache['timestamp']
-        response_time = time.time() - start_time
-        print(f"📦 Cache: {response_time:.3f}s (age: {cache_age:.0f}s)")
-        return jsonify(cache['data'])
-    
-    # If no cache, fetch fresh data
-    fetch_start = time.time()
-    fresh_data = fetch_players(cache, injury_cache, bio_cache)
+    wire_format = request.args.get('format', 'rows')
+    error = unknown_format(wire_format)
+    if error:
+        return error
+
+    # Serve the last good snapshot, stale snapshots are refreshed in the background
+    was_cached = cache.get('snapshot') is not None
+    snapshot = get_snapshot('players', cache, fetch_current_players)
     
-    if fresh_data:
+    if snapshot:
         total_time = time.time() - start_time
-        print(f"🔄 Fresh: {total_time:.3f}s")
-        return jsonify(fresh_data)
+        if was_cached:
+            cache_age = time.time() - snapshot['timestamp']
+            stale = ' stale' if refresher.is_stale('players') else ''
+            print(f"📦 Cache{stale}: {total_time:.3f}s (age: {cache_age:.0f}s)")
+        else:
+            print(f"🔄 Fresh: {total_time:.3f}s")
+        return player_list_response(snapshot, wire_format, 'players')
     else:
         error_time = time.time() - start_time
         print(f"❌ Error: {error_time:.3f}s")
@@ -97,6 +613,541 @@ def get_players():
             'message': 'Could not retrieve player data'
         }), 500
 
+# API endpoint to filter, sort and paginate current season players
+@app.route('/api/players/query')
+def query_players():
+    if not NBA_API_AVAILABLE:
+        return jsonify({
+            "error": "nba_api not installed",
+            "message": "Run: pip3 install nba_api flask flask-cors"
+        }), 500
+
+    # Data and indexes come from the same snapshot
+    snapshot = get_snapshot('players', cache, fetch_current_players)
+    if not snapshot:
+        return jsonify({
+            'error': 'Failed to fetch NBA data',
+            'message': 'Could not retrieve player data'
+        }), 500
+
+    args = request.args
+    try:
+        min_games = args.get('min_games', type=int)
+        offset = max(args.get('offset', 0, type=int), 0)
+        limit = min(max(args.get('limit', 50, type=int), 1), MAX_QUERY_LIMIT)
+        total, players = snapshot['index'].query(
+            team=args.get('team'),
+            position=args.get('position'),
+            injury=args.get('injury'),
+            min_games=min_games,
+            name_prefix=args.get('q'),
+            sort=args.get('sort', 'fantasy'),
+            direction=args.get('direction', 'desc'),
+            offset=offset,
+            limit=limit
+        )
+    except ValueError as e:
+        return jsonify({
+            'error': 'Invalid query',
+            'message': str(e)
+        }), 400
+
+    return jsonify({
+        'players': players,
+        'total_count': total,
+        'offset': offset,
+        'limit': limit,
+        'stats_season': snapshot['data']['stats_season']
+    })
+
+# API endpoint to rank a season under custom scoring weights (e.g. ?weights=fg3m:3,reb:1.5&age_adjust=off)
+@app.route('/api/rankings')
+def get_rankings():
+    if not NBA_API_AVAILABLE:
+        return jsonify({
+            "error": "nba_api not installed",
+            "message": "Run: pip3 install nba_api flask flask-cors"
+        }), 500
+
+    args = request.args
+    try:
+        weights = parse_weights(args.get('weights'))
+        age_adjust = parse_flag(args.get('age_adjust'))
+        position = (args.get('position') or '').upper() or None
+        if position and position not in POSITION_BUCKETS:
+            raise ValueError(f'Position must be one of: {", ".join(POSITION_BUCKETS)}')
+        offset = max(args.get('offset', 0, type=int), 0)
+        limit = min(max(args.get('limit', 50, type=int), 1), MAX_QUERY_LIMIT)
+    except ValueError as e:
+        return jsonify({
+            'error': 'Invalid query',
+            'message': str(e)
+        }), 400
+
+    season = args.get('season') or get_season_info()['stats_season']
+    error = unknown_season(season)
+    if error:
+        return error
+
+    snapshot = season_snapshot(season)
+    if not snapshot:
+        return jsonify({
+            'error': 'Failed to fetch NBA data',
+            'message': f'Could not retrieve player data for {season}'
+        }), 500
+
+    # One matrix-vector product and argsort per distinct weight vector, then served from the LRU
+    values, order = ranking_cache.rank(snapshot, season, weights, age_adjust)
+    if position:
+        order = order[snapshot['ranking'].position_masks[position][order]]
+
+    players = snapshot['data']['players']
+    page = []
+    for rank, row in enumerate(order[offset:offset + limit], start=offset + 1):
+        player = players[row]
+        page.append({
+            'rank': rank,
+            'player_id': player.get('player_id'),
+            'espn_id': player.get('espn_id'),
+            'name': player.get('name'),
+            'team': player.get('team'),
+            'position': player.get('position'),
+            'games_played': player.get('games_played'),
+            'injury_status': player.get('injury_status'),
+            'fantasy_value': round(float(values[row]), 3),
+            'default_rank': player.get('overall_rank')
+        })
+
+    return jsonify({
+        'players': page,
+        'total_count': len(order),
+        'offset': offset,
+        'limit': limit,
+        'weights': weights,
+        'age_adjust': age_adjust,
+        'stats_season': season
+    })
+
+# API endpoint for Monte Carlo season projections (P10/P50/P90 fantasy value, season points and games)
+@app.route('/api/projections')
+def get_projections():
+    if not NBA_API_AVAILABLE:
+        return jsonify({
+            "error": "nba_api not installed",
+            "message": "Run: pip3 install nba_api flask flask-cors"
+        }), 500
+
+    args = request.args
+    sort = args.get('sort', 'value')
+    position = (args.get('position') or '').upper() or None
+    if sort not in PROJECTION_SORT_KEYS or (position and position not in POSITION_BUCKETS):
+        return jsonify({
+            'error': 'Invalid query',
+            'message': f'sort must be one of: {", ".join(PROJECTION_SORT_KEYS)}; '
+                       f'position must be one of: {", ".join(POSITION_BUCKETS)}'
+        }), 400
+    offset = max(args.get('offset', 0, type=int), 0)
+    limit = min(max(args.get('limit', 50, type=int), 1), MAX_QUERY_LIMIT)
+
+    season = args.get('season') or get_season_info()['stats_season']
+    error = unknown_season(season)
+    if error:
+        return error
+
+    snapshot = season_snapshot(season)
+    if not snapshot:
+        return jsonify({
+            'error': 'Failed to fetch NBA data',
+            'message': f'Could not retrieve player data for {season}'
+        }), 500
+
+    projections = snapshot_projections(snapshot)
+    bands = projections['bands']
+    order = np.argsort(-bands[sort][1], kind='stable')
+    if position:
+        order = order[snapshot['ranking'].position_masks[position][order]]
+
+    players = snapshot['data']['players']
+    page = []
+    for rank, row in enumerate(order[offset:offset + limit], start=offset + 1):
+        player = players[row]
+        page.append({
+            'rank': rank,
+            'player_id': player.get('player_id'),
+            'espn_id': player.get('espn_id'),
+            'name': player.get('name'),
+            'team': player.get('team'),
+            'position': player.get('position'),
+            'games_played': player.get('games_played'),
+            'injury_status': player.get('injury_status'),
+            'injury_timeline': player.get('injury_timeline'),
+            'fantasy_value': player.get('fantasy_value'),
+            'projection': {
+                'value': band(bands, 'value', row),
+                'season_points': band(bands, 'season_points', row, None),
+                'games': band(bands, 'games', row, None)
+            }
+        })
+
+    return jsonify({
+        'players': page,
+        'total_count': len(order),
+        'offset': offset,
+        'limit': limit,
+        'sort': sort,
+        'simulations': projections['simulations'],
+        'season_games': SEASON_GAMES,
+        'computed_at': projections['computed_at'],
+        'stats_season': season
+    })
+
+def parse_picks(text, teams, rounds, draft_position):
+    """Overall picks (1-based) to report availability for: an explicit list or every pick of a draft position"""
+    total = teams * rounds
+    if text:
+        try:
+            picks = [int(pick) for pick in text.split(',') if pick.strip()]
+        except ValueError:
+            raise ValueError('picks must be a comma-separated list of integers')
+    elif draft_position:
+        if not 1 <= draft_position <= teams:
+            raise ValueError(f'draft_position must be between 1 and {teams}')
+        picks = [
+            round_index * teams + (draft_position if round_index % 2 == 0 else teams - draft_position + 1)
+            for round_index in range(rounds)
+        ]
+    else:
+        return []
+    if any(not 1 <= pick <= total for pick in picks):
+        raise ValueError(f'Picks must be between 1 and {total}')
+    return picks
+
+# API endpoint for value over replacement and snake draft availability
+# (e.g. /api/draft?teams=10&slots=C:2,BENCH:2&draft_position=4)
+@app.route('/api/draft')
+def get_draft():
+    if not NBA_API_AVAILABLE:
+        return jsonify({
+            "error": "nba_api not installed",
+            "message": "Run: pip3 install nba_api flask flask-cors"
+        }), 500
+
+    args = request.args
+    try:
+        teams = args.get('teams', DEFAULT_TEAMS, type=int)
+        if not 2 <= teams <= MAX_TEAMS:
+            raise ValueError(f'teams must be between 2 and {MAX_TEAMS}')
+        slots = parse_slots(args.get('slots'))
+        rounds = sum(slots.values())
+        simulations = args.get('simulations', DEFAULT_DRAFT_SIMULATIONS, type=int)
+        if not 0 <= simulations <= MAX_DRAFT_SIMULATIONS:
+            raise ValueError(f'simulations must be between 0 and {MAX_DRAFT_SIMULATIONS}')
+        picks = parse_picks(args.get('picks'), teams, rounds, args.get('draft_position', type=int))
+        weights = parse_weights(args.get('weights'))
+        age_adjust = parse_flag(args.get('age_adjust'))
+        limit = min(max(args.get('limit', 25, type=int), 1), MAX_QUERY_LIMIT)
+    except ValueError as e:
+        return jsonify({
+            'error': 'Invalid query',
+            'message': str(e)
+        }), 400
+
+    season = args.get('season') or get_season_info()['stats_season']
+    error = unknown_season(season)
+    if error:
+        return error
+
+    snapshot = season_snapshot(season)
+    if not snapshot:
+        return jsonify({
+            'error': 'Failed to fetch NBA data',
+            'message': f'Could not retrieve player data for {season}'
+        }), 500
+
+    # Values come from the rankings cache, so custom league scoring carries through to VORP
+    values, _ = ranking_cache.rank(snapshot, season, weights, age_adjust)
+    draft = draft_simulator.analyze(
+        snapshot, values, teams, slots, simulations, key=(season, tuple(sorted(weights.items())), age_adjust)
+    )
+    vorp = draft['vorp']
+    by_vorp = np.argsort(-vorp, kind='stable')
+    players = snapshot['data']['players']
+
+    def player_summary(row):
+        player = players[row]
+        return {
+            'player_id': player.get('player_id'),
+            'name': player.get('name'),
+            'team': player.get('team'),
+            'position': player.get('position'),
+            'fantasy_value': round(float(values[row]), 3),
+            'vorp': round(float(vorp[row]), 3)
+        }
+
+    board = []
+    for rank, row in enumerate(by_vorp[:limit], start=1):
+        entry = dict(player_summary(row), rank=rank)
+        if simulations:
+            adp = draft['adp'][row]
+            entry['adp'] = None if np.isnan(adp) else round(float(adp), 1)
+            entry['draft_rate'] = round(float(draft['draft_rate'][row]), 3)
+        board.append(entry)
+
+    # Best players by VORP with a real chance of still being there at each requested pick
+    availability = []
+    if simulations:
+        for pick in picks:
+            chances = draft['availability'][:, pick - 1]
+            likely = by_vorp[chances[by_vorp] >= MIN_AVAILABILITY][:limit]
+            availability.append({
+                'pick': pick,
+                'round': (pick - 1) // teams + 1,
+                'team': int(draft['order'][pick - 1]) + 1,
+                'available': [
+                    dict(player_summary(row), probability=round(float(chances[row]), 3)) for row in likely
+                ]
+            })
+
+    return jsonify({
+        'teams': teams,
+        'rounds': rounds,
+        'slots': slots,
+        'simulations': simulations,
+        'replacement_levels': {bucket: round(level, 3) for bucket, level in draft['levels'].items()},
+        'players': board,
+        'picks': availability,
+        'stats_season': season
+    })
+
+# API endpoint ranking players over their last 5, 10 or 30 games (trend = change vs their season average)
+@app.route('/api/game-logs/rolling')
+def get_rolling_stats():
+    args = request.args
+    window = args.get('window', 10, type=int)
+    sort = args.get('sort', 'fantasy_value')
+    if window not in WINDOWS or sort not in ('fantasy_value', 'trend'):
+        return jsonify({
+            'error': 'Invalid query',
+            'message': f'window must be one of: {", ".join(map(str, WINDOWS))}; sort must be fantasy_value or trend'
+        }), 400
+    min_games = args.get('min_games', min(window, 5), type=int)
+    offset = max(args.get('offset', 0, type=int), 0)
+    limit = min(max(args.get('limit', 50, type=int), 1), MAX_QUERY_LIMIT)
+
+    store = get_game_log_store(get_season_info()['stats_season'])
+    rows = [row for row in store.rolling(window) if row['games'] >= min_games]
+    rows.sort(key=lambda row: row[sort], reverse=True)
+
+    return jsonify({
+        'players': rows[offset:offset + limit],
+        'total_count': len(rows),
+        'offset': offset,
+        'limit': limit,
+        'window': window,
+        'stats_season': store.season,
+        'last_date': store.stats()['last_date']
+    })
+
+# API endpoint for one player's latest games and rolling 5/10/30-game averages
+@app.route('/api/players/<int:player_id>/game-log')
+def get_player_game_log(player_id):
+    limit = min(max(request.args.get('limit', 30, type=int), 1), 82)
+    store = get_game_log_store(get_season_info()['stats_season'])
+    game_log = store.player(player_id, limit)
+    if game_log is None:
+        return jsonify({
+            'error': 'Unknown player',
+            'message': f'No games logged for player {player_id} in {store.season}'
+        }), 404
+    return jsonify(dict(game_log, stats_season=store.season))
+
+# API endpoint for the players whose per-game stats are closest to a player's (e.g. later picks who play like them)
+@app.route('/api/players/<int:player_id>/similar')
+def get_similar_players(player_id):
+    if not NBA_API_AVAILABLE:
+        return jsonify({
+            "error": "nba_api not installed",
+            "message": "Run: pip3 install nba_api flask flask-cors"
+        }), 500
+
+    args = request.args
+    try:
+        k = args.get('k', 10, type=int)
+        if not 1 <= k <= SIMILAR_MAX_K:
+            raise ValueError(f'k must be between 1 and {SIMILAR_MAX_K}')
+        position = (args.get('position') or '').upper() or None
+        if position and position not in POSITION_BUCKETS:
+            raise ValueError(f'Position must be one of: {", ".join(POSITION_BUCKETS)}')
+        injury = (args.get('injury') or '').lower() or None
+        if injury and injury not in ('healthy', 'injured'):
+            raise ValueError('injury must be healthy or injured')
+        later = parse_flag(args.get('later'), default=False)
+    except ValueError as e:
+        return jsonify({
+            'error': 'Invalid query',
+            'message': str(e)
+        }), 400
+
+    season = args.get('season') or get_season_info()['stats_season']
+    error = unknown_season(season)
+    if error:
+        return error
+
+    snapshot = season_snapshot(season)
+    if not snapshot:
+        return jsonify({
+            'error': 'Failed to fetch NBA data',
+            'message': f'Could not retrieve player data for {season}'
+        }), 500
+
+    index = snapshot['similarity']
+    player_row = index.row(player_id)
+    if player_row is None:
+        return jsonify({
+            'error': 'Unknown player',
+            'message': f'No player {player_id} with at least {SIMILAR_MIN_GAMES} games in {season}'
+        }), 404
+
+    players = snapshot['data']['players']
+    player = players[player_row]
+
+    # Filters are boolean masks over snapshot rows, applied to the presorted neighbors
+    mask = None
+    if position:
+        mask = snapshot['ranking'].position_masks[position]
+    if injury:
+        healthy = index.healthy if injury == 'healthy' else ~index.healthy
+        mask = healthy if mask is None else mask & healthy
+    if later:
+        # Only players ranked below this one, i.e. likely to go later in drafts
+        ranks = snapshot['index'].positions_in_order['fantasy']
+        ranked_later = ranks > ranks[player_row]
+        mask = ranked_later if mask is None else mask & ranked_later
+
+    rows, distances = index.query(player_id, k, mask)
+    similar = []
+    for row, distance in zip(rows, distances):
+        match = players[row]
+        similar.append({
+            'player_id': match.get('player_id'),
+            'espn_id': match.get('espn_id'),
+            'name': match.get('name'),
+            'team': match.get('team'),
+            'position': match.get('position'),
+            'injury_status': match.get('injury_status'),
+            'overall_rank': match.get('overall_rank'),
+            'fantasy_value': match.get('fantasy_value'),
+            'distance': round(float(distance), 3)
+        })
+
+    return jsonify({
+        'player': {
+            'player_id': player_id,
+            'name': player.get('name'),
+            'team': player.get('team'),
+            'position': player.get('position'),
+            'overall_rank': player.get('overall_rank'),
+            'fantasy_value': player.get('fantasy_value')
+        },
+        'similar': similar,
+        'k': k,
+        'features': SIMILARITY_FEATURES,
+        'stats_season': season
+    })
+
+# API endpoint comparing two seasons player by player (e.g. ?from=2025-26&to=2026-27&sort=value_change)
+@app.route('/api/players/compare')
+def compare_seasons():
+    if not NBA_API_AVAILABLE:
+        return jsonify({
+            "error": "nba_api not installed",
+            "message": "Run: pip3 install nba_api flask flask-cors"
+        }), 500
+
+    args = request.args
+    from_season = args.get('from') or get_last_season()['stats_season']
+    to_season = args.get('to') or get_season_info()['stats_season']
+    error = unknown_season(from_season) or unknown_season(to_season)
+    if error:
+        return error
+
+    try:
+        if from_season == to_season:
+            raise ValueError('from and to must be different seasons')
+        sort = args.get('sort', 'rank_change')
+        if sort not in COMPARISON_SORT_KEYS:
+            raise ValueError(f"Unknown sort '{sort}', use one of: {', '.join(COMPARISON_SORT_KEYS)}")
+        direction = args.get('direction', 'desc')
+        if direction not in ('asc', 'desc'):
+            raise ValueError('direction must be asc or desc')
+    except ValueError as e:
+        return jsonify({
+            'error': 'Invalid query',
+            'message': str(e)
+        }), 400
+    min_games = max(args.get('min_games', 0, type=int), 0)
+    offset = max(args.get('offset', 0, type=int), 0)
+    limit = min(max(args.get('limit', 50, type=int), 1), MAX_QUERY_LIMIT)
+
+    snapshots = {}
+    for season in (from_season, to_season):
+        snapshots[season] = season_snapshot(season)
+        if not snapshots[season]:
+            return jsonify({
+                'error': 'Failed to fetch NBA data',
+                'message': f'Could not retrieve player data for {season}'
+            }), 500
+
+    # The join, deltas and sort orders are built once per snapshot pair
+    comparison = comparison_cache.compare(snapshots[from_season], snapshots[to_season])
+    total, positions = comparison.query(sort, direction, min_games, offset, limit)
+
+    from_players = snapshots[from_season]['data']['players']
+    to_players = snapshots[to_season]['data']['players']
+
+    def optional(value, digits=None):
+        if np.isnan(value):
+            return None
+        return round(float(value), digits) if digits else int(value)
+
+    season_fields = ('team', 'overall_rank', 'fantasy_value', 'games_played')
+    player_fields = ('player_id', 'espn_id', 'name', 'position') + season_fields
+
+    def player_change(position):
+        # Only the fields sent back are materialized from the player tables
+        before = from_players.row(int(comparison.from_rows[position]), season_fields)
+        after = to_players.row(int(comparison.to_rows[position]), player_fields)
+        return {
+            'player_id': after.get('player_id'),
+            'espn_id': after.get('espn_id'),
+            'name': after.get('name'),
+            'position': after.get('position'),
+            'from': {field: before.get(field) for field in season_fields},
+            'to': {field: after.get(field) for field in season_fields},
+            'rank_change': optional(comparison.rank_change[position]),
+            'value_change': optional(comparison.value_change[position], 3),
+            'per_game_change': {
+                field: round(float(comparison.stat_change[position, i]), 3 if field.endswith('_pct') else 2)
+                for i, field in enumerate(COMPARISON_STAT_FIELDS)
+            }
+        }
+
+    return jsonify({
+        'players': [player_change(position) for position in positions],
+        'risers': [player_change(position) for position in comparison.risers],
+        'fallers': [player_change(position) for position in comparison.fallers],
+        'total_count': total,
+        'offset': offset,
+        'limit': limit,
+        'sort': sort,
+        'direction': direction,
+        'matched': len(comparison),
+        'only_from': comparison.only_from,
+        'only_to': comparison.only_to,
+        'from_season': from_season,
+        'to_season': to_season
+    })
+
 # API endpoint to get last season player stats
 @app.route('/api/players/last-season')
 def get_last_season_players():
@@ -106,37 +1157,79 @@ def get_last_season_players():
             "message": "Run: pip3 install nba_api flask flask-cors"
         }), 500
 
-    # Check cache first
-    current_time = time.time()
-    if last_season_cache['data'] and (current_time - last_season_cache['timestamp']) < last_season_cache['duration']:
-        return jsonify(last_season_cache['data'])
-    
-    # If no cache, fetch fresh data for last season
-    last_season_info = get_last_season()
-    last_season = last_season_info['stats_season']
-    
-    fresh_data = fetch_players(last_season_cache, injury_cache, bio_cache, season=last_season)
+    wire_format = request.args.get('format', 'rows')
+    error = unknown_format(wire_format)
+    if error:
+        return error
+
+    # Serve the last good snapshot, fetching inline only on a cold cache
+    snapshot = get_snapshot('last_season', last_season_cache, fetch_last_season_players)
     
-    if fresh_data:
-        return jsonify(fresh_data)
+    if snapshot:
+        return player_list_response(snapshot, wire_format, 'last_season')
     else:
+        last_season = get_last_season()['stats_season']
         return jsonify({
             'error': 'Failed to fetch last season NBA data',
             'message': f'Could not retrieve player data for {last_season}'
         }), 500
 
 
+# API endpoint to pull injury changes since a timestamp (seconds since epoch)
+@app.route('/api/injuries/changes')
+def get_injury_changes():
+    since = request.args.get('since', 0, type=float)
+    changes, complete = injury_feed.since(since)
+    
+    return jsonify({
+        'changes': changes,
+        'complete': complete,
+        'last_poll': injury_feed.last_poll,
+        'server_time': time.time()
+    })
+
+# API endpoint to get player stats for any season (e.g. /api/players/2021-22)
+@app.route('/api/players/<season>')
+def get_season_players(season):
+    if not NBA_API_AVAILABLE:
+        return jsonify({
+            "error": "nba_api not installed",
+            "message": "Run: pip3 install nba_api flask flask-cors"
+        }), 500
+
+    wire_format = request.args.get('format', 'rows')
+    error = unknown_season(season) or unknown_format(wire_format)
+    if error:
+        return error
+
+    snapshot = season_snapshot(season)
+    if snapshot:
+        return player_list_response(snapshot, wire_format, season_cache_name(season))
+    else:
+        return jsonify({
+            'error': 'Failed to fetch NBA data',
+            'message': f'Could not retrieve player data for {season}'
+        }), 500
+
+
+# Everything above runs at import time, heavy upstream libraries are imported on first use
+boot_timeline.mark('imported')
+
 if __name__ == '__main__':
     print("🚀 Starting server...")
     
-    # Pre-fetch data on startup for instant loading
-    prefetch_start = time.time()
-    fetch_players(cache, injury_cache, bio_cache)
-    prefetch_time = time.time() - prefetch_start
+    # Serve the last persisted snapshot right away (BOOT_MODE=fetch waits for a full fetch instead)
+    boot()
+    
+    # Keep caches warm in the background from here on, stale snapshots are rebuilt on the first tick
+    refresher.start()
     
     port = int(os.environ.get('PORT', 5000))
+    boot_timeline.mark('ready')
     
-    print(f"✅ Startup: {prefetch_time:.3f}s")
+    phases = boot_timeline.report()['phases_ms']
+    stale = ' (stale snapshot, refreshing)' if boot_timeline.info['booted_stale'] else ''
+    print(f"✅ Startup: {phases['ready'] / 1000:.3f}s, {BOOT_MODE} boot{stale}")
     print(f"🌐 Server running on port {port}")
     
-    app.run(debug=False, host='0.0.0.0', port=port)
\ No newline at end of file
+    app.run(debug=False, host='0.0.0.0', port=port)
@@ -0,0 +1,5 @@
+"""
+Benchmark suite for the data pipeline and API endpoints.
+Upstream NBA and ESPN calls are served by a local replay server, so runs are
+repeatable and never touch the live APIs.
+"""
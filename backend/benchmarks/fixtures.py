@@ -0,0 +1,215 @@
+"""
+Fixtures for the replay server: recorded (or synthetic) upstream responses.
+
+    python -m benchmarks.fixtures --record      # record live NBA/ESPN responses
+    python -m benchmarks.fixtures --synthetic   # generate a deterministic synthetic league
+
+Files are stored under benchmarks/fixtures/ as:
+    leaguedashplayerstats.json, leaguegamelog.json, espn_injuries.json, espn_roster_<team_id>.json
+"""
+
+import argparse
+import json
+import os
+import random
+from datetime import date, timedelta
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+STATS_FIXTURE = 'leaguedashplayerstats.json'
+INJURIES_FIXTURE = 'espn_injuries.json'
+GAMELOG_FIXTURE = 'leaguegamelog.json'
+
+# Columns the pipeline reads from LeagueDashPlayerStats
+STATS_HEADERS = [
+    'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'AGE', 'GP', 'MIN',
+    'FGM', 'FG_PCT', 'FG3M', 'FG3_PCT', 'FTM', 'FT_PCT', 'REB', 'AST', 'TOV', 'STL', 'BLK', 'PTS'
+]
+
+FIRST_NAMES = ['Luka', 'Nikola', 'Jalen', 'Jaylen', 'Anthony', 'Tyrese', 'De\'Aaron', 'Domantas',
+               'Shai', 'Giannis', 'Kevin', 'Stephen', 'Jimmy', 'Bam', 'Scottie', 'Paolo', 'Franz', 'Cade']
+LAST_NAMES = ['Dončić', 'Jokić', 'Brunson', 'Brown', 'Edwards', 'Haliburton', 'Fox', 'Sabonis',
+              'Gilgeous-Alexander', 'Antetokounmpo', 'Durant', 'Curry', 'Butler', 'Adebayo', 'Barnes',
+              'Banchero', 'Wagner', 'Cunningham', 'Green', 'Williams', 'Jackson Jr.', 'Porter Jr.']
+# Columns the pipeline reads from LeagueGameLog (player mode)
+GAMELOG_HEADERS = [
+    'SEASON_ID', 'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'GAME_ID', 'GAME_DATE',
+    'MIN', 'FGM', 'FG3M', 'FTM', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PTS'
+]
+SEASON_START = date(2025, 10, 21)
+SEASON_DAYS = 174
+SEASON_GAMES = 82
+
+POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C', 'G', 'F']
+STATUSES = ['Out', 'Day-To-Day', 'Questionable']
+
+
+def roster_fixture(team_id):
+    return f'espn_roster_{team_id}.json'
+
+
+def fixture_path(name, directory=FIXTURES_DIR):
+    return os.path.join(directory, name)
+
+
+def load_fixture(name, directory=FIXTURES_DIR):
+    """Read a fixture file as raw bytes"""
+    with open(fixture_path(name, directory), 'rb') as f:
+        return f.read()
+
+
+def fixtures_exist(directory=FIXTURES_DIR):
+    return os.path.exists(fixture_path(STATS_FIXTURE, directory))
+
+
+def _write(name, data, directory):
+    os.makedirs(directory, exist_ok=True)
+    with open(fixture_path(name, directory), 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def generate_synthetic(directory=FIXTURES_DIR, players_per_team=17, seed=2025):
+    """Generate a deterministic synthetic league in the upstream response formats"""
+    from get_data import ESPN_TEAM_IDS
+
+    rng = random.Random(seed)
+    rows = []
+    injuries_by_team = []
+    next_id = 1
+
+    for team_abbr, team_id in ESPN_TEAM_IDS.items():
+        athletes = []
+        team_injuries = []
+        for _ in range(players_per_team):
+            name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {next_id}'
+            espn_id = str(4000000 + next_id)
+            games = rng.randint(0, 82)
+            fga = games * rng.uniform(2, 20)
+            fgm = int(fga * rng.uniform(0.38, 0.6))
+            fg3m = int(fgm * rng.uniform(0, 0.45))
+            fta = games * rng.uniform(0, 8)
+            ftm = int(fta * rng.uniform(0.6, 0.92))
+            age = rng.randint(19, 39)
+
+            rows.append([
+                1620000 + next_id, name, 1610612700 + team_id, team_abbr, age, games,
+                round(games * rng.uniform(8, 37), 1),
+                fgm, round(fgm / fga, 3) if fga else None, fg3m, round(rng.uniform(0.25, 0.42), 3),
+                ftm, round(ftm / fta, 3) if fta else None,
+                int(games * rng.uniform(1, 12)), int(games * rng.uniform(0.5, 9)),
+                int(games * rng.uniform(0.3, 3.5)), int(games * rng.uniform(0.2, 1.8)),
+                int(games * rng.uniform(0.1, 2.5)), 2 * fgm + fg3m + ftm
+            ])
+            athletes.append({
+                'id': espn_id,
+                'displayName': name,
+                'position': {'abbreviation': rng.choice(POSITIONS)},
+                'displayHeight': f"6' {rng.randint(0, 11)}\"",
+                'displayWeight': f'{rng.randint(180, 270)} lbs',
+                'jersey': str(rng.randint(0, 99)),
+                'age': age,
+                'birthDate': f'{2025 - age}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T07:00Z',
+                'birthPlace': {'city': 'Springfield', 'state': 'IL', 'country': 'USA'},
+                'college': {'name': rng.choice(['Duke', 'Kentucky', 'UCLA', 'Gonzaga', ''])}
+            })
+            if rng.random() < 0.12:
+                team_injuries.append({
+                    'athlete': {
+                        'displayName': name,
+                        'links': [{'href': f'https://www.espn.com/nba/player/_/id/{espn_id}/x'}],
+                        'team': {'abbreviation': team_abbr}
+                    },
+                    'status': rng.choice(STATUSES),
+                    'details': {'type': 'Knee', 'detail': 'Sprain', 'side': 'Left', 'returnDate': '2026-12-01'}
+                })
+            next_id += 1
+
+        _write(roster_fixture(team_id), {'athletes': athletes}, directory)
+        injuries_by_team.append({'injuries': team_injuries})
+
+    _write(INJURIES_FIXTURE, {'injuries': injuries_by_team}, directory)
+    _write(STATS_FIXTURE, {
+        'resource': 'leaguedashplayerstats',
+        'parameters': {},
+        'resultSets': [{'name': 'LeagueDashPlayerStats', 'headers': STATS_HEADERS, 'rowSet': rows}]
+    }, directory)
+    generate_game_logs(directory, seed)
+    print(f"Generated synthetic fixtures for {len(rows)} players in {directory}")
+
+
+def generate_game_logs(directory=FIXTURES_DIR, seed=2025):
+    """Generate per-game logs consistent with the synthetic season totals, each player on a slow trend"""
+    import numpy as np
+
+    with open(fixture_path(STATS_FIXTURE, directory), 'r', encoding='utf-8') as f:
+        stats = json.load(f)['resultSets'][0]
+    rng = np.random.default_rng(seed)
+    rows = []
+
+    for row in stats['rowSet']:
+        player = dict(zip(stats['headers'], row))
+        games = player['GP']
+        if not games:
+            continue
+        team = player['TEAM_ID'] - 1610612700
+        played = np.sort(rng.choice(SEASON_GAMES, size=games, replace=False))
+        # Production drifts linearly over the season, between -30% and +30% from first game to last
+        trend = 1 + rng.uniform(-0.3, 0.3) * (np.linspace(-0.5, 0.5, games) if games > 1 else np.zeros(1))
+        per_game = {column: (player[column] or 0) / games for column in ('MIN', 'FGM', 'FG3M', 'FTM', 'REB',
+                                                                       'AST', 'STL', 'BLK', 'TOV')}
+        draws = {column: rng.poisson(np.maximum(rate * trend, 0)) for column, rate in per_game.items()}
+        draws['FG3M'] = np.minimum(draws['FG3M'], draws['FGM'])
+
+        for i, game in enumerate(played):
+            game_date = SEASON_START + timedelta(days=int(game * SEASON_DAYS / SEASON_GAMES))
+            fgm, fg3m, ftm = int(draws['FGM'][i]), int(draws['FG3M'][i]), int(draws['FTM'][i])
+            rows.append([
+                '22025', player['PLAYER_ID'], player['PLAYER_NAME'], player['TEAM_ID'], player['TEAM_ABBREVIATION'],
+                f'00225{team:02d}{game:03d}', game_date.isoformat(), int(draws['MIN'][i]), fgm, fg3m, ftm,
+                int(draws['REB'][i]), int(draws['AST'][i]), int(draws['STL'][i]), int(draws['BLK'][i]),
+                int(draws['TOV'][i]), 2 * fgm + fg3m + ftm
+            ])
+
+    rows.sort(key=lambda game: (game[6], game[5]))
+    _write(GAMELOG_FIXTURE, {
+        'resource': 'leaguegamelog',
+        'parameters': {},
+        'resultSets': [{'name': 'LeagueGameLog', 'headers': GAMELOG_HEADERS, 'rowSet': rows}]
+    }, directory)
+
+
+def record_live(directory=FIXTURES_DIR, season=None):
+    """Record live NBA and ESPN responses into fixture files"""
+    import requests
+    from get_data import ESPN_API_BASE, ESPN_TEAM_IDS, get_season_info
+    from nba_api.stats.endpoints import leaguedashplayerstats, leaguegamelog
+
+    season = season or get_season_info()['stats_season']
+    stats = leaguedashplayerstats.LeagueDashPlayerStats(
+        season=season, season_type_all_star='Regular Season', timeout=30
+    )
+    _write(STATS_FIXTURE, stats.get_dict(), directory)
+    game_log = leaguegamelog.LeagueGameLog(
+        player_or_team_abbreviation='P', season=season, season_type_all_star='Regular Season', timeout=30
+    )
+    _write(GAMELOG_FIXTURE, game_log.get_dict(), directory)
+    _write(INJURIES_FIXTURE, requests.get(f'{ESPN_API_BASE}/injuries', timeout=10).json(), directory)
+    for team_id in ESPN_TEAM_IDS.values():
+        response = requests.get(f'{ESPN_API_BASE}/teams/{team_id}/roster', timeout=10)
+        _write(roster_fixture(team_id), response.json(), directory)
+    print(f"Recorded live fixtures for {season} in {directory}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Create replay server fixtures')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--record', action='store_true', help='record live NBA/ESPN responses')
+    group.add_argument('--synthetic', action='store_true', help='generate a synthetic league')
+    parser.add_argument('--season', help='stats season to record (default: current)')
+    parser.add_argument('--dir', default=FIXTURES_DIR, help='fixture directory')
+    args = parser.parse_args()
+
+    if args.record:
+        record_live(args.dir, args.season)
+    else:
+        generate_synthetic(args.dir)
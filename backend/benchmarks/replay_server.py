@@ -0,0 +1,194 @@
+"""
+Local stand-in for the NBA stats and ESPN APIs.
+Replays fixture responses with configurable latency and failure injection:
+
+    python -m benchmarks.replay_server --port 8765 --latency 80 --jitter 40 --fail-rate 0.05
+
+Then point the backend at it:
+
+    ESPN_API_BASE=http://127.0.0.1:8765/espn NBA_STATS_BASE=http://127.0.0.1:8765/stats python3 app.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from urllib.parse import parse_qs
+
+from benchmarks.fixtures import (
+    FIXTURES_DIR, GAMELOG_FIXTURE, INJURIES_FIXTURE, STATS_FIXTURE,
+    fixture_path, fixtures_exist, generate_game_logs, generate_synthetic, load_fixture, roster_fixture
+)
+
+ROSTER_PATH = re.compile(r'^/espn/teams/(\d+)/roster$')
+
+# Route kinds served like stats.nba.com, which sends no ETags
+NBA_KINDS = ('stats', 'game_logs')
+
+
+class ReplayConfig:
+    """Latency and failure injection settings, per route kind ('stats', 'game_logs', 'injuries', 'roster')"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, fail_rate=0.0, hang_rate=0.0, hang_ms=30000, overrides=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate
+        self.hang_rate = hang_rate
+        self.hang_ms = hang_ms
+        self.overrides = overrides or {}
+
+    def get(self, kind, key):
+        return self.overrides.get(kind, {}).get(key, getattr(self, key))
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    server_version = 'ReplayServer/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        roster = ROSTER_PATH.match(path)
+        if path == '/stats/leaguedashplayerstats':
+            kind, fixture = 'stats', STATS_FIXTURE
+        elif path == '/stats/leaguegamelog':
+            kind, fixture = 'game_logs', GAMELOG_FIXTURE
+        elif path == '/espn/injuries':
+            kind, fixture = 'injuries', INJURIES_FIXTURE
+        elif roster:
+            kind, fixture = 'roster', roster_fixture(roster.group(1))
+        else:
+            self.send_error(404)
+            return
+
+        self.server.count(kind)
+        config = self.server.config
+        rng = self.server.rng
+
+        # Injected hangs simulate an upstream that never answers in time
+        if rng.random() < config.get(kind, 'hang_rate'):
+            time.sleep(config.get(kind, 'hang_ms') / 1000)
+
+        latency = config.get(kind, 'latency_ms') + rng.uniform(0, config.get(kind, 'jitter_ms'))
+        if latency:
+            time.sleep(latency / 1000)
+
+        if rng.random() < config.get(kind, 'fail_rate'):
+            self.send_error(503, 'Injected failure')
+            return
+
+        try:
+            body = self.server.fixture(fixture)
+        except OSError:
+            self.send_error(404, 'No fixture recorded')
+            return
+        if kind == 'game_logs':
+            body = self.server.game_logs_from(body, parse_qs(query).get('DateFrom', [''])[0])
+
+        # ESPN supports conditional GETs, answer revalidations of unchanged fixtures with a 304
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if kind not in NBA_KINDS and self.headers.get('If-None-Match') == etag:
+            self.server.count(f'{kind}_not_modified')
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        if kind not in NBA_KINDS:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Threaded HTTP server replaying fixtures, with request counters per route kind"""
+
+    daemon_threads = True
+    # The default backlog of 5 drops bursts of concurrent roster connects (1s SYN retry)
+    request_queue_size = 128
+
+    def __init__(self, address, config=None, fixtures_dir=FIXTURES_DIR, seed=None):
+        super().__init__(address, ReplayHandler)
+        self.config = config or ReplayConfig()
+        self.fixtures_dir = fixtures_dir
+        self.rng = random.Random(seed)
+        self.fixtures = {}
+        self.requests = {}
+        self.lock = threading.Lock()
+
+    def fixture(self, name):
+        if name not in self.fixtures:
+            self.fixtures[name] = load_fixture(name, self.fixtures_dir)
+        return self.fixtures[name]
+
+    def game_logs_from(self, body, date_from):
+        """Game log fixture narrowed to games on or after DateFrom (MM/DD/YYYY), like LeagueGameLog"""
+        if not date_from:
+            return body
+        try:
+            start = datetime.strptime(date_from, '%m/%d/%Y').date().isoformat()
+        except ValueError:
+            return body
+        data = json.loads(body)
+        result = data['resultSets'][0]
+        column = result['headers'].index('GAME_DATE')
+        result['rowSet'] = [row for row in result['rowSet'] if row[column][:10] >= start]
+        return json.dumps(data).encode('utf-8')
+
+    def count(self, kind):
+        with self.lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+
+    def reset_counts(self):
+        with self.lock:
+            counts = dict(self.requests)
+            self.requests.clear()
+        return counts
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+def start_replay_server(config=None, port=0, fixtures_dir=FIXTURES_DIR, seed=None):
+    """Start a replay server in a background thread, generating synthetic fixtures if none exist"""
+    if not fixtures_exist(fixtures_dir):
+        generate_synthetic(fixtures_dir)
+    elif not os.path.exists(fixture_path(GAMELOG_FIXTURE, fixtures_dir)):
+        generate_game_logs(fixtures_dir)
+    server = ReplayServer(('127.0.0.1', port), config, fixtures_dir, seed)
+    threading.Thread(target=server.serve_forever, name='replay-server', daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay recorded NBA/ESPN responses locally')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0, help='base latency per request (ms)')
+    parser.add_argument('--jitter', type=float, default=0, help='random extra latency (ms)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--hang-rate', type=float, default=0.0, help='fraction of requests that hang')
+    parser.add_argument('--hang-ms', type=float, default=30000, help='how long a hanging request sleeps (ms)')
+    parser.add_argument('--dir', default=FIXTURES_DIR, help='fixture directory')
+    args = parser.parse_args()
+
+    config = ReplayConfig(args.latency, args.jitter, args.fail_rate, args.hang_rate, args.hang_ms)
+    if not fixtures_exist(args.dir):
+        generate_synthetic(args.dir)
+    elif not os.path.exists(fixture_path(GAMELOG_FIXTURE, args.dir)):
+        generate_game_logs(args.dir)
+    server = ReplayServer(('127.0.0.1', args.port), config, args.dir)
+    print(f"🎞️ Replay server on {server.base_url} (ESPN: {server.base_url}/espn, NBA: {server.base_url}/stats)")
+    server.serve_forever()
@@ -0,0 +1,507 @@
+"""
+Benchmark runner. Starts a local replay server, points the backend at it and measures:
+  - cold_fetch:    fetch_players with empty caches (memory and disk)
+  - bio_async:     get_bio_async on the shared event loop (30 roster requests)
+  - warm_hit:      /api/players served from a warm cache (in-process)
+  - serialization: payload size and encode/compress time
+  - formats:       per-snapshot memory (player dicts vs PlayerTable), bytes per wire format and
+                   a list view's ?fields= projection (rows, columnar, NDJSON time to first rows)
+  - projections:   Monte Carlo projections on the worker process pool (first run includes
+                   starting it) and the in-process fallback after the pool's host is killed,
+                   which must reproduce the pool's bands exactly
+  - throughput:    concurrent clients against /api/players over real HTTP
+  - cold_boot:     `python app.py` restarted over an expired snapshot, time to its first
+                   served /api/players with BOOT_MODE=snapshot vs fetch, plus its boot breakdown
+
+Results are written as JSON; pass --baseline to fail on regressions:
+
+    cd backend
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json --tolerance 0.25
+"""
+
+import argparse
+import contextlib
+import http.client
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.replay_server import ReplayConfig, start_replay_server
+
+
+def free_port():
+    """Ask the OS for an unused local port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def summarize(samples):
+    """Latency summary in milliseconds"""
+    samples_ms = np.array(samples) * 1000
+    return {
+        'count': len(samples),
+        'mean_ms': round(float(samples_ms.mean()), 3),
+        'p50_ms': round(float(np.percentile(samples_ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(samples_ms, 95)), 3),
+        'p99_ms': round(float(np.percentile(samples_ms, 99)), 3),
+        'max_ms': round(float(samples_ms.max()), 3)
+    }
+
+
+def reset_state(app, get_data):
+    """Empty every in-memory cache, the on-disk snapshot store and the upstream revalidation state"""
+    for cache_dict in (app.cache, app.injury_cache, app.bio_cache, app.last_season_cache):
+        cache_dict['data'] = None
+        cache_dict['timestamp'] = 0
+        cache_dict.pop('snapshot', None)
+    get_data.join_index = None
+    # Otherwise repeats revalidate with If-None-Match and time 304s instead of full fetches
+    get_data.upstream_client.validators.clear()
+    get_data.roster_tracker.clear()
+    shutil.rmtree('cache', ignore_errors=True)
+
+
+def bench_cold_fetch(app, get_data, server, repeats):
+    samples = []
+    upstream_requests = {}
+    for _ in range(repeats):
+        reset_state(app, get_data)
+        server.reset_counts()
+        start_time = time.perf_counter()
+        data = app.fetch_current_players()
+        samples.append(time.perf_counter() - start_time)
+        upstream_requests = server.reset_counts()
+        if not data:
+            raise RuntimeError('cold fetch returned no data')
+
+    snapshot = app.cache['snapshot']
+    return dict(
+        summarize(samples),
+        players=data['total_count'],
+        upstream_requests=upstream_requests,
+        source_timings_ms={name: round(value * 1000, 3) for name, value in snapshot['timings'].items()},
+        degraded_sources=snapshot['degraded']
+    )
+
+
+def bench_bio_async(get_data, repeats):
+    samples = []
+    players = 0
+    for _ in range(repeats):
+        get_data.upstream_client.validators.clear()
+        get_data.roster_tracker.clear()
+        start_time = time.perf_counter()
+        players = len(get_data.upstream_loop.run(get_data.get_bio_async()))
+        samples.append(time.perf_counter() - start_time)
+    return dict(summarize(samples), players=players)
+
+
+def bench_warm_hit(app, requests_count):
+    client = app.app.test_client()
+    results = {}
+    for label, encoding in (('identity', ''), ('gzip', 'gzip'), ('br', 'br, gzip')):
+        samples = []
+        for _ in range(requests_count):
+            start_time = time.perf_counter()
+            response = client.get('/api/players', headers={'Accept-Encoding': encoding})
+            response.get_data()
+            samples.append(time.perf_counter() - start_time)
+        results[label] = dict(summarize(samples), bytes=len(response.get_data()))
+
+    # Revalidation with a matching ETag
+    etag = client.get('/api/players').headers['ETag']
+    samples = []
+    for _ in range(requests_count):
+        start_time = time.perf_counter()
+        client.get('/api/players', headers={'If-None-Match': etag})
+        samples.append(time.perf_counter() - start_time)
+    results['not_modified'] = summarize(samples)
+    return results
+
+
+def bench_serialization(app, repeats):
+    from serialization import encode_json, serialize_payload
+
+    data = dict(app.cache['snapshot']['data'])
+    data['players'] = data['players'].records()
+    encode_samples, build_samples = [], []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        encode_json(data)
+        encode_samples.append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        body = serialize_payload(data)
+        build_samples.append(time.perf_counter() - start_time)
+
+    return {
+        'raw_bytes': len(body['raw']),
+        'gzip_bytes': len(body['gzip']),
+        'br_bytes': len(body['br']) if body['br'] else None,
+        'encode_json': summarize(encode_samples),
+        'serialize_payload': summarize(build_samples)
+    }
+
+
+# Columns a list view needs, for the ?fields= projection benchmark
+LIST_VIEW_FIELDS = ('name', 'team', 'position', 'games_played', 'points', 'rebounds', 'assists',
+                    'steals', 'blocks', 'fantasy_value', 'overall_rank', 'injury_status')
+
+
+def retained_bytes(build):
+    """(bytes allocated by build() and still held by its result, result)"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return tracemalloc.get_traced_memory()[0] - before, result
+    finally:
+        tracemalloc.stop()
+
+
+def bench_formats(app, repeats):
+    """Snapshot memory as player dicts vs a PlayerTable, and response bytes per wire format"""
+    from player_table import PlayerTable, columnar_payload
+    from serialization import serialize_payload
+
+    snapshot = app.cache['snapshot']
+    raw = bytes(snapshot['body']['raw'])
+
+    # Players as freshly decoded dicts (what each snapshot held before) vs a table built from them;
+    # the table's strings are already interned by the live snapshot, as they would be after one refresh
+    dict_bytes, _ = retained_bytes(lambda: json.loads(raw)['players'])
+    table_bytes, _ = retained_bytes(lambda: PlayerTable(json.loads(raw)['players']))
+
+    results = {'memory': {
+        'dict_bytes': dict_bytes,
+        'table_bytes': table_bytes,
+        'table_nbytes': snapshot['data']['players'].nbytes(),
+        'reduction': round(1 - table_bytes / dict_bytes, 3) if dict_bytes else None
+    }}
+
+    for label, build in (('rows', lambda: dict(snapshot['data'], players=snapshot['data']['players'].records())),
+                         ('columnar', lambda: columnar_payload(snapshot['data']))):
+        samples = []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            body = serialize_payload(build())
+            samples.append(time.perf_counter() - start_time)
+        decode_samples = []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            json.loads(body['raw'])
+            decode_samples.append(time.perf_counter() - start_time)
+        results[label] = {
+            'raw_bytes': len(body['raw']),
+            'gzip_bytes': len(body['gzip']),
+            'br_bytes': len(body['br']) if body['br'] else None,
+            'serialize': summarize(samples),
+            'client_decode': summarize(decode_samples)
+        }
+
+    # A list view's projection, and how soon an NDJSON stream delivers its first rows
+    client = app.app.test_client()
+    fields = ','.join(LIST_VIEW_FIELDS)
+    projected = {}
+    for label, query in (('rows', ''), ('columnar', '&format=columnar')):
+        response = client.get(f'/api/players?fields={fields}{query}', headers={'Accept-Encoding': 'gzip'})
+        projected[f'{label}_gzip_bytes'] = len(response.get_data())
+        projected[f'{label}_raw_bytes'] = len(client.get(f'/api/players?fields={fields}{query}').get_data())
+    first_samples, total_samples = [], []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        response = client.get(f'/api/players?fields={fields}&format=ndjson', buffered=False)
+        chunks = iter(response.response)
+        size = len(next(chunks))
+        first_samples.append(time.perf_counter() - start_time)
+        size += sum(len(chunk) for chunk in chunks)
+        total_samples.append(time.perf_counter() - start_time)
+    projected['ndjson_raw_bytes'] = size
+    projected['ndjson_first_rows'] = summarize(first_samples)
+    projected['ndjson_complete'] = summarize(total_samples)
+    results['projected'] = projected
+    return results
+
+
+def bench_projections(app, repeats, simulations=5000):
+    from projections import ProjectionEngine
+
+    players = app.cache['snapshot']['data']['players'].records()
+    engine = ProjectionEngine(simulations=simulations, workers=2)
+    start_time = time.perf_counter()
+    pooled = engine.project(players, 'benchmark')
+    first_run = time.perf_counter() - start_time
+    samples = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        engine.project(players, 'benchmark')
+        samples.append(time.perf_counter() - start_time)
+
+    # With its host gone the pool can't be reached, so the same jobs run in-process
+    engine.pool.process.kill()
+    engine.pool.process.wait()
+    start_time = time.perf_counter()
+    fallback = engine.project(players, 'benchmark')
+    fallback_time = time.perf_counter() - start_time
+    if engine.workers != 0:
+        raise RuntimeError('projection engine kept using a dead pool')
+    if any(not np.array_equal(pooled['bands'][name], fallback['bands'][name]) for name in pooled['bands']):
+        raise RuntimeError('in-process projections differ from the pool')
+
+    return {
+        'players': len(players),
+        'simulations': simulations,
+        'pool_first_run_ms': round(first_run * 1000, 3),
+        'pool': summarize(samples),
+        'fallback_ms': round(fallback_time * 1000, 3)
+    }
+
+
+def bench_throughput(app, clients, duration):
+    """Hammer /api/players from concurrent keep-alive clients against a real threaded server"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    http_server = make_server('127.0.0.1', 0, app.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    port = http_server.server_port
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client_loop():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local = []
+        failures = 0
+        while time.perf_counter() < deadline:
+            start_time = time.perf_counter()
+            try:
+                connection.request('GET', '/api/players', headers={'Accept-Encoding': 'gzip'})
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    failures += 1
+            except (OSError, http.client.HTTPException):
+                failures += 1
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            local.append(time.perf_counter() - start_time)
+        with lock:
+            latencies.extend(local)
+            errors.append(failures)
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=client_loop) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed_time = time.perf_counter() - start_time
+    http_server.shutdown()
+
+    return dict(
+        summarize(latencies) if latencies else {},
+        clients=clients,
+        requests=len(latencies),
+        errors=sum(errors),
+        rps=round(len(latencies) / elapsed_time, 1)
+    )
+
+
+def wait_for_players(port, process, timeout=120):
+    """Poll /api/players until it answers 200, returning the response headers"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'server exited with {process.returncode} before serving')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+            connection.request('GET', '/api/players', headers={'Accept-Encoding': 'gzip'})
+            response = connection.getresponse()
+            response.read()
+            if response.status == 200:
+                return dict(response.getheaders())
+        except OSError:
+            pass
+        time.sleep(0.002)
+    raise RuntimeError('server did not serve /api/players in time')
+
+
+def get_json(port, path):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    connection.request('GET', path)
+    return json.loads(connection.getresponse().read())
+
+
+def bench_cold_boot(backend_dir, repeats):
+    """
+    Restart the server as a separate process over the snapshot the earlier scenarios
+    persisted, expired (PLAYERS_CACHE_DURATION=1), and time it until it serves /api/players
+    """
+    results = {}
+    for mode in ('snapshot', 'fetch'):
+        samples = []
+        for _ in range(repeats):
+            port = free_port()
+            env = dict(os.environ, PORT=str(port), BOOT_MODE=mode,
+                       PLAYERS_CACHE_DURATION='1', PLAYERS_REFRESH_AHEAD='0')
+            start_time = time.perf_counter()
+            process = subprocess.Popen([sys.executable, os.path.join(backend_dir, 'app.py')], env=env,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                headers = wait_for_players(port, process)
+                samples.append(time.perf_counter() - start_time)
+                # The stale snapshot is refreshed in the background, nba_api is imported then
+                deadline = time.perf_counter() + 30
+                boot = get_json(port, '/api/health')['boot']
+                while 'nba_api.stats.endpoints' not in boot['lazy_imports_ms'] \
+                        and time.perf_counter() < deadline:
+                    time.sleep(0.05)
+                    boot = get_json(port, '/api/health')['boot']
+            finally:
+                process.terminate()
+                process.wait(10)
+        results[mode] = dict(
+            summarize(samples),
+            served_stale=headers.get('X-Snapshot-Stale') == 'true',
+            phases_ms=boot['phases_ms'],
+            lazy_imports_ms=boot['lazy_imports_ms']
+        )
+    return results
+
+
+def flatten(results, prefix=''):
+    """Flatten nested results into dotted metric names"""
+    flat = {}
+    for key, value in results.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{name}.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(results, baseline, tolerance):
+    """List metrics that regressed by more than tolerance (latencies up, throughput down)"""
+    current = flatten(results)
+    previous = flatten(baseline)
+    regressions = []
+    for name, value in current.items():
+        old = previous.get(name)
+        if not old:
+            continue
+        if name.endswith('_ms') and value > old * (1 + tolerance):
+            regressions.append({'metric': name, 'baseline': old, 'current': value})
+        elif name.endswith('rps') and value < old * (1 - tolerance):
+            regressions.append({'metric': name, 'baseline': old, 'current': value})
+    return regressions
+
+
+def run_all(args, server, backend_dir):
+    """Run every scenario against the backend, which must import after the upstream env is set"""
+    import app
+    import get_data
+
+    # Background refreshes would race the cold fetch measurements
+    app.app.config['START_REFRESHER'] = False
+    # nba_api is imported lazily on the first stats fetch; cold_boot measures that, cold_fetch shouldn't
+    get_data.nba_endpoint('leaguedashplayerstats')
+
+    results = {
+        'meta': {
+            'timestamp': time.time(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'upstream_latency_ms': args.latency,
+            'upstream_jitter_ms': args.jitter,
+            'upstream_fail_rate': args.fail_rate
+        }
+    }
+    results['cold_fetch'] = bench_cold_fetch(app, get_data, server, args.repeats)
+    results['bio_async'] = bench_bio_async(get_data, args.repeats)
+    results['warm_hit'] = bench_warm_hit(app, args.requests)
+    results['serialization'] = bench_serialization(app, args.repeats)
+    results['formats'] = bench_formats(app, args.repeats)
+    results['projections'] = bench_projections(app, args.repeats)
+    results['throughput'] = bench_throughput(app, args.clients, args.duration)
+    results['cold_boot'] = bench_cold_boot(backend_dir, args.repeats)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the fetch pipeline and API endpoints')
+    parser.add_argument('--output', help='write results JSON here (default: stdout)')
+    parser.add_argument('--baseline', help='results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative regression')
+    parser.add_argument('--latency', type=float, default=50, help='replayed upstream latency (ms)')
+    parser.add_argument('--jitter', type=float, default=20, help='replayed upstream jitter (ms)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='fraction of upstream requests failing')
+    parser.add_argument('--repeats', type=int, default=3, help='cold fetch / serialization repeats')
+    parser.add_argument('--requests', type=int, default=200, help='warm hit requests per encoding')
+    parser.add_argument('--clients', type=int, default=16, help='concurrent clients for throughput')
+    parser.add_argument('--duration', type=float, default=5, help='throughput run length (s)')
+    args = parser.parse_args()
+
+    # Upstream URLs are read when get_data is imported (generating fixtures imports it too),
+    # so pick the replay port and configure them before anything touches the backend
+    port = free_port()
+    os.environ['ESPN_API_BASE'] = f'http://127.0.0.1:{port}/espn'
+    os.environ['NBA_STATS_BASE'] = f'http://127.0.0.1:{port}/stats'
+    config = ReplayConfig(latency_ms=args.latency, jitter_ms=args.jitter, fail_rate=args.fail_rate)
+    server = start_replay_server(config, port=port, seed=1)
+
+    # Paths are resolved before switching to the scratch directory
+    output_path = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, backend_dir)
+    work_dir = tempfile.mkdtemp(prefix='statline-bench-')
+    os.chdir(work_dir)
+
+    # Backend progress logging goes to stderr so stdout stays machine-readable
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            results = run_all(args, server, backend_dir)
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    exit_code = 0
+    if baseline_path:
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        results['regressions'] = compare(
+            {key: value for key, value in results.items() if key != 'meta'},
+            {key: value for key, value in baseline.items() if key != 'meta'},
+            args.tolerance
+        )
+        exit_code = 1 if results['regressions'] else 0
+
+    output = json.dumps(results, indent=2)
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Season-over-season comparison of two player snapshots.
+Players are joined by NBA PLAYER_ID once per snapshot pair, and their rank, fantasy value
+and per-game stat deltas are kept as NumPy arrays with every sort order presorted, so a
+comparison request only masks and slices a cached order.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from scoring import per_game_rates
+from similarity import PER_GAME_FIELDS, PERCENT_FIELDS
+
+STAT_FIELDS = PER_GAME_FIELDS + PERCENT_FIELDS
+
+# rank_change: places gained (positive = moved up), rank: rank in the "to" season
+SORT_KEYS = ['rank_change', 'value_change', 'rank'] + STAT_FIELDS
+
+# Risers are picked among players ranked this high in the "to" season and fallers among those
+# ranked this high in the "from" season (about every rostered player in a 12-team league),
+# so churn deep on the bench doesn't crowd them out
+MOVER_RANK_CUTOFF = 150
+MOVERS = 10
+
+# Comparisons kept per snapshot pair
+COMPARISON_CACHE_SIZE = 8
+
+
+def stat_matrix(snapshot):
+    """(n, len(STAT_FIELDS)) per-game stats and shooting percentages of a snapshot"""
+    players = snapshot['data']['players']
+
+    def column(name):
+        return np.array([value or 0 for value in players.column(name)], dtype=float)
+
+    totals = np.column_stack([column(name) for name in PER_GAME_FIELDS]).reshape(len(players), -1)
+    percents = np.column_stack([column(name) for name in PERCENT_FIELDS]).reshape(len(players), -1)
+    return np.hstack([per_game_rates(totals, snapshot['index'].games_played), percents])
+
+
+class SeasonComparison:
+    """
+    Two snapshots joined by player id, with deltas ("to" minus "from", except rank_change which
+    counts places gained) and presorted orders over the matched players. Arrays are indexed by
+    match position; from_rows/to_rows map back to snapshot rows.
+    """
+
+    def __init__(self, from_snapshot, to_snapshot):
+        from_ids = np.array([player_id or -1 for player_id in from_snapshot['data']['players'].column('player_id')])
+        to_ids = np.array([player_id or -1 for player_id in to_snapshot['data']['players'].column('player_id')])
+        _, self.from_rows, self.to_rows = np.intersect1d(from_ids, to_ids, return_indices=True)
+        self.only_from = len(np.setdiff1d(from_ids, to_ids))
+        self.only_to = len(np.setdiff1d(to_ids, from_ids))
+
+        def joined(snapshot, rows, name):
+            values = snapshot['data']['players'].column(name)
+            return np.array([values[row] if values[row] is not None else np.nan for row in rows], dtype=float)
+
+        self.from_rank = joined(from_snapshot, self.from_rows, 'overall_rank')
+        self.to_rank = joined(to_snapshot, self.to_rows, 'overall_rank')
+        self.from_value = joined(from_snapshot, self.from_rows, 'fantasy_value')
+        self.to_value = joined(to_snapshot, self.to_rows, 'fantasy_value')
+        self.rank_change = self.from_rank - self.to_rank
+        self.value_change = self.to_value - self.from_value
+        self.stat_change = stat_matrix(to_snapshot)[self.to_rows] - stat_matrix(from_snapshot)[self.from_rows]
+        self.from_games = from_snapshot['index'].games_played[self.from_rows]
+        self.to_games = to_snapshot['index'].games_played[self.to_rows]
+
+        # Presorted both ways, "desc" is biggest (for rank, best) first; NaNs sort last either way
+        sort_values = {
+            'rank_change': self.rank_change,
+            'value_change': self.value_change,
+            'rank': -self.to_rank
+        }
+        sort_values.update({name: self.stat_change[:, i] for i, name in enumerate(STAT_FIELDS)})
+        self.orders = {}
+        for key, values in sort_values.items():
+            missing = np.isnan(values)
+            self.orders[key, 'desc'] = np.argsort(np.where(missing, np.inf, -values), kind='stable')
+            self.orders[key, 'asc'] = np.argsort(np.where(missing, np.inf, values), kind='stable')
+
+        risers = self.orders['rank_change', 'desc']
+        self.risers = risers[(self.rank_change[risers] > 0) & (self.to_rank[risers] <= MOVER_RANK_CUTOFF)][:MOVERS]
+        fallers = self.orders['rank_change', 'asc']
+        self.fallers = fallers[(self.rank_change[fallers] < 0) & (self.from_rank[fallers] <= MOVER_RANK_CUTOFF)][:MOVERS]
+
+    def __len__(self):
+        return len(self.from_rows)
+
+    def query(self, sort='rank_change', direction='desc', min_games=0, offset=0, limit=50):
+        """(total, positions) of matched players with min_games in both seasons, sorted and paginated"""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort '{sort}', use one of: {', '.join(SORT_KEYS)}")
+        if direction not in ('asc', 'desc'):
+            raise ValueError('direction must be asc or desc')
+        order = self.orders[sort, direction]
+        if min_games:
+            order = order[(self.from_games[order] >= min_games) & (self.to_games[order] >= min_games)]
+        return len(order), order[offset:offset + limit]
+
+
+class ComparisonCache:
+    """LRU of season comparisons keyed by the ETags of both snapshots"""
+
+    def __init__(self, max_entries=COMPARISON_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compare(self, from_snapshot, to_snapshot):
+        """The comparison of two snapshots, built on first use"""
+        key = (from_snapshot['body']['etag'], to_snapshot['body']['etag'])
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+
+        comparison = SeasonComparison(from_snapshot, to_snapshot)
+        with self.lock:
+            self.entries[key] = comparison
+            self.misses += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return comparison
+
+    def stats(self):
+        """Cache counters for the health endpoint"""
+        with self.lock:
+            return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,234 @@
+"""
+Value over replacement and snake draft simulation.
+Replacement levels come from filling every team's starting slots with the best players
+that fit; simulated drafts then run thousands of snake drafts at once, each drafter taking
+the best available player (by VORP plus some opinion noise) that fits an open roster slot.
+Draft boards are presorted once per simulation and eligibility is a bitmask per player,
+so each pick is a vectorized scan for the first available player that fits, across all
+simulations at once.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from scoring import POSITION_BUCKETS, position_masks
+
+# Roster slots per team: G/F/C take players of that bucket, UTIL and BENCH take anyone.
+# Mirrors a standard 13-player head-to-head roster (PG, SG, G / SF, PF, F / C / 3 UTIL / 3 bench)
+DEFAULT_SLOTS = {'G': 3, 'F': 3, 'C': 1, 'UTIL': 3, 'BENCH': 3}
+FLEX_SLOTS = ('UTIL', 'BENCH')
+STARTING_SLOTS = POSITION_BUCKETS + ['UTIL']
+
+# Slot mask bit shared by every player, set on a team's mask while it has flex slots open
+FLEX_BIT = 1 << 7
+
+DEFAULT_TEAMS = 12
+MAX_TEAMS = 20
+MAX_ROUNDS = 20
+
+# Simulated drafts per request, and the most a client may ask for
+DEFAULT_SIMULATIONS = int(os.environ.get('DRAFT_SIMULATIONS', 2000))
+MAX_SIMULATIONS = 10000
+
+# Drafter disagreement: each drafter's board is VORP plus noise with this share of the VORP spread
+DRAFT_NOISE = 0.08
+
+# Simulation results kept per (snapshot, league settings)
+DRAFT_CACHE_SIZE = 32
+
+
+def parse_slots(text):
+    """Parse 'G:3,F:3,C:1,UTIL:3,BENCH:3' into a slots dict; slots left out keep their default"""
+    slots = dict(DEFAULT_SLOTS)
+    for part in (text or '').split(','):
+        if not part.strip():
+            continue
+        name, _, count = part.partition(':')
+        name = name.strip().upper()
+        if name not in slots:
+            raise ValueError(f"Unknown slot '{name}', use one of: {', '.join(DEFAULT_SLOTS)}")
+        try:
+            slots[name] = int(count)
+        except ValueError:
+            raise ValueError(f"Slot count for '{name}' must be an integer")
+        if slots[name] < 0:
+            raise ValueError(f"Slot count for '{name}' can't be negative")
+    rounds = sum(slots.values())
+    if not 1 <= rounds <= MAX_ROUNDS:
+        raise ValueError(f'Rosters must have between 1 and {MAX_ROUNDS} slots')
+    return slots
+
+
+def snake_order(teams, rounds):
+    """Team index on the clock for every overall pick of a snake draft"""
+    order = np.tile(np.arange(teams), (rounds, 1))
+    order[1::2] = order[1::2, ::-1]
+    return order.ravel()
+
+
+def replacement_levels(values, eligibility, teams, slots):
+    """
+    Value of the best player left for each position once every team's starting slots are
+    filled greedily (own position first, then UTIL). Returns {bucket: value}.
+    """
+    open_slots = {bucket: teams * slots[bucket] for bucket in STARTING_SLOTS}
+    starters = np.zeros(len(values), dtype=bool)
+    for row in np.argsort(-values, kind='stable'):
+        buckets = [bucket for i, bucket in enumerate(POSITION_BUCKETS) if eligibility[row, i]]
+        slot = next((bucket for bucket in buckets if open_slots[bucket]), None)
+        if slot is None and open_slots['UTIL']:
+            slot = 'UTIL'
+        if slot:
+            open_slots[slot] -= 1
+            starters[row] = True
+        if not any(open_slots.values()):
+            break
+
+    levels = {}
+    for i, bucket in enumerate(POSITION_BUCKETS):
+        remaining = values[~starters & eligibility[:, i]]
+        levels[bucket] = float(remaining.max()) if len(remaining) else 0.0
+    remaining = values[~starters]
+    levels['UTIL'] = float(remaining.max()) if len(remaining) else 0.0
+    return levels
+
+
+def value_over_replacement(values, eligibility, levels):
+    """VORP per player against the lowest replacement level among the positions they can fill"""
+    bucket_levels = np.array([levels[bucket] for bucket in POSITION_BUCKETS])
+    replacement = np.where(eligibility, bucket_levels, np.inf).min(axis=1)
+    replacement = np.where(np.isinf(replacement), levels['UTIL'], replacement)
+    return values - replacement
+
+
+def slot_masks(eligibility):
+    """Bitmask per player: one bit per position bucket plus FLEX_BIT, which every player has"""
+    bits = (eligibility * (1 << np.arange(len(POSITION_BUCKETS)))).sum(axis=1)
+    return (bits | FLEX_BIT).astype(np.uint8)
+
+
+def simulate_drafts(vorp, eligibility, teams, slots, simulations, seed):
+    """
+    Run snake drafts in parallel. Returns (pick_taken, picks) where pick_taken[s, j] is the
+    0-based overall pick at which player j went in simulation s (picks if undrafted).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(vorp)
+    rounds = sum(slots.values())
+    order = snake_order(teams, rounds)
+    picks = len(order)
+
+    # Presorted boards: each simulation's drafters share one noisy VORP ranking
+    top = np.sort(vorp)[::-1][:max(picks, 1)]
+    noise = DRAFT_NOISE * (top.max() - top.min() if len(top) else 0) + 1e-9
+    boards = np.argsort(-(vorp + noise * rng.standard_normal((simulations, n))), axis=1, kind='stable')
+    player_masks = slot_masks(eligibility)
+    board_masks = player_masks[boards]
+    available = np.ones((simulations, n), dtype=bool)
+
+    # Open position slots (simulations, teams, buckets) and flex slots (simulations, teams)
+    open_positions = np.tile(np.array([slots[bucket] for bucket in POSITION_BUCKETS]), (simulations, teams, 1))
+    open_flex = np.full((simulations, teams), sum(slots[slot] for slot in FLEX_SLOTS))
+    bucket_bits = (1 << np.arange(len(POSITION_BUCKETS))).astype(np.uint8)
+
+    # Picks only ever dig a little past the players already taken, so scan a bounded prefix
+    depth = min(n, picks + 64)
+    sims = np.arange(simulations)
+    pick_taken = np.full((simulations, n), picks, dtype=np.int16)
+    for pick, team in enumerate(order):
+        # A player fits when their mask shares a bit with the team's open slots
+        open_mask = ((open_positions[:, team] > 0) * bucket_bits).sum(axis=1).astype(np.uint8)
+        open_mask[open_flex[:, team] > 0] |= FLEX_BIT
+        candidates = available[:, :depth] & ((board_masks[:, :depth] & open_mask[:, None]) != 0)
+        column = candidates.argmax(axis=1)
+
+        # Rare: nothing eligible in the prefix, fall back to the full board (then to anyone available)
+        missing = ~candidates[sims, column]
+        if missing.any():
+            rows = np.flatnonzero(missing)
+            fallback = available[rows] & ((board_masks[rows] & open_mask[rows, None]) != 0)
+            fallback = np.where(fallback.any(axis=1)[:, None], fallback, available[rows])
+            column[rows] = fallback.argmax(axis=1)
+
+        player = boards[sims, column]
+        available[sims, column] = False
+        pick_taken[sims, player] = pick
+
+        # Fill the eligible position slot with the most openings, else a flex slot
+        openings = np.where(eligibility[player], open_positions[:, team], 0)
+        bucket = openings.argmax(axis=1)
+        positional = openings[sims, bucket] > 0
+        open_positions[sims[positional], team, bucket[positional]] -= 1
+        flex = sims[~positional & (open_flex[:, team] > 0)]
+        open_flex[flex, team] -= 1
+
+    return pick_taken, picks
+
+
+def availability_curves(pick_taken, picks):
+    """availability[j, p] = share of simulations where player j was still available at overall pick p (0-based)"""
+    simulations, n = pick_taken.shape
+    flat = np.arange(n) * (picks + 1) + pick_taken
+    counts = np.bincount(flat.ravel(), minlength=n * (picks + 1)).reshape(n, picks + 1)
+    # Available at pick p means taken at pick p or later
+    return counts[:, ::-1].cumsum(axis=1)[:, ::-1][:, :picks] / simulations
+
+
+class DraftSimulator:
+    """VORP and draft simulations per (snapshot, league settings), kept in a small LRU"""
+
+    def __init__(self, max_entries=DRAFT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.runs = 0
+
+    def analyze(self, snapshot, values, teams, slots, simulations, key=()):
+        """Replacement levels, VORP and (unless simulations is 0) availability curves and ADP, cached"""
+        cache_key = (snapshot['body']['etag'], teams, tuple(sorted(slots.items())), simulations) + tuple(key)
+        with self.lock:
+            if cache_key in self.entries:
+                self.entries.move_to_end(cache_key)
+                return self.entries[cache_key]
+
+        positions = snapshot['data']['players'].column('position')
+        masks = position_masks(positions)
+        eligibility = np.column_stack([masks[bucket] for bucket in POSITION_BUCKETS]).reshape(len(positions), -1)
+        levels = replacement_levels(values, eligibility, teams, slots)
+        vorp = value_over_replacement(values, eligibility, levels)
+
+        result = {
+            'levels': levels,
+            'vorp': vorp,
+            'order': snake_order(teams, sum(slots.values()))
+        }
+
+        if simulations:
+            # Seeded from the snapshot and settings so repeated and multi-worker runs agree
+            seed = int(hashlib.sha256(repr(cache_key).encode('utf-8')).hexdigest()[:16], 16)
+            pick_taken, picks = simulate_drafts(vorp, eligibility, teams, slots, simulations, seed)
+            drafted = pick_taken < picks
+            times_drafted = drafted.sum(axis=0)
+            result['availability'] = availability_curves(pick_taken, picks)
+            result['draft_rate'] = times_drafted / simulations
+            # Average 1-based pick among the simulations that drafted the player (NaN if never drafted)
+            result['adp'] = np.where(
+                times_drafted > 0,
+                (np.where(drafted, pick_taken, 0).sum(axis=0) + times_drafted) / np.maximum(times_drafted, 1),
+                np.nan
+            )
+        with self.lock:
+            self.entries[cache_key] = result
+            self.runs += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        """Simulator counters for the health endpoint"""
+        with self.lock:
+            return {'entries': len(self.entries), 'runs': self.runs}
@@ -0,0 +1,79 @@
+"""
+One long-lived asyncio event loop in a background thread, shared by every async
+upstream fetch and by the async server. It owns a single aiohttp ClientSession,
+so ESPN connections are pooled and reused across fetches instead of being
+rebuilt by asyncio.run() on every call.
+"""
+
+import asyncio
+import threading
+
+from startup import lazy_import
+
+# Connection pool limits for the shared session
+POOL_LIMIT = 30
+POOL_LIMIT_PER_HOST = 10
+
+
+class EventLoopThread:
+    """A background event loop with a shared aiohttp session, started on first use"""
+
+    def __init__(self, name='upstream-loop'):
+        self.name = name
+        self.loop = None
+        self.thread = None
+        self.session = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Start the loop thread if it isn't running yet and return the loop"""
+        with self.lock:
+            if self.loop is None:
+                ready = threading.Event()
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=self._run, args=(ready,), name=self.name, daemon=True)
+                self.thread.start()
+                ready.wait()
+            return self.loop
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(ready.set)
+        self.loop.run_forever()
+
+    def in_loop(self):
+        """Whether the caller is running on this loop's thread"""
+        return threading.current_thread() is self.thread
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop and return a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop from a synchronous thread and wait for its result"""
+        if self.in_loop():
+            coro.close()
+            raise RuntimeError('run() would deadlock on the event loop thread, await the coroutine instead')
+        return self.submit(coro).result(timeout)
+
+    async def get_session(self):
+        """The shared ClientSession, created lazily on the loop (aiohttp is imported then too)"""
+        if self.session is None or self.session.closed:
+            aiohttp = lazy_import('aiohttp')
+            connector = aiohttp.TCPConnector(limit=POOL_LIMIT, limit_per_host=POOL_LIMIT_PER_HOST)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    def stop(self):
+        """Close the session and stop the loop"""
+        with self.lock:
+            if self.loop is None:
+                return
+            if self.session is not None:
+                asyncio.run_coroutine_threadsafe(self.session.close(), self.loop).result(5)
+                self.session = None
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(5)
+            self.loop.close()
+            self.loop = None
+            self.thread = None
@@ -0,0 +1,277 @@
+"""
+Append-only store of per-game player logs with rolling-window stats.
+Each ingestion run only fetches games played since the last ingested date and appends
+the new ones to cache/gamelogs/<season>.bin as fixed-size records; a JSON sidecar,
+replaced atomically after each append, records how many records are committed.
+Every player keeps prefix sums of their per-game stats, so new games extend them in
+O(new games) and any last-N-games window is a single subtraction.
+"""
+
+import json
+import os
+import threading
+from datetime import date, datetime
+
+import numpy as np
+
+from scoring import weight_vector
+from snapshot_store import CACHE_DIR, write_json_atomic
+
+# Per-game stats kept for every game, in record column order
+STAT_FIELDS = ('min', 'pts', 'fgm', 'fg3m', 'ftm', 'reb', 'ast', 'stl', 'blk', 'tov')
+
+# LeagueGameLog columns for each stat
+FRAME_COLUMNS = {
+    'min': 'MIN', 'pts': 'PTS', 'fgm': 'FGM', 'fg3m': 'FG3M', 'ftm': 'FTM',
+    'reb': 'REB', 'ast': 'AST', 'stl': 'STL', 'blk': 'BLK', 'tov': 'TOV'
+}
+
+RECORD_DTYPE = np.dtype([
+    ('player_id', '<i8'),
+    ('game_id', '<i8'),
+    ('date', '<i4'),  # days since 1970-01-01
+    ('stats', '<f4', (len(STAT_FIELDS),))
+])
+
+# Rolling windows reported by the API (last N games)
+WINDOWS = (5, 10, 30)
+
+GAME_LOG_DIR = os.path.join(CACHE_DIR, 'gamelogs')
+
+EPOCH = date(1970, 1, 1)
+
+_STAT = {field: i for i, field in enumerate(STAT_FIELDS)}
+
+
+def day_number(game_date):
+    """Days since the epoch for a 'YYYY-MM-DD' (or ISO timestamp) game date"""
+    return (datetime.fromisoformat(str(game_date)[:10]).date() - EPOCH).days
+
+
+def day_date(day):
+    return date.fromordinal(EPOCH.toordinal() + int(day))
+
+
+def fantasy_per_game(per_game):
+    """Fantasy points per game from per-game stat rows (..., STAT_FIELDS), default weights, floored at 0"""
+    per_game = np.asarray(per_game, dtype=float)
+    fgm, fg3m = per_game[..., _STAT['fgm']], per_game[..., _STAT['fg3m']]
+    categories = np.stack([
+        fg3m,
+        fgm - fg3m,
+        per_game[..., _STAT['ftm']],
+        per_game[..., _STAT['reb']],
+        per_game[..., _STAT['ast']],
+        per_game[..., _STAT['stl']],
+        per_game[..., _STAT['blk']],
+        per_game[..., _STAT['tov']]
+    ], axis=-1)
+    return np.maximum(categories @ weight_vector(), 0.0)
+
+
+def records_from_frame(frame):
+    """Records and {player_id: {'name', 'team'}} from a LeagueGameLog (player mode) frame"""
+    records = np.zeros(len(frame), dtype=RECORD_DTYPE)
+    if not len(frame):
+        return records, {}
+    records['player_id'] = frame['PLAYER_ID'].to_numpy(dtype=np.int64)
+    records['game_id'] = frame['GAME_ID'].astype(np.int64).to_numpy()
+    records['date'] = [day_number(game_date) for game_date in frame['GAME_DATE']]
+    records['stats'] = np.column_stack([
+        frame[FRAME_COLUMNS[field]].fillna(0).to_numpy(dtype=np.float32) for field in STAT_FIELDS
+    ])
+    players = {
+        int(player_id): {'name': name, 'team': team}
+        for player_id, name, team in zip(frame['PLAYER_ID'], frame['PLAYER_NAME'], frame['TEAM_ABBREVIATION'])
+    }
+    return records, players
+
+
+class PlayerLog:
+    """One player's games in date order with prefix sums of their stats"""
+
+    def __init__(self, capacity=32):
+        self.count = 0
+        self.dates = np.zeros(capacity, dtype=np.int32)
+        self.game_ids = np.zeros(capacity, dtype=np.int64)
+        self.prefix = np.zeros((capacity + 1, len(STAT_FIELDS)))
+
+    def _grow(self):
+        capacity = len(self.dates) * 2
+        self.dates = np.resize(self.dates, capacity)
+        self.game_ids = np.resize(self.game_ids, capacity)
+        prefix = np.zeros((capacity + 1, len(STAT_FIELDS)))
+        prefix[:self.count + 1] = self.prefix[:self.count + 1]
+        self.prefix = prefix
+
+    def append(self, game_id, day, stats):
+        """Add a game, O(1) unless it predates the last game (a late correction), which rebuilds the sums"""
+        if self.count == len(self.dates):
+            self._grow()
+        n = self.count
+        if n and day < self.dates[n - 1]:
+            games = self.games() + [(day, game_id, np.asarray(stats, dtype=float))]
+            games.sort(key=lambda game: game[0])
+            self.count = 0
+            for game_day, game_game_id, game_stats in games:
+                self.append(game_game_id, game_day, game_stats)
+            return
+        self.dates[n] = day
+        self.game_ids[n] = game_id
+        self.prefix[n + 1] = self.prefix[n] + stats
+        self.count = n + 1
+
+    def games(self):
+        """(day, game_id, stats) for every game, oldest first"""
+        stats = np.diff(self.prefix[:self.count + 1], axis=0)
+        return [(int(self.dates[i]), int(self.game_ids[i]), stats[i]) for i in range(self.count)]
+
+    def window(self, size=None):
+        """(games, per-game stats) over the last size games, or the whole season when size is None"""
+        games = self.count if size is None else min(size, self.count)
+        if not games:
+            return 0, np.zeros(len(STAT_FIELDS))
+        return games, (self.prefix[self.count] - self.prefix[self.count - games]) / games
+
+
+class GameLogStore:
+    """Append-only game log file for one season, with per-player prefix sums in memory"""
+
+    def __init__(self, season, directory=GAME_LOG_DIR):
+        self.season = season
+        self.directory = directory
+        self.data_path = os.path.join(directory, f'{season}.bin')
+        self.sidecar_path = os.path.join(directory, f'{season}.json')
+        self.lock = threading.Lock()
+        self.logs = {}
+        self.players = {}
+        self.seen = set()
+        self.count = 0
+        self.last_day = None
+        self.load()
+
+    def read_sidecar(self):
+        try:
+            with open(self.sidecar_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load(self):
+        """Load committed records from disk (records past the sidecar's count were never committed)"""
+        sidecar = self.read_sidecar()
+        if not sidecar:
+            return
+        self.sync(sidecar)
+
+    def sync(self, sidecar=None):
+        """Apply records another process committed since this store last read the file"""
+        sidecar = sidecar or self.read_sidecar()
+        if not sidecar or sidecar['count'] <= self.count:
+            return 0
+        with open(self.data_path, 'rb') as f:
+            f.seek(self.count * RECORD_DTYPE.itemsize)
+            records = np.fromfile(f, dtype=RECORD_DTYPE, count=sidecar['count'] - self.count)
+        with self.lock:
+            self.players.update({int(player_id): info for player_id, info in sidecar['players'].items()})
+            self._apply(records)
+            self.count += len(records)
+        return len(records)
+
+    def _apply(self, records):
+        for record in np.sort(records, order=['date', 'game_id']):
+            player_id = int(record['player_id'])
+            self.seen.add((player_id, int(record['game_id'])))
+            self.logs.setdefault(player_id, PlayerLog()).append(int(record['game_id']), int(record['date']),
+                                                                record['stats'])
+            if self.last_day is None or record['date'] > self.last_day:
+                self.last_day = int(record['date'])
+
+    def date_from(self):
+        """Date to fetch from: the last ingested day again (late games may have been missing), None for all"""
+        return day_date(self.last_day) if self.last_day is not None else None
+
+    def append(self, records, players):
+        """Append records for games not already stored, commit them and return how many were new"""
+        # Catch up on another worker's appends first so they aren't truncated as an uncommitted tail
+        self.sync()
+        with self.lock:
+            keys = zip(records['player_id'].tolist(), records['game_id'].tolist())
+            new = np.array([key not in self.seen for key in keys], dtype=bool)
+            records = records[new]
+            if not len(records):
+                return 0
+
+            # Drop any uncommitted tail from an interrupted run, then append and commit
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.data_path, 'ab') as f:
+                f.truncate(self.count * RECORD_DTYPE.itemsize)
+                f.write(records.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            self.players.update(players)
+            self._apply(records)
+            self.count += len(records)
+            write_json_atomic(self.sidecar_path, {
+                'season': self.season,
+                'count': self.count,
+                'last_date': self.date_from().isoformat(),
+                'players': {str(player_id): info for player_id, info in self.players.items()}
+            })
+            return len(records)
+
+    def rolling(self, size):
+        """Rolling per-game stats and fantasy value over each player's last size games"""
+        with self.lock:
+            rows = []
+            for player_id, log in self.logs.items():
+                games, per_game = log.window(size)
+                _, season = log.window()
+                rows.append((player_id, games, per_game, season))
+        if not rows:
+            return []
+
+        values = fantasy_per_game(np.array([row[2] for row in rows]))
+        season_values = fantasy_per_game(np.array([row[3] for row in rows]))
+        return [
+            dict(self.players.get(player_id, {}), player_id=player_id, games=games,
+                 per_game={field: round(float(per_game[i]), 2) for i, field in enumerate(STAT_FIELDS)},
+                 fantasy_value=round(float(value), 3),
+                 trend=round(float(value - season_value), 3))
+            for (player_id, games, per_game, _), value, season_value in zip(rows, values, season_values)
+        ]
+
+    def player(self, player_id, limit=30):
+        """A player's latest games (newest first) and rolling windows, None if they have no games"""
+        with self.lock:
+            log = self.logs.get(player_id)
+            if log is None:
+                return None
+            games = log.games()[-limit:][::-1]
+            windows = {str(size): log.window(size) for size in WINDOWS}
+            windows['season'] = log.window()
+
+        return dict(self.players.get(player_id, {}), player_id=player_id, games=[
+            dict(date=day_date(day).isoformat(), game_id=f'{game_id:010d}',
+                 fantasy_value=round(float(fantasy_per_game(stats)), 3),
+                 **{field: round(float(stats[i]), 1) for i, field in enumerate(STAT_FIELDS)})
+            for day, game_id, stats in games
+        ], rolling={
+            name: {
+                'games': count,
+                'fantasy_value': round(float(fantasy_per_game(per_game)), 3),
+                'per_game': {field: round(float(per_game[i]), 2) for i, field in enumerate(STAT_FIELDS)}
+            }
+            for name, (count, per_game) in windows.items()
+        })
+
+    def stats(self):
+        """Store counters for the health endpoint"""
+        with self.lock:
+            return {
+                'season': self.season,
+                'players': len(self.logs),
+                'games': self.count,
+                'last_date': self.date_from().isoformat() if self.last_day is not None else None
+            }
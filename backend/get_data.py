@@ -3,23 +3,58 @@ Data fetching module for NBA player statistics, injury data, and biographical in
 This module handles all external API calls and data processing.
 """
 
-import requests
-import aiohttp
 import asyncio
-import pickle
-import time
+import importlib.util
 import os
-import unicodedata
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import re
+from urllib.parse import urlsplit
 from datetime import datetime
 
-# Use NBA API to fetch player stats
-try:
-    from nba_api.stats.endpoints import leaguedashplayerstats
-    NBA_API_AVAILABLE = True
-except ImportError:
-    NBA_API_AVAILABLE = False
+from scoring import apply_scores
+from player_index import PlayerIndex
+from rankings import RankingMatrix
+from player_table import PlayerTable, rows_payload
+from similarity import SimilarityIndex
+from single_flight import SingleFlight
+from serialization import serialize_payload
+from snapshot_store import read_sidecar, read_snapshot, write_snapshot
+from shared_cache import body_blobs, refresh_leadership, shared_body
+from join_index import JoinIndex, normalize_name
+from season_store import FIRST_SEASON_START, season_string
+from event_loop import EventLoopThread
+from upstream_client import UpstreamClient, UpstreamError
+from roster_tracker import BIO_FIELDS, RosterTracker, diff_bios
+from game_logs import GameLogStore, records_from_frame
+from metrics import BIO_JOINS, CACHE_REQUESTS, UPSTREAM_ERRORS
+from startup import lazy_import
+
+# Use NBA API to fetch player stats. It pulls in pandas and requests, so it is only
+# imported once stats are actually fetched (see nba_endpoint), not at startup
+NBA_API_AVAILABLE = importlib.util.find_spec('nba_api') is not None
+if not NBA_API_AVAILABLE:
     print("NBA API is not available. Please install the nba_api package with 'pip3 install nba_api'.")
 
+# Upstream base URLs, overridable to point at a stand-in server (see benchmarks/replay_server.py)
+ESPN_API_BASE = os.environ.get('ESPN_API_BASE', 'http://site.api.espn.com/apis/site/v2/sports/basketball/nba')
+NBA_STATS_BASE = os.environ.get('NBA_STATS_BASE')
+NBA_STATS_HOST = urlsplit(NBA_STATS_BASE).netloc if NBA_STATS_BASE else 'stats.nba.com'
+
+nba_api_lock = threading.Lock()
+
+def nba_endpoint(name):
+    """An nba_api endpoint module (e.g. 'leaguedashplayerstats'), importing nba_api on first use"""
+    with nba_api_lock:
+        if 'nba_api.stats.endpoints' not in sys.modules:
+            http = lazy_import('nba_api.stats.library.http')
+            if NBA_STATS_BASE:
+                http.NBAStatsHTTP.base_url = NBA_STATS_BASE.rstrip('/') + '/{endpoint}'
+        # The endpoints package imports every endpoint (and pandas) at once
+        return getattr(lazy_import('nba_api.stats.endpoints'), name)
+
 # ESPN Team ID mapping for NBA teams
 ESPN_TEAM_IDS = {
     'ATL': 1, 'BOS': 2, 'BKN': 17, 'CHA': 30, 'CHI': 4, 'CLE': 5,
@@ -29,98 +64,307 @@ ESPN_TEAM_IDS = {
     'POR': 22, 'SAC': 23, 'SAS': 24, 'TOR': 28, 'UTA': 26, 'WAS': 27
 }
 
-# File paths for persistent caching
-CACHE_DIR = 'cache'
-BIO_CACHE_FILE = os.path.join(CACHE_DIR, 'bio_cache.pkl')
-INJURY_CACHE_FILE = os.path.join(CACHE_DIR, 'injury_cache.pkl')
+# Coalesces concurrent upstream fetches so each key is fetched once at a time
+upstream_flight = SingleFlight()
 
-def normalize_name(name):
-    """Normalize player names by removing diacritics and standardizing format"""
-    if not name:
-        return ""
-    
-    normalized = unicodedata.normalize('NFD', name)
-    ascii_name = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
-    
-    # Additional common character replacements
-    replacements = {
-        'ć': 'c', 'č': 'c',
-        'š': 's', 'ž': 'z',
-        'ñ': 'n', 'ü': 'u', 'ö': 'o', 'ä': 'a',
-        'é': 'e', 'è': 'e', 'ê': 'e', 'ë': 'e',
-        'á': 'a', 'à': 'a', 'â': 'a', 'ã': 'a',
-        'í': 'i', 'ì': 'i', 'î': 'i', 'ï': 'i',
-        'ó': 'o', 'ò': 'o', 'ô': 'o', 'õ': 'o',
-        'ú': 'u', 'ù': 'u', 'û': 'u',
-        'ý': 'y', 'ÿ': 'y'
-    }
-    
-    for accented, plain in replacements.items():
-        ascii_name = ascii_name.replace(accented, plain)
-        ascii_name = ascii_name.replace(accented.upper(), plain.upper())
-    
-    # Clean up extra spaces and return
-    return ' '.join(ascii_name.split())
+# Serializes snapshot swaps so an injury patch never overwrites a newer full refresh
+publish_lock = threading.RLock()
+
+# NBA PLAYER_ID -> ESPN athlete id links, loaded from disk on first use
+join_index = None
+join_index_lock = threading.Lock()
+
+# Append-only game log stores per season, loaded on first use
+game_log_stores = {}
+game_log_lock = threading.Lock()
+
+# ESPN athlete ids inside links like .../nba/player/_/id/4065648/...
+ESPN_ID_PATTERN = re.compile(r'/id/(\d+)')
+
+# How long the fetch pipeline waits for each source before degrading (seconds)
+SOURCE_TIMEOUTS = {
+    'nba_stats': 35,
+    'injuries': 15,
+    'bio': 20
+}
+
+# Worker threads for the fetch pipeline; a timed-out fetch keeps running in its
+# thread and still fills its cache when it finishes
+pipeline_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='fetch')
+
+# Long-lived event loop and aiohttp session shared by all ESPN requests (and the async server)
+upstream_loop = EventLoopThread()
+
+# Retries, per-host rate limits, circuit breakers and conditional GETs for every upstream call
+upstream_client = UpstreamClient(upstream_loop)
 
-def load_cache(cache_file, cache_dict):
-    """Load cached data from file if it exists and is valid"""
+# Last parsed roster, content hash and check time per ESPN team id, reused on 304s,
+# unchanged hashes and when ESPN is failing
+roster_tracker = RosterTracker()
+
+# Rolling roster refresh: each run re-checks up to ROSTER_BATCH teams not checked
+# within ROSTER_MAX_AGE seconds, so every team is revisited about once an hour
+ROSTER_MAX_AGE = int(os.environ.get('ROSTER_MAX_AGE', 3600))
+ROSTER_BATCH = int(os.environ.get('ROSTER_BATCH', 3))
+
+# Snapshot names for persistent caching (see snapshot_store.py)
+BIO_SNAPSHOT = 'rosters'  # keyed by ESPN athlete id
+INJURY_SNAPSHOT = 'injuries'
+
+def load_cache(name, cache_dict):
+    """Load a name-keyed cache (player name -> fields) from the snapshot store if it is still valid"""
     try:
-        if os.path.exists(cache_file):
-            with open(cache_file, 'rb') as f:
-                cached_data = pickle.load(f)
-                
-            # Check if cache is still valid
-            current_time = time.time()
-            if (current_time - cached_data['timestamp']) < cache_dict['duration']:
-                cache_dict['data'] = cached_data['data']
-                cache_dict['timestamp'] = cached_data['timestamp']
-                return True
+        snapshot = read_snapshot(name)
+        
+        # Check if cache is still valid
+        current_time = time.time()
+        if snapshot and (current_time - snapshot['timestamp']) < cache_dict['duration']:
+            cache_dict['data'] = {record.pop('_key'): record for record in snapshot['records']}
+            cache_dict['timestamp'] = snapshot['timestamp']
+            return True
     except Exception as e:
-        print(f"Error loading cache from {cache_file}: {e}")
+        print(f"Error loading cache {name}: {e}")
     
     return False
 
-def save_cache(cache_file, cache_dict):
-    """Save cached data to file"""
+def save_cache(name, cache_dict):
+    """Save a name-keyed cache to the snapshot store"""
+    try:
+        records = [dict(fields, _key=key) for key, fields in cache_dict['data'].items()]
+        write_snapshot(name, records,
+                       timestamp=cache_dict['timestamp'],
+                       sources={name: cache_dict['timestamp']})
+    except Exception as e:
+        print(f"Error saving cache {name}: {e}")
+
+def load_newer_cache(name, cache_dict):
+    """Load a name-keyed cache another worker persisted after ours, unless it is already due for a refresh"""
+    sidecar = read_sidecar(name)
+    if not sidecar or sidecar['timestamp'] <= cache_dict['timestamp']:
+        return False
+    
+    age = time.time() - sidecar['timestamp']
+    max_age = cache_dict.get('refresh_interval') or cache_dict['duration'] - cache_dict.get('refresh_ahead', 0)
+    return age < max_age and load_cache(name, cache_dict)
+
+def fetch_shared(name, cache_dict, fetch):
+    """Run a cache fetch as the cross-process refresh leader, reusing what another worker just fetched"""
+    with refresh_leadership(name):
+        if load_newer_cache(name, cache_dict):
+            return cache_dict['data']
+        return fetch(cache_dict)
+
+def player_snapshot_name(stats_season):
+    """Snapshot store name for a season's player payload"""
+    return f"players-{stats_season}"
+
+def save_player_cache(cache, sources):
+    """Save a player cache's payload to the snapshot store (players as columns, the rest as metadata)"""
     try:
-        # Create cache directory if it doesn't exist
-        os.makedirs(CACHE_DIR, exist_ok=True)
+        data = cache['data']
+        meta = {key: value for key, value in data.items() if key != 'players'}
+        # The pre-serialized body is stored too, so other workers can mmap it instead of rebuilding it
+        write_snapshot(player_snapshot_name(data['stats_season']), data['players'].records(),
+                       meta=meta,
+                       timestamp=cache['timestamp'],
+                       sources=sources,
+                       blobs=body_blobs(cache['snapshot']['body']))
+    except Exception as e:
+        print(f"Error saving player cache for {cache['data'].get('stats_season')}: {e}")
+
+def load_player_cache(cache, stats_season, allow_stale=False):
+    """
+    Publish a persisted player snapshot when it is newer than the in-memory one and
+    not yet due for a refresh, so restarts and other workers reuse prior fetches.
+    allow_stale publishes it however old (booting from disk), keeping its original
+    timestamp so it is still refreshed when due.
+    """
+    try:
+        name = player_snapshot_name(stats_season)
+        sidecar = read_sidecar(name)
+        if not sidecar or sidecar['timestamp'] <= cache['timestamp']:
+            return False
         
-        # Save cache data
-        cache_data = {
-            'data': cache_dict['data'],
-            'timestamp': cache_dict['timestamp']
-        }
+        age = time.time() - sidecar['timestamp']
+        if age >= cache['duration'] - cache.get('refresh_ahead', 0) and not allow_stale:
+            return False
         
-        with open(cache_file, 'wb') as f:
-            pickle.dump(cache_data, f)
-            
+        snapshot = read_snapshot(name)
+        if not snapshot:
+            return False
+        
+        data = dict(snapshot['meta'], players=snapshot['records'])
+        loaded = build_snapshot(data, snapshot['timestamp'], body=shared_body(sidecar))
+        loaded['sequence'] = sidecar.get('sequence')
+        publish_snapshot(cache, loaded)
+        print(f"💾 Loaded {name} snapshot from disk (age: {age:.0f}s)")
+        return True
     except Exception as e:
-        print(f"Error saving cache to {cache_file}: {e}")
+        print(f"Error loading player cache for {stats_season}: {e}")
+    
+    return False
+
+def build_snapshot(data, timestamp, body=None):
+    """
+    Build a player cache snapshot: the payload, its pre-serialized body, query indexes,
+    the stat matrix used for custom-weight rankings and the similar-players index.
+    body can be passed in when it was already serialized (e.g. memory-mapped from disk).
+    The player dicts are only kept as a compact PlayerTable once everything is built from them.
+    """
+    players = data['players']
+    table = PlayerTable(players)
+    return {
+        'data': dict(data, players=table),
+        'body': body or serialize_payload(data),
+        'index': PlayerIndex(table, rows=players),
+        'ranking': RankingMatrix(players),
+        'similarity': SimilarityIndex(players),
+        'timestamp': timestamp
+    }
+
+def get_game_log_store(stats_season):
+    """Return the game log store for a season, loading its committed games on first use"""
+    with game_log_lock:
+        if stats_season not in game_log_stores:
+            game_log_stores[stats_season] = GameLogStore(stats_season)
+        return game_log_stores[stats_season]
 
-def get_injuries(injury_cache):
-    """Fetch real injury data from multiple sources"""
+def get_join_index():
+    """Return the shared join index, loading persisted links on first use"""
+    global join_index
+    with join_index_lock:
+        if join_index is None:
+            join_index = JoinIndex.load()
+        return join_index
+
+def espn_athlete_id(athlete):
+    """ESPN athlete id from an athlete object, falling back to its profile links"""
+    if athlete.get('id'):
+        return str(athlete['id'])
+    for link in athlete.get('links', []):
+        found = ESPN_ID_PATTERN.search(link.get('href', ''))
+        if found:
+            return found.group(1)
+    return ''
+
+def publish_snapshot(cache, snapshot):
+    """Atomically replace a player cache's snapshot, mirroring data/timestamp for simple readers"""
+    with publish_lock:
+        cache['snapshot'] = snapshot
+        cache['data'] = snapshot['data']
+        cache['timestamp'] = snapshot['timestamp']
+
+# Player fields that injury and roster patches update in place
+INJURY_FIELDS = ('injury_status', 'injury_type', 'injury_timeline')
+PATCH_FIELDS = set(INJURY_FIELDS) | set(BIO_FIELDS)
+
+def patch_player_injuries(cache, changes):
+    """Apply injury changes to only the affected players of a cache's snapshot"""
+    return patch_players(cache, [
+        (change['espn_id'], change['name'], {field: change[field] for field in INJURY_FIELDS})
+        for change in changes
+    ])
+
+def patch_player_bios(cache, bios):
+    """Apply changed ESPN bio entries ({espn_id: bio}) to only the affected players of a cache's snapshot"""
+    return patch_players(cache, [
+        (bio.get('espn_id'), None, {field: bio.get(field, '') for field in BIO_FIELDS})
+        for bio in bios.values() if bio.get('espn_id')
+    ])
+
+def patch_players(cache, updates):
+    """
+    Apply (espn_id, name, fields) updates to only the affected players of a cache's snapshot.
+    Fields that already hold the new value are skipped; the snapshot keeps its timestamp so
+    the stats refresh schedule is unaffected. Returns the number of players patched.
+    """
+    with publish_lock:
+        snapshot = cache.get('snapshot')
+        if not snapshot or not updates:
+            return 0
+        
+        index = snapshot['index']
+        table = snapshot['data']['players']
+        rows = {}
+        for espn_id, name, fields in updates:
+            row = index.row_for(espn_id, name)
+            if row is None:
+                continue
+            current = table.row(row, fields)
+            changed = {field: value for field, value in fields.items() if field not in current or current[field] != value}
+            if changed:
+                rows.setdefault(row, {}).update(changed)
+        
+        if rows:
+            publish_snapshot(cache, patch_snapshot(snapshot, rows))
+        return len(rows)
+
+def patch_snapshot(snapshot, updates):
+    """
+    A copy of a snapshot with {row: fields} applied. Only the table columns and indexes fed by
+    the updated fields are rebuilt (everything else is shared) and the body is re-serialized.
+    """
+    fields = set().union(*updates.values())
+    if not fields <= PATCH_FIELDS:
+        # Anything else (stats, names, teams) feeds every index, rebuild it all
+        players = snapshot['data']['players'].records()
+        for row, row_fields in updates.items():
+            players[row] = dict(players[row], **row_fields)
+        patched = build_snapshot(dict(snapshot['data'], players=players), snapshot['timestamp'])
+    else:
+        table = snapshot['data']['players'].patched(updates)
+        data = dict(snapshot['data'], players=table)
+        patched = {
+            'data': data,
+            'body': serialize_payload(rows_payload(data)),
+            'index': snapshot['index'].patched(table, fields),
+            'ranking': snapshot['ranking'].patched(table, fields),
+            'similarity': snapshot['similarity'].patched(table, fields),
+            'timestamp': snapshot['timestamp']
+        }
+    patched['timings'] = snapshot.get('timings')
+    patched['degraded'] = snapshot.get('degraded', [])
+    return patched
+
+def get_injuries(injury_cache, force=False):
+    """Fetch real injury data from multiple sources (force=True skips the cache checks)"""
     current_time = time.time()
     
-    # Check in-memory cache first
-    if injury_cache['data'] and (current_time - injury_cache['timestamp']) < injury_cache['duration']:
-        return injury_cache['data']
-    
-    # Try loading from file cache
-    if load_cache(INJURY_CACHE_FILE, injury_cache):
-        return injury_cache['data']
+    if not force:
+        # Check in-memory cache first
+        if injury_cache['data'] and (current_time - injury_cache['timestamp']) < injury_cache['duration']:
+            CACHE_REQUESTS.inc(cache='injuries', result='hit')
+            return injury_cache['data']
+        CACHE_REQUESTS.inc(cache='injuries', result='stale' if injury_cache['data'] else 'miss')
+        
+        # Try loading from file cache
+        if load_cache(INJURY_SNAPSHOT, injury_cache):
+            return injury_cache['data']
     
+    # Concurrent misses share a single ESPN request (across worker processes too)
+    return upstream_flight.do('injuries', fetch_shared, INJURY_SNAPSHOT, injury_cache, fetch_injuries)
+
+def fetch_injuries(injury_cache):
+    """Fetch injury data from ESPN and store it in the injury cache"""
+    current_time = time.time()
     injury_data = {}
+    fetched = False
     start_time = time.time()
     
     try:
         # Try ESPN API v3
         try:
-            url = "http://site.api.espn.com/apis/site/v2/sports/basketball/nba/injuries"
-            response = requests.get(url, timeout=10)
+            url = f"{ESPN_API_BASE}/injuries"
+            status, data = upstream_loop.run(
+                upstream_client.get_json(url, 'injuries', deadline=upstream_client.current_deadline())
+            )
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 304 and injury_cache['data'] is not None:
+                # Unchanged since the last poll, skip the parse
+                injury_data = injury_cache['data']
+                fetched = True
+            elif status == 200:
+                fetched = True
                 
                 # Parse injury data - correct structure
                 if 'injuries' in data:
@@ -174,6 +418,7 @@ def get_injuries(injury_cache):
                                 
                                 if player_name and injury_status and injury_status.lower() != 'healthy':
                                     injury_data[player_name] = {
+                                        'espn_id': espn_athlete_id(athlete),
                                         'status': injury_status,
                                         'injury': injury_description,
                                         'timeline': timeline,
@@ -181,8 +426,15 @@ def get_injuries(injury_cache):
                                         'team': team_abbr
                                     }
                                     
+        except UpstreamError:
+            pass  # Already counted by the client, fall back to cached data below
         except Exception as e:
-            pass
+            UPSTREAM_ERRORS.inc(source='injuries', reason=type(e).__name__)
+        
+        # Keep serving the last good data if ESPN failed
+        if not fetched and injury_cache['data']:
+            print("ESPN injury fetch failed, keeping cached injury data")
+            return injury_cache['data']
         
         elapsed_time = time.time() - start_time
         print(f"Fetched ESPN injury data in {elapsed_time:.2f}s ({len(injury_data)} injuries)")
@@ -191,89 +443,113 @@ def get_injuries(injury_cache):
         # Cache the results in memory and file
         injury_cache['data'] = injury_data
         injury_cache['timestamp'] = current_time
-        save_cache(INJURY_CACHE_FILE, injury_cache)
+        save_cache(INJURY_SNAPSHOT, injury_cache)
         
         return injury_data
         
     except Exception as e:
         return {}
 
-async def get_roster(session, team_abbr, team_id, semaphore):
-    """Fetch roster data for a single team asynchronously"""
+def parse_roster(data, team_abbr):
+    """Parse an ESPN team roster response into bio records keyed by ESPN athlete id"""
+    team_bio_data = {}
+    if 'athletes' in data:
+        for athlete in data['athletes']:
+            player_name = athlete.get('displayName', '')
+            
+            if player_name:
+                # Extract bio data
+                position_data = athlete.get('position', {})
+                position = position_data.get('abbreviation', '') if isinstance(position_data, dict) else str(position_data) if position_data else ''
+                
+                height = athlete.get('displayHeight', '').replace("' ", "'")
+                weight = athlete.get('displayWeight', '')
+                jersey = athlete.get('jersey', '')
+                age = athlete.get('age', '')
+                
+                # Get birth info if available
+                birthdate = ''
+                birthplace = ''
+                if 'birthDate' in athlete:
+                    birthdate = athlete.get('birthDate', '')
+                if 'birthPlace' in athlete:
+                    birth_info = athlete.get('birthPlace', {})
+                    if isinstance(birth_info, dict):
+                        city = birth_info.get('city', '')
+                        state = birth_info.get('state', '')
+                        country = birth_info.get('country', '')
+                        birthplace = ', '.join(filter(None, [city, state, country]))
+                    else:
+                        birthplace = str(birth_info) if birth_info else ''
+                
+                # Get college/draft info if available
+                college = ''
+                if 'college' in athlete:
+                    college_info = athlete.get('college', {})
+                    if isinstance(college_info, dict):
+                        college = college_info.get('name', '')
+                    else:
+                        college = str(college_info) if college_info else ''
+                
+                espn_id = espn_athlete_id(athlete)
+                
+                player_bio = {
+                    'espn_id': espn_id,
+                    'name': player_name,
+                    'position': position,
+                    'height': height,
+                    'weight': weight,
+                    'jersey': str(jersey) if jersey else '',
+                    'age': str(age) if age else '',
+                    'birthdate': birthdate,
+                    'birthplace': birthplace,
+                    'college': college,
+                    'team': team_abbr
+                }
+                
+                # Keyed by ESPN athlete id, names are resolved by the join index
+                team_bio_data[espn_id or normalize_name(player_name)] = player_bio
+    
+    return team_bio_data
+
+async def refresh_team_roster(team_abbr, team_id, semaphore, deadline=None):
+    """Re-check one team's roster, rebuilding its bio entries only when the content changed. Returns True if changed"""
     async with semaphore:  # Limit concurrent requests
+        url = f"{ESPN_API_BASE}/teams/{team_id}/roster"
         try:
-            url = f"http://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams/{team_id}/roster"
-            async with session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    team_bio_data = {}
-                    if 'athletes' in data:
-                        for athlete in data['athletes']:
-                            player_name = athlete.get('displayName', '')
-                            
-                            if player_name:
-                                # Extract bio data
-                                position_data = athlete.get('position', {})
-                                position = position_data.get('abbreviation', '') if isinstance(position_data, dict) else str(position_data) if position_data else ''
-                                
-                                height = athlete.get('displayHeight', '').replace("' ", "'")
-                                weight = athlete.get('displayWeight', '')
-                                jersey = athlete.get('jersey', '')
-                                age = athlete.get('age', '')
-                                
-                                # Get birth info if available
-                                birthdate = ''
-                                birthplace = ''
-                                if 'birthDate' in athlete:
-                                    birthdate = athlete.get('birthDate', '')
-                                if 'birthPlace' in athlete:
-                                    birth_info = athlete.get('birthPlace', {})
-                                    if isinstance(birth_info, dict):
-                                        city = birth_info.get('city', '')
-                                        state = birth_info.get('state', '')
-                                        country = birth_info.get('country', '')
-                                        birthplace = ', '.join(filter(None, [city, state, country]))
-                                    else:
-                                        birthplace = str(birth_info) if birth_info else ''
-                                
-                                # Get college/draft info if available
-                                college = ''
-                                if 'college' in athlete:
-                                    college_info = athlete.get('college', {})
-                                    if isinstance(college_info, dict):
-                                        college = college_info.get('name', '')
-                                    else:
-                                        college = str(college_info) if college_info else ''
-                                
-                                # Normalize the name for matching
-                                normalized_name = normalize_name(player_name)
-                                
-                                player_bio = {
-                                    'position': position,
-                                    'height': height,
-                                    'weight': weight,
-                                    'jersey': str(jersey) if jersey else '',
-                                    'age': str(age) if age else '',
-                                    'birthdate': birthdate,
-                                    'birthplace': birthplace,
-                                    'college': college,
-                                    'team': team_abbr,
-                                    'original_name': player_name
-                                }
-                                
-                                team_bio_data[normalized_name] = player_bio
-                                team_bio_data[player_name] = player_bio
-                    
-                    return team_bio_data
-                    
-        except Exception as e:
-            return {}
+            status, data = await upstream_client.get_json(url, 'roster', team_abbr, deadline=deadline)
+        except UpstreamError:
+            # Retries exhausted or circuit open: fail fast to the cached roster
+            return False
         
-        return {}
+        # Unchanged roster: reuse the parse from last time
+        if status == 304 and roster_tracker.roster(team_id) is not None:
+            roster_tracker.touch(team_id)
+            return False
+        if status != 200:
+            return False
+        
+        try:
+            return roster_tracker.record(team_id, data.get('athletes', []), lambda: parse_roster(data, team_abbr))
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(source='roster', team=team_abbr, reason=type(e).__name__)
+            return False
 
-async def get_bio_async():
-    """Fetch player biographical data concurrently from ESPN API"""
+async def get_roster(team_abbr, team_id, semaphore, deadline=None):
+    """Fetch roster data for a single team asynchronously, falling back to its last parsed roster"""
+    await refresh_team_roster(team_abbr, team_id, semaphore, deadline)
+    return roster_tracker.roster(team_id) or {}
+
+async def refresh_team_rosters(team_abbrs):
+    """Re-check the given teams concurrently, returning the abbreviations whose rosters changed"""
+    semaphore = asyncio.Semaphore(10)
+    results = await asyncio.gather(*(
+        refresh_team_roster(team_abbr, ESPN_TEAM_IDS[team_abbr], semaphore) for team_abbr in team_abbrs
+    ))
+    return [team_abbr for team_abbr, changed in zip(team_abbrs, results) if changed]
+
+async def get_bio_async(deadline=None):
+    """Fetch player biographical data concurrently from ESPN API, giving up on rosters not fetched by deadline"""
     bio_data = {}
     start_time = time.time()
     
@@ -281,23 +557,19 @@ async def get_bio_async():
     semaphore = asyncio.Semaphore(10)  # Allow up to 10 concurrent requests
     
     try:
-        # Create session with connection pooling
-        connector = aiohttp.TCPConnector(limit=30, limit_per_host=10)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            
-            # Create tasks for all teams
-            tasks = []
-            for team_abbr, team_id in ESPN_TEAM_IDS.items():
-                task = get_roster(session, team_abbr, team_id, semaphore)
-                tasks.append(task)
-            
-            # Execute all requests concurrently
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Combine results from all teams
-            for result in results:
-                if isinstance(result, dict):
-                    bio_data.update(result)
+        # Create tasks for all teams
+        tasks = []
+        for team_abbr, team_id in ESPN_TEAM_IDS.items():
+            task = get_roster(team_abbr, team_id, semaphore, deadline)
+            tasks.append(task)
+        
+        # Execute all requests concurrently
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Combine results from all teams
+        for result in results:
+            if isinstance(result, dict):
+                bio_data.update(result)
         
         elapsed_time = time.time() - start_time
         print(f"Fetched ESPN bio data in {elapsed_time:.2f}s ({len(bio_data)} players)")
@@ -308,26 +580,40 @@ async def get_bio_async():
         print(f"Error in async bio data fetch: {e}")
         return {}
 
-def get_bio(bio_cache):
-    """Wrapper to run async bio data fetching"""
+def get_bio(bio_cache, force=False):
+    """Wrapper to run async bio data fetching (force=True skips the cache checks)"""
     current_time = time.time()
     
-    # Check in-memory cache first
-    if bio_cache['data'] and (current_time - bio_cache['timestamp']) < bio_cache['duration']:
-        return bio_cache['data']
-    
-    # Try loading from file cache
-    if load_cache(BIO_CACHE_FILE, bio_cache):
-        return bio_cache['data']
+    if not force:
+        # Check in-memory cache first
+        if bio_cache['data'] and (current_time - bio_cache['timestamp']) < bio_cache['duration']:
+            CACHE_REQUESTS.inc(cache='bio', result='hit')
+            return bio_cache['data']
+        CACHE_REQUESTS.inc(cache='bio', result='stale' if bio_cache['data'] else 'miss')
+        
+        # Try loading from file cache
+        if load_cache(BIO_SNAPSHOT, bio_cache):
+            return bio_cache['data']
     
+    # Concurrent misses share a single round of roster requests (across worker processes too)
+    return upstream_flight.do('bio', fetch_shared, BIO_SNAPSHOT, bio_cache, fetch_bio)
+
+def fetch_bio(bio_cache):
+    """Fetch bio data for all teams and store it in the bio cache"""
+    current_time = time.time()
     try:
-        # Run async function in event loop
-        bio_data = asyncio.run(get_bio_async())
+        # Run on the shared event loop, reusing its pooled connections
+        bio_data = upstream_loop.run(get_bio_async(upstream_client.current_deadline()))
+        
+        # Keep serving the last good data if every roster request failed
+        if not bio_data and bio_cache['data']:
+            print("ESPN roster fetch failed, keeping cached bio data")
+            return bio_cache['data']
         
         # Cache the results in memory and file
         bio_cache['data'] = bio_data
         bio_cache['timestamp'] = current_time
-        save_cache(BIO_CACHE_FILE, bio_cache)
+        save_cache(BIO_SNAPSHOT, bio_cache)
         
         return bio_data
         
@@ -335,6 +621,44 @@ def get_bio(bio_cache):
         print(f"Error fetching bio data: {e}")
         return {}
 
+def refresh_rosters(bio_cache, team_abbrs=None):
+    """
+    Incrementally refresh rosters: the given teams, or a rolling batch of the stalest ones.
+    Only teams whose content hash changed are rebuilt. Returns the bio entries that changed.
+    """
+    previous = bio_cache['data'] or {}
+    team_ids = ESPN_TEAM_IDS
+    try:
+        with refresh_leadership(BIO_SNAPSHOT):
+            # Another worker's rolling refresh already covered this run
+            if team_abbrs is None and load_newer_cache(BIO_SNAPSHOT, bio_cache):
+                roster_tracker.seed(bio_cache['data'], bio_cache['timestamp'], team_ids)
+                return diff_bios(previous, bio_cache['data'])
+            
+            # After a restart the per-team state is rebuilt from the persisted bio data
+            if previous and not roster_tracker.teams:
+                roster_tracker.seed(previous, bio_cache['timestamp'], team_ids)
+            
+            if team_abbrs is None:
+                ids_to_abbrs = {team_id: team_abbr for team_abbr, team_id in team_ids.items()}
+                stale = roster_tracker.stale_teams(list(ids_to_abbrs), ROSTER_MAX_AGE, ROSTER_BATCH)
+                team_abbrs = [ids_to_abbrs[team_id] for team_id in stale]
+            
+            changed_teams = upstream_loop.run(refresh_team_rosters(team_abbrs)) if team_abbrs else []
+            if changed_teams:
+                bio_cache['data'] = roster_tracker.merged()
+                print(f"📺 Rosters changed: {', '.join(changed_teams)}")
+            if team_abbrs:
+                bio_cache['timestamp'] = time.time()
+                save_cache(BIO_SNAPSHOT, bio_cache)
+            elif bio_cache['data'] is not None:
+                bio_cache['timestamp'] = time.time()
+            
+            return diff_bios(previous, bio_cache['data'] or {})
+    except Exception as e:
+        print(f"Error refreshing rosters: {e}")
+        return {}
+
 def get_season_info():
     """
     Dynamically determine the current NBA season for fantasy rankings.
@@ -390,12 +714,101 @@ def get_last_season():
         "description": f"Historical fantasy rankings for {prev_stats_season} season"
     }
 
+def get_available_seasons(count=10):
+    """Stats seasons with rankings available, newest first (current season plus history)"""
+    start_year = int(get_season_info()["stats_season"].split('-')[0])
+    first_year = max(start_year - count + 1, FIRST_SEASON_START)
+    return [season_string(year) for year in range(start_year, first_year - 1, -1)]
+
 def fetch_players(cache, injury_cache, bio_cache, season=None):
-    """Fetch player data from NBA API and store in cache"""
+    """Fetch player data from NBA API and store in cache, coalescing concurrent fetches per season"""
     if not NBA_API_AVAILABLE:
         print("NBA API not available, skipping pre-fetch")
         return None
     
+    key = f"players:{season or get_season_info()['stats_season']}"
+    return upstream_flight.do(key, _fetch_players, cache, injury_cache, bio_cache, season)
+
+def fetch_nba_stats(stats_season):
+    """Fetch season totals from LeagueDashPlayerStats, keeping only players with games played"""
+    player_stats = upstream_client.call(
+        NBA_STATS_HOST, 'nba_stats', nba_endpoint('leaguedashplayerstats').LeagueDashPlayerStats,
+        season=stats_season,
+        season_type_all_star='Regular Season',
+        timeout=30  # Add timeout to prevent hanging
+    )
+    
+    stats_frame = player_stats.get_data_frames()[0]
+    return stats_frame[stats_frame['GP'] > 0].reset_index(drop=True)
+
+def fetch_game_logs(stats_season, date_from=None):
+    """Fetch every player's game log for a season from LeagueGameLog, only from date_from on when given"""
+    game_log = upstream_client.call(
+        NBA_STATS_HOST, 'game_logs', nba_endpoint('leaguegamelog').LeagueGameLog,
+        player_or_team_abbreviation='P',
+        season=stats_season,
+        season_type_all_star='Regular Season',
+        date_from_nullable=date_from.strftime('%m/%d/%Y') if date_from else '',
+        timeout=30
+    )
+    return game_log.get_data_frames()[0]
+
+def ingest_game_logs(stats_season):
+    """
+    Append the games played since the last ingested date to a season's game log store.
+    One worker ingests at a time; returns the number of new games.
+    """
+    store = get_game_log_store(stats_season)
+    with refresh_leadership(f'gamelogs-{stats_season}'):
+        # Another worker may have just ingested, pick its games up before asking for more
+        store.sync()
+        start_time = time.time()
+        frame = fetch_game_logs(stats_season, store.date_from())
+        records, players = records_from_frame(frame)
+        added = store.append(records, players)
+    
+    print(f"📅 Game logs: {added} new of {len(records)} fetched in {time.time() - start_time:.3f}s")
+    return added
+
+def _timed(budget, fn, *args):
+    """Run fn with its upstream calls bounded by budget seconds and return (result, elapsed seconds)"""
+    start_time = time.time()
+    with upstream_client.budget(budget):
+        result = fn(*args)
+    return result, time.time() - start_time
+
+def run_pipeline(sources):
+    """
+    Run source fetches concurrently. sources maps name -> (fn, args).
+    Returns (results, timings, errors); a source that fails or exceeds its
+    SOURCE_TIMEOUTS budget gets a None result and an entry in errors.
+    """
+    start_time = time.time()
+    # Upstream retries share the same budget, so they stop once the pipeline stops waiting
+    futures = {
+        name: pipeline_executor.submit(_timed, SOURCE_TIMEOUTS.get(name, 30), fn, *args)
+        for name, (fn, args) in sources.items()
+    }
+    
+    results, timings, errors = {}, {}, {}
+    for name, future in futures.items():
+        remaining = SOURCE_TIMEOUTS.get(name, 30) - (time.time() - start_time)
+        try:
+            results[name], timings[name] = future.result(timeout=max(remaining, 0))
+        except FutureTimeout:
+            results[name] = None
+            timings[name] = time.time() - start_time
+            errors[name] = 'timeout'
+        except Exception as e:
+            results[name] = None
+            timings[name] = time.time() - start_time
+            errors[name] = str(e) or type(e).__name__
+    
+    timings['total'] = time.time() - start_time
+    return results, timings, errors
+
+def _fetch_players(cache, injury_cache, bio_cache, season=None):
+    """Fetch player data from NBA API and store in cache"""
     try:
         # Use provided season or get current season info
         if season:
@@ -405,42 +818,74 @@ def fetch_players(cache, injury_cache, bio_cache, season=None):
             season_info = get_season_info()
             stats_season = season_info["stats_season"]
         
+        # Reuse a fresh snapshot persisted by a previous run or another worker
+        if load_player_cache(cache, stats_season):
+            return cache['data']
+        
+        # One worker refreshes a season at a time, the others wait and load its snapshot
+        with refresh_leadership(player_snapshot_name(stats_season)):
+            if load_player_cache(cache, stats_season):
+                return cache['data']
+            return build_players(cache, injury_cache, bio_cache, season_info, stats_season)
+        
+    except Exception as e:
+        return None
+
+def build_players(cache, injury_cache, bio_cache, season_info, stats_season):
+    """Fetch every source for a season, build the player snapshot, publish and persist it"""
+    try:
         nba_start_time = time.time()
         
-        # Fetch player stats for the determined season
-        player_stats = leaguedashplayerstats.LeagueDashPlayerStats(
-            season=stats_season,
-            season_type_all_star='Regular Season',
-            timeout=30  # Add timeout to prevent hanging
-        )
+        # Fetch NBA stats, injuries and rosters concurrently, cold start costs the slowest source
+        results, timings, errors = run_pipeline({
+            'nba_stats': (fetch_nba_stats, (stats_season,)),
+            'injuries': (get_injuries, (injury_cache,)),
+            'bio': (get_bio, (bio_cache,))
+        })
         
-        player_stats_data = player_stats.get_data_frames()[0].to_dict(orient='records')
-        nba_time = time.time() - nba_start_time
+        stats_frame = results['nba_stats']
+        if stats_frame is None:
+            print(f"❌ NBA API failed for {stats_season}: {errors.get('nba_stats')}")
+            return None
+        player_stats_data = stats_frame.to_dict(orient='records')
         
-        # Fetch injury data
-        espn_start_time = time.time()
-        injury_data = get_injuries(injury_cache)
-        bio_data = get_bio(bio_cache)
-        espn_time = time.time() - espn_start_time
+        # Degrade gracefully: fall back to whatever ESPN data we last had
+        injury_data = results['injuries']
+        if injury_data is None:
+            print(f"⚠️ Injuries unavailable ({errors.get('injuries')}), using last known data")
+            injury_data = injury_cache['data'] or {}
+        bio_data = results['bio']
+        if bio_data is None:
+            print(f"⚠️ Rosters unavailable ({errors.get('bio')}), using last known data")
+            bio_data = bio_cache['data'] or {}
+        
+        # Link NBA PLAYER_IDs to ESPN athlete ids (O(1) per player once linked)
+        espn_ids = get_join_index().resolve(
+            [(player.get('PLAYER_ID'), player.get('PLAYER_NAME'), player.get('TEAM_ABBREVIATION'))
+             for player in player_stats_data],
+            bio_data
+        )
+        join_report = get_join_index().last_report
+        BIO_JOINS.inc(join_report['matched'], result='matched')
+        BIO_JOINS.inc(len(join_report['unmatched']), result='unmatched')
+        injuries_by_id = {info['espn_id']: info for info in injury_data.values() if info.get('espn_id')}
         
         # Process players
         players = []
         for player in player_stats_data:
             if player.get('GP', 0) > 0:
                 player_name = player.get('PLAYER_NAME')
+                espn_id = espn_ids.get(player.get('PLAYER_ID'), '')
                 
                 # Get injury information for this player
-                injury_info = injury_data.get(player_name, {})
+                # Try the ESPN id first, then the display name
+                injury_info = injuries_by_id.get(espn_id) or injury_data.get(player_name, {})
                 injury_status = injury_info.get('status', 'Healthy')
                 injury_type = injury_info.get('injury', None)
                 injury_timeline = injury_info.get('timeline', None)
                 
                 # Get bio information for this player
-                # Try exact match first, then normalized name
-                bio_info = bio_data.get(player_name, {})
-                if not bio_info:
-                    normalized_nba_name = normalize_name(player_name)
-                    bio_info = bio_data.get(normalized_nba_name, {})
+                bio_info = bio_data.get(espn_id, {})
                 
                 position = bio_info.get('position', '')
                 height = bio_info.get('height', '')
@@ -453,6 +898,7 @@ def fetch_players(cache, injury_cache, bio_cache, season=None):
                 
                 players.append({
                     'player_id': player.get('PLAYER_ID'),
+                    'espn_id': espn_id,
                     'name': player_name,
                     'team': player.get('TEAM_ABBREVIATION'),
                     'games_played': player.get('GP'),
@@ -482,6 +928,9 @@ def fetch_players(cache, injury_cache, bio_cache, season=None):
                     'college': college
                 })
         
+        # Score the whole league in one pass (rows line up with stats_frame)
+        apply_scores(players, stats_frame)
+        
         # Store in cache
         result_data = {
             'players': players,
@@ -494,12 +943,25 @@ def fetch_players(cache, injury_cache, bio_cache, season=None):
         if "current_season" in season_info:
             result_data['current_season'] = season_info["current_season"]
         
-        cache['data'] = result_data
-        cache['timestamp'] = time.time()
+        # Build the whole snapshot (data, pre-serialized body and query indexes) first,
+        # then swap it in with a single assignment so readers never see a half-built cache
+        snapshot = build_snapshot(result_data, time.time())
+        snapshot['timings'] = timings
+        snapshot['degraded'] = sorted(errors)
+        publish_snapshot(cache, snapshot)
+        
+        # Only persist complete snapshots so other workers don't reuse a degraded one
+        if not errors:
+            save_player_cache(cache, {
+                'nba_stats': nba_start_time,
+                'injuries': injury_cache['timestamp'],
+                'bio': bio_cache['timestamp']
+            })
         
-        print(f"🏀 NBA API: {nba_time:.3f}s | 📺 ESPN API: {espn_time:.3f}s")
+        print(f"🏀 NBA API: {timings['nba_stats']:.3f}s | 🚑 Injuries: {timings['injuries']:.3f}s | "
+              f"📺 Rosters: {timings['bio']:.3f}s | ⏱️ Total: {timings['total']:.3f}s")
         
-        return cache['data']
+        return result_data
         
     except Exception as e:
         return None
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Injury change detection and change feed.
+Each new ESPN injuries response is diffed against the previous one; the resulting
+deltas are used to patch only the affected players and are kept in a bounded feed
+so clients can pull just the changes since their last poll.
+"""
+
+import threading
+import time
+from collections import deque
+
+# Number of change events kept in memory for /api/injuries/changes
+MAX_FEED_EVENTS = 2000
+
+
+def injury_key(name, info):
+    """Key identifying a player in injury data: the ESPN id when known, else the display name"""
+    return info.get('espn_id') or name
+
+
+def player_injury_fields(info):
+    """Injury fields as they appear in the player payload (healthy players have no injury)"""
+    if not info:
+        return {'injury_status': 'Healthy', 'injury_type': None, 'injury_timeline': None}
+    return {
+        'injury_status': info.get('status', 'Healthy'),
+        'injury_type': info.get('injury', None),
+        'injury_timeline': info.get('timeline', None)
+    }
+
+
+def diff_injuries(previous, current):
+    """Diff two injury dicts (name -> info) into a list of added/updated/removed changes"""
+    previous = {injury_key(name, info): (name, info) for name, info in (previous or {}).items()}
+    current = {injury_key(name, info): (name, info) for name, info in (current or {}).items()}
+
+    changes = []
+    for key in sorted(previous.keys() | current.keys()):
+        old_name, old_info = previous.get(key, (None, None))
+        new_name, new_info = current.get(key, (None, None))
+        old_fields = player_injury_fields(old_info)
+        new_fields = player_injury_fields(new_info)
+        if old_fields == new_fields:
+            continue
+
+        if old_info is None:
+            change = 'added'
+        elif new_info is None:
+            change = 'removed'
+        else:
+            change = 'updated'
+
+        changes.append(dict(
+            new_fields,
+            espn_id=(new_info or old_info).get('espn_id', ''),
+            name=new_name or old_name,
+            change=change,
+            previous_status=old_fields['injury_status']
+        ))
+    return changes
+
+
+class InjuryFeed:
+    """Bounded, timestamped log of injury changes"""
+
+    def __init__(self, max_events=MAX_FEED_EVENTS):
+        self.events = deque(maxlen=max_events)
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.last_poll = None
+
+    def record(self, changes, timestamp=None):
+        """Append a poll's changes to the feed"""
+        timestamp = timestamp or time.time()
+        with self.lock:
+            self.last_poll = timestamp
+            for change in changes:
+                self.events.append(dict(change, timestamp=timestamp))
+
+    def since(self, since):
+        """
+        Return (changes after since, complete). complete is False when older changes were
+        already dropped from the feed, meaning the client should reload the full player list.
+        """
+        with self.lock:
+            oldest = self.events[0]['timestamp'] if self.events else self.started
+            dropped = len(self.events) == self.events.maxlen
+            complete = since >= self.started and not (dropped and since < oldest)
+            return [event for event in self.events if event['timestamp'] > since], complete
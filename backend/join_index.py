@@ -0,0 +1,222 @@
+"""
+Name normalization and the NBA <-> ESPN player join index.
+NBA PLAYER_IDs are linked to ESPN athlete ids once (exact name, normalized name,
+then a fuzzy fallback for suffixes, initials and nicknames) and the links are
+reused across refreshes, so joining a refresh is an O(1) id lookup per player.
+"""
+
+import difflib
+import threading
+import time
+import unicodedata
+
+from snapshot_store import read_snapshot, write_snapshot
+
+JOIN_INDEX_SNAPSHOT = 'join_index'
+
+# Name suffixes ignored when matching (Jr., Sr., II, III...)
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# Common nicknames used by one source and full first names used by the other
+NICKNAMES = {
+    'nic': 'nicolas',
+    'cam': 'cameron',
+    'herb': 'herbert',
+    'moe': 'moritz',
+    'kj': 'kenyon',
+    'mo': 'mohamed',
+    'bub': 'carrington',
+    'nate': 'nathan',
+    'greg': 'gregory'
+}
+
+# Minimum similarity for the last-resort same-team fuzzy match
+FUZZY_THRESHOLD = 0.85
+
+
+def _build_translation_table():
+    """Precompute a str.translate table that strips diacritics from Latin characters"""
+    table = {}
+    for codepoint in range(0x80, 0x370):
+        char = chr(codepoint)
+        if unicodedata.category(char) == 'Mn':
+            table[codepoint] = None
+            continue
+        decomposed = unicodedata.normalize('NFD', char)
+        stripped = ''.join(c for c in decomposed if unicodedata.category(c) != 'Mn')
+        if stripped != char:
+            table[codepoint] = stripped
+
+    # Letters NFD doesn't decompose
+    table.update({ord('đ'): 'd', ord('Đ'): 'D', ord('ł'): 'l', ord('Ł'): 'L', ord('ø'): 'o', ord('Ø'): 'O'})
+    return table
+
+NAME_TRANSLATION = _build_translation_table()
+
+# Punctuation handling for match keys: "P.J." -> "pj", "Shai Gilgeous-Alexander" -> "shai gilgeous alexander"
+KEY_TRANSLATION = str.maketrans({'.': '', "'": '', '’': '', ',': '', '-': ' '})
+
+
+def normalize_name(name):
+    """Normalize player names by removing diacritics and standardizing format"""
+    if not name:
+        return ""
+
+    ascii_name = name.translate(NAME_TRANSLATION)
+    if not ascii_name.isascii():
+        # Rare characters outside the precompiled table take the slow path
+        normalized = unicodedata.normalize('NFD', ascii_name)
+        ascii_name = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
+
+    # Clean up extra spaces and return
+    return ' '.join(ascii_name.split())
+
+
+def name_tokens(name):
+    """Lowercase name tokens without punctuation or suffixes"""
+    tokens = normalize_name(name).lower().translate(KEY_TRANSLATION).split()
+    return [token for token in tokens if token not in NAME_SUFFIXES] or tokens
+
+
+def match_key(name):
+    """Key used for suffix/punctuation-insensitive name matching"""
+    return ' '.join(name_tokens(name))
+
+
+def first_names_compatible(first, other):
+    """Check whether two first names plausibly refer to the same player (prefix, initials, nickname)"""
+    if first == other:
+        return True
+    if len(first) >= 2 and len(other) >= 2 and (first.startswith(other) or other.startswith(first)):
+        return True
+    return NICKNAMES.get(first) == other or NICKNAMES.get(other) == first
+
+
+class RosterLookup:
+    """Name lookups over one ESPN bio snapshot (espn_id -> bio fields)"""
+
+    def __init__(self, bio_data):
+        self.exact = {}
+        self.by_key = {}
+        self.by_last = {}
+        self.by_team = {}
+        for espn_id, bio in bio_data.items():
+            name = bio.get('name', '')
+            self.exact.setdefault(name, []).append(espn_id)
+            tokens = name_tokens(name)
+            self.by_key.setdefault(' '.join(tokens), []).append(espn_id)
+            if tokens:
+                self.by_last.setdefault(' '.join(tokens[1:]), []).append((tokens[0], espn_id))
+            self.by_team.setdefault(bio.get('team'), []).append(espn_id)
+        self.bio_data = bio_data
+
+    def _pick(self, candidates, team):
+        """Pick a single candidate, using the team to break ties"""
+        if len(candidates) == 1:
+            return candidates[0]
+        on_team = [espn_id for espn_id in candidates if self.bio_data[espn_id].get('team') == team]
+        return on_team[0] if len(on_team) == 1 else None
+
+    def match(self, name, team):
+        """Return (espn_id, method) for an NBA player name, or (None, None)"""
+        if name in self.exact:
+            espn_id = self._pick(self.exact[name], team)
+            if espn_id:
+                return espn_id, 'exact'
+
+        tokens = name_tokens(name)
+        key = ' '.join(tokens)
+        if key in self.by_key:
+            espn_id = self._pick(self.by_key[key], team)
+            if espn_id:
+                return espn_id, 'normalized'
+
+        # Same last name with a compatible first name (initials, prefixes, nicknames)
+        if tokens:
+            candidates = [
+                espn_id for first, espn_id in self.by_last.get(' '.join(tokens[1:]), [])
+                if first_names_compatible(tokens[0], first)
+            ]
+            if candidates:
+                espn_id = self._pick(candidates, team)
+                if espn_id:
+                    return espn_id, 'nickname'
+
+        # Last resort: closest name on the same team
+        best_id, best_ratio = None, 0.0
+        for espn_id in self.by_team.get(team, []):
+            ratio = difflib.SequenceMatcher(None, key, match_key(self.bio_data[espn_id].get('name', ''))).ratio()
+            if ratio > best_ratio:
+                best_id, best_ratio = espn_id, ratio
+        if best_ratio >= FUZZY_THRESHOLD:
+            return best_id, 'fuzzy'
+
+        return None, None
+
+
+class JoinIndex:
+    """Persistent NBA PLAYER_ID -> ESPN athlete id links, reused across refreshes"""
+
+    def __init__(self, links=None):
+        self.links = links or {}
+        self.lock = threading.Lock()
+        self.last_report = {'matched': 0, 'unmatched': [], 'methods': {}}
+
+    @classmethod
+    def load(cls):
+        """Load links persisted by a previous run"""
+        snapshot = read_snapshot(JOIN_INDEX_SNAPSHOT)
+        if not snapshot:
+            return cls()
+        return cls({
+            record['nba_id']: {'espn_id': record['espn_id'], 'method': record['method']}
+            for record in snapshot['records']
+        })
+
+    def save(self):
+        """Persist the links to the snapshot store"""
+        try:
+            records = [dict(link, nba_id=nba_id) for nba_id, link in self.links.items()]
+            write_snapshot(JOIN_INDEX_SNAPSHOT, records, timestamp=time.time())
+        except Exception as e:
+            print(f"Error saving join index: {e}")
+
+    def resolve(self, players, bio_data):
+        """
+        Map each (player_id, name, team) to an ESPN athlete id present in bio_data.
+        Known links are O(1) lookups, only new or broken links go through name matching.
+        Returns {player_id: espn_id} and records a match report in last_report.
+        """
+        with self.lock:
+            return self._resolve(players, bio_data)
+
+    def _resolve(self, players, bio_data):
+        resolved = {}
+        unmatched = []
+        methods = {}
+        lookup = None
+        changed = False
+
+        for player_id, name, team in players:
+            link = self.links.get(player_id)
+            if link and link['espn_id'] in bio_data:
+                resolved[player_id] = link['espn_id']
+                methods['linked'] = methods.get('linked', 0) + 1
+                continue
+
+            # Build name lookups lazily, a steady-state refresh never needs them
+            if lookup is None:
+                lookup = RosterLookup(bio_data)
+            espn_id, method = lookup.match(name, team)
+            if espn_id:
+                resolved[player_id] = espn_id
+                self.links[player_id] = {'espn_id': espn_id, 'method': method}
+                methods[method] = methods.get(method, 0) + 1
+                changed = True
+            else:
+                unmatched.append({'player_id': player_id, 'name': name, 'team': team})
+
+        self.last_report = {'matched': len(resolved), 'unmatched': unmatched, 'methods': methods}
+        if changed:
+            self.save()
+        return resolved
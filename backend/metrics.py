@@ -0,0 +1,188 @@
+"""
+In-process metrics exposed in the Prometheus text format at /api/metrics.
+Counters, gauges and histograms are kept per label set in plain dicts.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from cache hits up to slow upstream calls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+registry = []
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labelnames, values, extra=None):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class: a named metric with one series per label set"""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.series = {}
+        self.lock = threading.Lock()
+        registry.append(self)
+
+    def key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self.lock:
+            for values, value in sorted(self.series.items()):
+                lines.append(f'{self.name}{format_labels(self.labelnames, values)} {format_value(value)}')
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.series[key] = self.series.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.series[self.key(labels)] = value
+
+    def clear(self):
+        with self.lock:
+            self.series.clear()
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self.key(labels)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][i] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of a block (also around awaits in async code)"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start_time, **labels)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self.lock:
+            for values, series in sorted(self.series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series['counts']):
+                    cumulative += count
+                    labels = format_labels(self.labelnames, values, f'le="{format_value(bound)}"')
+                    lines.append(f'{self.name}_bucket{labels} {cumulative}')
+                labels = format_labels(self.labelnames, values)
+                lines.append(f'{self.name}_sum{labels} {format_value(series["sum"])}')
+                lines.append(f'{self.name}_count{labels} {series["count"]}')
+        return lines
+
+
+def render_all():
+    """All registered metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# Upstream calls: source is nba_stats, injuries or roster (per ESPN team)
+UPSTREAM_LATENCY = Histogram(
+    'statline_upstream_request_duration_seconds',
+    'Latency of upstream NBA and ESPN requests',
+    ('source', 'team')
+)
+UPSTREAM_ERRORS = Counter(
+    'statline_upstream_errors_total',
+    'Failed upstream requests by source and reason',
+    ('source', 'team', 'reason')
+)
+UPSTREAM_RETRIES = Counter(
+    'statline_upstream_retries_total',
+    'Upstream requests retried after a transient failure',
+    ('host',)
+)
+UPSTREAM_NOT_MODIFIED = Counter(
+    'statline_upstream_not_modified_total',
+    'Upstream revalidations answered with 304 Not Modified',
+    ('source',)
+)
+CIRCUIT_OPEN = Gauge(
+    'statline_upstream_circuit_open',
+    'Whether the circuit breaker for an upstream host is open (1) or closed (0)',
+    ('host',)
+)
+
+# API endpoints, labelled by route rule rather than raw path
+ENDPOINT_LATENCY = Histogram(
+    'statline_http_request_duration_seconds',
+    'Latency of API requests by route',
+    ('endpoint', 'method', 'status')
+)
+
+# Cache lookups for the players, injuries, bio and last_season caches
+CACHE_REQUESTS = Counter(
+    'statline_cache_requests_total',
+    'Cache lookups by result (hit, miss, stale)',
+    ('cache', 'result')
+)
+SNAPSHOT_AGE = Gauge(
+    'statline_snapshot_age_seconds',
+    'Seconds since each cache was last fetched',
+    ('cache',)
+)
+PAYLOAD_SIZE = Gauge(
+    'statline_payload_bytes',
+    'Size of the pre-serialized player payload by encoding',
+    ('cache', 'encoding')
+)
+
+# NBA <-> ESPN bio joins, counted per player on every fetch
+BIO_JOINS = Counter(
+    'statline_bio_joins_total',
+    'NBA players joined (or not) to ESPN bio data',
+    ('result',)
+)
@@ -0,0 +1,228 @@
+"""
+Prebuilt indexes for answering filtered, sorted and paginated player queries.
+An index is built once per cache refresh so each query only touches the rows it returns.
+"""
+
+import bisect
+import copy
+import unicodedata
+
+import numpy as np
+
+# Sort keys supported by the query API (same names as the stat dropdown in ui.js)
+STAT_SORT_KEYS = ['ppg', 'rpg', 'apg', 'spg', 'bpg', 'tpg', 'fg_pct', 'fg3_pct', 'ft_pct', 'ts_pct', 'mpg']
+SORT_KEYS = ['fantasy', 'name', 'team'] + STAT_SORT_KEYS
+
+# Stat sorts only consider players with at least this many games by default
+MIN_GAMES_FOR_STATS = 10
+
+# Fewer turnovers is better, so "desc" (best first) means ascending for tpg
+LOWER_IS_BETTER = {'tpg'}
+
+# Total fields divided by games played for per-game sort keys
+PER_GAME_FIELDS = {
+    'ppg': 'points',
+    'rpg': 'rebounds',
+    'apg': 'assists',
+    'spg': 'steals',
+    'bpg': 'blocks',
+    'tpg': 'turnovers',
+    'mpg': 'minutes'
+}
+
+
+def fold_text(text):
+    """Lowercase text and strip diacritics so prefix matching ignores accents"""
+    if not text:
+        return ''
+    normalized = unicodedata.normalize('NFD', text)
+    return ''.join(c for c in normalized if unicodedata.category(c) != 'Mn').lower()
+
+
+def true_shooting_pct(player):
+    """True Shooting % using the same formula as calculateTrueShootingPct in fantasy_algorithm.js"""
+    games_played = player.get('games_played') or 1
+    points = (player.get('points') or 0) / games_played
+    fgm = (player.get('fgm') or 0) / games_played
+    ftm = (player.get('ftm') or 0) / games_played
+
+    fg_pct = player.get('fg_pct') or 0
+    ft_pct = player.get('ft_pct') or 0
+    fga = fgm / fg_pct if fg_pct > 0 else 0
+    fta = ftm / ft_pct if ft_pct > 0 else 0
+
+    if fga == 0 and fta == 0:
+        return 0.0
+    return points / (2 * (fga + 0.44 * fta)) * 100
+
+
+def sort_value(player, key):
+    """Value a player is sorted by for a given sort key"""
+    if key == 'fantasy':
+        return player.get('fantasy_value') or 0
+    if key == 'name':
+        return fold_text(player.get('name'))
+    if key == 'team':
+        return player.get('team') or ''
+    if key == 'ts_pct':
+        return true_shooting_pct(player)
+    if key in PER_GAME_FIELDS:
+        total = player.get(PER_GAME_FIELDS[key])
+        games_played = player.get('games_played')
+        return total / games_played if total and games_played else 0
+    return player.get(key) or 0
+
+
+def position_buckets(position):
+    """Position buckets a player belongs to (G/F/C plus the exact ESPN position)"""
+    if not position:
+        return ['unknown']
+    position = position.upper()
+    buckets = [bucket for bucket in ('G', 'F', 'C') if bucket in position]
+    if position not in buckets:
+        buckets.append(position)
+    return buckets
+
+
+def injury_buckets(status):
+    """Injury buckets a player belongs to (healthy/injured plus the exact ESPN status)"""
+    if not status or status == 'Healthy':
+        return ['healthy']
+    return ['injured', status.lower()]
+
+
+class PlayerIndex:
+    """Inverted indexes per team/position/injury bucket and a presorted permutation per sort key"""
+
+    def __init__(self, players, rows=None):
+        """players is what pages are read from (a list or PlayerTable); rows are the same players as dicts"""
+        self.players = players
+        self.size = len(players)
+        players = rows if rows is not None else list(players)
+        self.games_played = np.array([player.get('games_played') or 0 for player in players], dtype=float)
+
+        # Row lookups used to patch individual players
+        self.rows_by_espn_id = {player['espn_id']: row for row, player in enumerate(players) if player.get('espn_id')}
+        self.rows_by_name = {player.get('name'): row for row, player in enumerate(players)}
+
+        # Inverted indexes: bucket -> sorted array of row ids
+        self.teams = self._build_buckets(players, lambda player: [player.get('team') or ''])
+        self.positions = self._build_buckets(players, lambda player: position_buckets(player.get('position')))
+        self.injuries = self._build_buckets(players, lambda player: injury_buckets(player.get('injury_status')))
+
+        # Sorted (token, row) pairs so name prefix lookups are a bisect
+        tokens = []
+        for row, player in enumerate(players):
+            name = fold_text(player.get('name'))
+            for token in set([name] + name.split()):
+                tokens.append((token, row))
+        tokens.sort()
+        self.name_tokens = [token for token, _ in tokens]
+        self.name_rows = np.array([row for _, row in tokens], dtype=int)
+
+        # Presorted permutations (best first) and their inverse for each sort key
+        self.orders = {}
+        self.positions_in_order = {}
+        for key in SORT_KEYS:
+            order = self._sorted_rows(players, key)
+            inverse = np.empty(self.size, dtype=int)
+            inverse[order] = np.arange(self.size)
+            self.orders[key] = order
+            self.positions_in_order[key] = inverse
+
+    def row_for(self, espn_id=None, name=None):
+        """Row id of a player by ESPN id, falling back to the display name"""
+        if espn_id and espn_id in self.rows_by_espn_id:
+            return self.rows_by_espn_id[espn_id]
+        return self.rows_by_name.get(name)
+
+    def patched(self, players, fields):
+        """
+        A copy reading pages from players (a patched table) with only the bucket indexes over
+        the given fields rebuilt. Patches only touch injury and bio fields, so the sort orders,
+        name tokens and row lookups are shared.
+        """
+        index = copy.copy(self)
+        index.players = players
+        if 'injury_status' in fields:
+            index.injuries = self._build_buckets(players.column('injury_status'), injury_buckets)
+        if 'position' in fields:
+            index.positions = self._build_buckets(players.column('position'), position_buckets)
+        return index
+
+    def _build_buckets(self, players, buckets_for):
+        """Build an inverted index from bucket name to row ids (players can also be one field's values)"""
+        index = {}
+        for row, player in enumerate(players):
+            for bucket in buckets_for(player):
+                index.setdefault(bucket, []).append(row)
+        return {bucket: np.array(rows, dtype=int) for bucket, rows in index.items()}
+
+    def _sorted_rows(self, players, key):
+        """Row ids ordered best first for a sort key (stable, ties keep snapshot order)"""
+        values = [sort_value(player, key) for player in players]
+        if key in ('name', 'team'):
+            # Strings sort Z-A for "desc", matching the UI
+            order = sorted(range(self.size), key=lambda row: values[row], reverse=True)
+            return np.array(order, dtype=int)
+
+        values = np.array(values, dtype=float)
+        if key not in LOWER_IS_BETTER:
+            values = -values
+        return np.argsort(values, kind='stable')
+
+    def _bucket_rows(self, index, bucket):
+        """Row ids for a bucket, matching team/position/injury names case-insensitively"""
+        for name in (bucket, bucket.upper(), bucket.lower()):
+            if name in index:
+                return index[name]
+        return np.array([], dtype=int)
+
+    def _name_prefix_rows(self, prefix):
+        """Row ids whose full name or any name token starts with prefix"""
+        prefix = fold_text(prefix).strip()
+        start = bisect.bisect_left(self.name_tokens, prefix)
+        end = bisect.bisect_left(self.name_tokens, prefix + '\uffff')
+        return np.unique(self.name_rows[start:end])
+
+    def query(self, team=None, position=None, injury=None, min_games=None, name_prefix=None,
+              sort='fantasy', direction='desc', offset=0, limit=50):
+        """Return (matched_count, page_of_players) for the given filters, sort and page"""
+        if sort not in self.orders:
+            raise ValueError(f"Unknown sort key '{sort}'")
+        if direction not in ('asc', 'desc'):
+            raise ValueError(f"Unknown sort direction '{direction}'")
+
+        if min_games is None and sort in STAT_SORT_KEYS:
+            min_games = MIN_GAMES_FOR_STATS
+
+        # Collect the candidate row sets, smallest first
+        row_sets = []
+        for index, bucket in ((self.teams, team), (self.positions, position), (self.injuries, injury)):
+            if bucket and bucket != 'all':
+                row_sets.append(self._bucket_rows(index, bucket))
+        if name_prefix:
+            row_sets.append(self._name_prefix_rows(name_prefix))
+        row_sets.sort(key=len)
+
+        order = self.orders[sort]
+        if direction == 'asc':
+            order = order[::-1]
+
+        if not row_sets:
+            if not min_games:
+                # Unfiltered: a page is a slice of the presorted permutation
+                return self.size, [self.players[row] for row in order[offset:offset + limit]]
+            rows = order[self.games_played[order] >= min_games]
+            return len(rows), [self.players[row] for row in rows[offset:offset + limit]]
+
+        candidates = row_sets[0]
+        for rows in row_sets[1:]:
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        if min_games:
+            candidates = candidates[self.games_played[candidates] >= min_games]
+
+        # Sort only the matching rows by their position in the presorted permutation
+        ranks = self.positions_in_order[sort][candidates]
+        candidates = candidates[np.argsort(ranks if direction == 'desc' else -ranks)]
+        return len(candidates), [self.players[row] for row in candidates[offset:offset + limit]]
@@ -0,0 +1,240 @@
+"""
+Compact struct-of-arrays representation of a player snapshot.
+Numeric fields are NumPy columns and string fields are dictionary-encoded against
+interned strings, so field names are stored once per snapshot instead of once per
+player and repeated values (teams, positions, colleges, birthplaces) are shared by
+every row and every snapshot. The table still reads like a list of player dicts:
+rows are materialized on access.
+"""
+
+import sys
+
+import numpy as np
+
+# Integer columns use the smallest of these that holds every value
+INT_DTYPES = (np.int32, np.int64)
+
+
+def _is_int(value):
+    return isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+
+
+def column_kind(values):
+    """
+    'int', 'float' or 'str' when every present value has that type, 'dict' when every
+    value is a dict (stored as a nested table), 'object' for anything else
+    """
+    present = [value for value in values if value is not None]
+    if not present:
+        return 'object'
+    if len(present) == len(values) and all(isinstance(value, dict) for value in values):
+        return 'dict'
+    if all(_is_int(value) for value in present):
+        return 'int'
+    if all(isinstance(value, (float, np.floating)) for value in present):
+        return 'float'
+    if all(isinstance(value, str) for value in present):
+        return 'str'
+    return 'object'
+
+
+def _int_dtype(values):
+    low, high = min(values, default=0), max(values, default=0)
+    for dtype in INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return None
+
+
+class Column:
+    """One field of a player table: a typed array (or dictionary codes) plus null/missing rows"""
+
+    __slots__ = ('kind', 'values', 'vocabulary', 'nulls')
+
+    def __init__(self, values):
+        self.kind = column_kind(values)
+        self.vocabulary = None
+        self.nulls = None
+        null_rows = [row for row, value in enumerate(values) if value is None]
+        if null_rows and self.kind != 'object':
+            self.nulls = np.zeros(len(values), dtype=bool)
+            self.nulls[null_rows] = True
+
+        if self.kind == 'int':
+            dtype = _int_dtype([value for value in values if value is not None])
+            if dtype is None:
+                self.kind = 'object'
+            else:
+                self.values = np.array([0 if value is None else value for value in values], dtype=dtype)
+        elif self.kind == 'float':
+            self.values = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        elif self.kind == 'str':
+            # Interned strings are shared with every other snapshot holding the same value
+            vocabulary = {}
+            codes = [-1 if value is None else vocabulary.setdefault(sys.intern(value), len(vocabulary))
+                     for value in values]
+            self.vocabulary = list(vocabulary)
+            self.values = np.array(codes, dtype=np.int16 if len(vocabulary) < 2 ** 15 else np.int32)
+            self.nulls = None
+        elif self.kind == 'dict':
+            # e.g. position_ranks: a few keys per player become a few compact sub-columns
+            self.values = PlayerTable(values)
+
+        if self.kind == 'object':
+            self.values = list(values)
+            self.nulls = None
+
+    def get(self, row):
+        if self.kind in ('object', 'dict'):
+            return self.values[row]
+        if self.kind == 'str':
+            code = self.values[row]
+            return self.vocabulary[code] if code >= 0 else None
+        if self.nulls is not None and self.nulls[row]:
+            return None
+        return self.values[row].item()
+
+    def tolist(self):
+        """Every value of the column as plain Python objects"""
+        if self.kind == 'object':
+            return list(self.values)
+        if self.kind == 'dict':
+            return self.values.records()
+        if self.kind == 'str':
+            vocabulary = self.vocabulary + [None]  # code -1 picks the trailing None
+            return [vocabulary[code] for code in self.values.tolist()]
+        values = self.values.tolist()
+        if self.nulls is not None:
+            for row in np.flatnonzero(self.nulls).tolist():
+                values[row] = None
+        return values
+
+    def nbytes(self):
+        """Bytes held by this column alone (interned strings are shared, so only their references count)"""
+        if self.kind == 'object':
+            return sys.getsizeof(self.values) + sum(sys.getsizeof(value) for value in self.values)
+        if self.kind == 'dict':
+            return self.values.nbytes()
+        size = self.values.nbytes + (self.nulls.nbytes if self.nulls is not None else 0)
+        if self.vocabulary is not None:
+            size += sys.getsizeof(self.vocabulary)
+        return size
+
+
+class PlayerTable:
+    """Player records stored column by column, readable as a sequence of dicts"""
+
+    def __init__(self, records):
+        self.size = len(records)
+        # Union of keys in first-seen order so records with optional fields still round-trip
+        self.names = list(dict.fromkeys(key for record in records for key in record))
+        self.columns = {name: Column([record.get(name) for record in records]) for name in self.names}
+        # Rows that lack a key entirely (not just hold None), as a mask per field
+        self.missing = {}
+        for name in self.names:
+            missing = np.array([name not in record for record in records], dtype=bool)
+            if missing.any():
+                self.missing[name] = missing
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+        return self.row(row)
+
+    def row(self, row, fields=None):
+        """Materialize one row as a dict, with only the given fields when fields is set"""
+        if row < 0:
+            row += self.size
+        if not 0 <= row < self.size:
+            raise IndexError('player row out of range')
+        names = self.names if fields is None else [name for name in fields if name in self.columns]
+        return {
+            name: self.columns[name].get(row) for name in names
+            if name not in self.missing or not self.missing[name][row]
+        }
+
+    def __iter__(self):
+        return iter(self.records())
+
+    def patched(self, updates):
+        """
+        A copy with {row: {field: value}} applied. Only the columns of updated fields are
+        rebuilt, every other column is shared with this table.
+        """
+        table = object.__new__(PlayerTable)
+        table.size = self.size
+        table.names = list(self.names)
+        table.columns = dict(self.columns)
+        table.missing = dict(self.missing)
+        fields = list(dict.fromkeys(field for fields in updates.values() for field in fields))
+        for name in fields:
+            values = self.column(name)
+            missing = self.missing.get(name, np.zeros(self.size, dtype=bool) if name in self.columns
+                                       else np.ones(self.size, dtype=bool)).copy()
+            for row, row_fields in updates.items():
+                if name in row_fields:
+                    values[row] = row_fields[name]
+                    missing[row] = False
+            if name not in self.columns:
+                table.names.append(name)
+            table.columns[name] = Column(values)
+            if missing.any():
+                table.missing[name] = missing
+            else:
+                table.missing.pop(name, None)
+        return table
+
+    def column(self, name):
+        """One field for every row as a list (None where a player lacks it)"""
+        column = self.columns.get(name)
+        return column.tolist() if column else [None] * self.size
+
+    def records(self, fields=None):
+        """Materialize every row as a dict, with only the given fields when fields is set"""
+        names = self.names if fields is None else [name for name in fields if name in self.columns]
+        if not names:
+            return [{} for _ in range(self.size)]
+        values = [self.columns[name].tolist() for name in names]
+        records = [dict(zip(names, row)) for row in zip(*values)]
+        for name in names:
+            if name in self.missing:
+                for row in np.flatnonzero(self.missing[name]).tolist():
+                    del records[row][name]
+        return records
+
+    def to_columns(self, fields=None):
+        """{field: values} with each field name once (nested dict fields too), the columnar wire format"""
+        names = self.names if fields is None else [name for name in fields if name in self.columns]
+        return {
+            name: self.columns[name].values.to_columns() if self.columns[name].kind == 'dict'
+            else self.columns[name].tolist()
+            for name in names
+        }
+
+    def nbytes(self):
+        """Approximate bytes held by the table itself"""
+        return (sum(column.nbytes() for column in self.columns.values())
+                + sum(missing.nbytes for missing in self.missing.values()))
+
+
+def parse_fields(text, names):
+    """Parse ?fields=name,team,points into a tuple of known field names (None when not given)"""
+    if text is None or not text.strip():
+        return None
+    fields = tuple(dict.fromkeys(field.strip() for field in text.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in names]
+    if unknown:
+        raise ValueError(f"Unknown field '{unknown[0]}', use any of: {', '.join(names)}")
+    return fields
+
+
+def rows_payload(data, fields=None):
+    """A player payload with one object per player, projected to fields when given"""
+    return dict(data, players=data['players'].records(fields))
+
+
+def columnar_payload(data, fields=None):
+    """A player payload with its players sent as one array per field instead of one object per player"""
+    return dict(data, players=data['players'].to_columns(fields), format='columnar')
@@ -0,0 +1,70 @@
+"""
+Standalone process that hosts the projection process pool.
+Spawned pool workers re-import the parent's __main__, which for the server is app.py with its
+caches, fetch threads and upstream clients. ProjectionEngine starts this module as its own
+program instead and sends it simulation jobs over a local connection, so pool workers only
+import this module and projections.
+
+Protocol: the parent writes a hex authkey line to stdin, this process answers with the port it
+listens on, and each connection carries one list of simulate_players jobs and gets back
+('ok', results) or ('error', message). Closing stdin shuts the pool down.
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, wait
+
+from projections import simulate_players
+
+
+def exit_with_parent():
+    """Pool initializer: end the worker when this host process dies, even if it was killed"""
+    parent = multiprocessing.parent_process()
+
+    def watch():
+        wait([parent.sentinel])
+        os._exit(1)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def serve(connection, pool):
+    """Run one batch of jobs on the pool and send back the results"""
+    with connection:
+        try:
+            jobs = connection.recv()
+            connection.send(('ok', list(pool.map(simulate_players, *zip(*jobs)))))
+        except (EOFError, OSError):
+            pass
+        except Exception as e:
+            connection.send(('error', f'{type(e).__name__}: {e}'))
+
+
+def main(workers):
+    authkey = bytes.fromhex(sys.stdin.readline().strip())
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'), initializer=exit_with_parent)
+    listener = Listener(('127.0.0.1', 0), authkey=authkey)
+
+    def wait_for_parent():
+        # stdin closes when the server exits, however it exits
+        sys.stdin.read()
+        pool.shutdown(wait=True, cancel_futures=True)
+        os._exit(0)
+
+    threading.Thread(target=wait_for_parent, daemon=True).start()
+    print(listener.address[1], flush=True)
+
+    while True:
+        try:
+            connection = listener.accept()
+        except (AuthenticationError, EOFError, OSError):
+            continue
+        threading.Thread(target=serve, args=(connection, pool), daemon=True).start()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]))
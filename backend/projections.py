@@ -0,0 +1,264 @@
+"""
+Monte Carlo season projections.
+Each player's season is simulated tens of thousands of times: games missed come from the
+current injury status/timeline plus an availability rate drawn from past games played,
+and per-game production is drawn around the rates implied by the season's totals.
+Simulations are vectorized with NumPy and split across a process pool (hosted by
+projection_worker); the resulting P10/P50/P90 bands are computed once per snapshot.
+"""
+
+import hashlib
+import os
+import re
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import Client
+
+import numpy as np
+
+from scoring import (
+    AGE_MULTIPLIERS, MAX_VALID_AGE, MIN_VALID_AGE,
+    games_played_multipliers, parse_ages, player_per_game_matrix, weight_vector
+)
+
+# Simulated seasons per player
+DEFAULT_SIMULATIONS = int(os.environ.get('PROJECTION_SIMULATIONS', 20000))
+
+# Worker processes for simulations (0 runs them in-process)
+DEFAULT_WORKERS = int(os.environ.get('PROJECTION_WORKERS', min(os.cpu_count() or 1, 4)))
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'projection_worker.py')
+
+# Players simulated per vectorized batch, bounds memory to a few sims x 64 arrays
+BATCH_PLAYERS = 64
+
+SEASON_GAMES = 82
+SEASON_DAYS = 174  # Regular season length, so a day out costs about half a game
+
+PERCENTILES = (10, 50, 90)
+
+# Expected games missed for statuses without a usable return timeline
+STATUS_GAMES_MISSED = {
+    'out': 5,
+    'doubtful': 2,
+    'questionable': 0.5,
+    'day-to-day': 0.5,
+    'suspension': 3
+}
+
+# Spread of games missed around the expected value (return dates slip both ways)
+MISSED_GAMES_SIGMA = 0.5
+
+# Smooth aging curve through the middle of each scoring.AGE_MULTIPLIERS bracket
+AGE_CURVE_AGES = np.array([20, 21.5, 23.5, 25.5, 28, 30.5, 32.5, 34.5, 36])
+
+TIMELINE_PATTERN = re.compile(r'^(\d+)\s+(day|month)s?$')
+
+
+def expected_games_missed(status, timeline):
+    """Expected games an injured player still misses, from the ESPN status and timeline text"""
+    status = (status or '').lower()
+    if not status or status == 'healthy':
+        return 0.0
+
+    timeline = (timeline or '').strip().lower()
+    if timeline == 'long-term':
+        return float(SEASON_GAMES)
+    if timeline == 'expected back':
+        return 0.0
+    match = TIMELINE_PATTERN.match(timeline)
+    if match:
+        days = int(match.group(1)) * (30 if match.group(2) == 'month' else 1)
+        return min(days * SEASON_GAMES / SEASON_DAYS, SEASON_GAMES)
+    return STATUS_GAMES_MISSED.get(status, 0.0)
+
+
+def smooth_age_multipliers(ages):
+    """Age multiplier interpolated between bracket midpoints, neutral (1.0) for missing ages"""
+    ages = np.asarray(ages, dtype=float)
+    valid = (ages >= MIN_VALID_AGE) & (ages <= MAX_VALID_AGE)
+    return np.where(valid, np.interp(np.where(valid, ages, 0), AGE_CURVE_AGES, AGE_MULTIPLIERS), 1.0)
+
+
+def simulate_players(totals, games_played, team_games, games_missed, age_factors, weights, simulations, seed):
+    """
+    Simulate seasons for a batch of players and return percentile bands, shape (3, k) each,
+    for the fantasy value, season fantasy points and games played.
+    """
+    rng = np.random.default_rng(seed)
+    k = len(games_played)
+    bands = {'value': [], 'season_points': [], 'games': []}
+
+    # Each category's season total is Gamma-Poisson (negative binomial) around the observed rate,
+    # and given the games played the weighted sum has mean g/gp * sum(w * a) and variance
+    # g/gp * (1 + g/gp) * sum(w^2 * a), so fantasy points take one normal draw per season
+    shape = totals + 0.5
+    points_mean = shape @ weights
+    points_var = shape @ (weights ** 2)
+
+    # Arrays are (players, simulations) so the percentiles partition contiguous rows
+    for start in range(0, k, BATCH_PLAYERS):
+        rows = slice(start, start + BATCH_PLAYERS)
+        played = games_played[rows, None]
+        n = len(played)
+
+        # Availability rate ~ Beta posterior of games played out of team games so far
+        missed_so_far = np.maximum(team_games - played, 0)
+        availability = rng.beta(played + 1, missed_so_far + 1, size=(n, simulations))
+
+        # Games lost to the current injury, lognormal around the expected value
+        expected = games_missed[rows]
+        out = np.zeros((n, simulations))
+        injured = np.flatnonzero(expected > 0)
+        if len(injured):
+            draws = rng.lognormal(np.log(expected[injured, None]), MISSED_GAMES_SIGMA, size=(len(injured), simulations))
+            out[injured] = np.where(expected[injured, None] >= SEASON_GAMES, SEASON_GAMES, np.rint(draws))
+        available = SEASON_GAMES - np.minimum(out, SEASON_GAMES)
+
+        # Binomial(available, availability) by its normal approximation, several times cheaper to draw
+        mean_games = available * availability
+        games = mean_games + np.sqrt(mean_games * (1 - availability)) * rng.standard_normal((n, simulations))
+        games = np.clip(np.rint(games), 0, available)
+
+        ratio = games / played
+        noise = rng.standard_normal((n, simulations))
+        points = ratio * points_mean[rows, None] + np.sqrt(ratio * (1 + ratio) * points_var[rows, None]) * noise
+        points = np.maximum(points, 0.0)
+
+        value = points / np.maximum(games, 1) * games_played_multipliers(games) * age_factors[rows, None]
+        value[games == 0] = 0.0
+
+        bands['value'].append(np.percentile(value, PERCENTILES, axis=1))
+        bands['season_points'].append(np.percentile(points, PERCENTILES, axis=1))
+        bands['games'].append(np.percentile(games, PERCENTILES, axis=1))
+
+    return {name: np.concatenate(parts, axis=1) for name, parts in bands.items()}
+
+
+class WorkerPool:
+    """Client of a projection_worker process running a pool of simulation processes"""
+
+    def __init__(self, workers):
+        self.authkey = secrets.token_bytes(32)
+        self.process = subprocess.Popen([sys.executable, WORKER_SCRIPT, str(workers)],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.process.stdin.write(self.authkey.hex().encode('ascii') + b'\n')
+        self.process.stdin.flush()
+        port = self.process.stdout.readline().strip()
+        if not port:
+            raise OSError(f'projection worker exited during startup (code {self.process.wait()})')
+        self.address = ('127.0.0.1', int(port))
+
+    def map(self, jobs):
+        """simulate_players results for each job, in order"""
+        with Client(self.address, authkey=self.authkey) as connection:
+            connection.send(jobs)
+            status, result = connection.recv()
+        if status != 'ok':
+            raise BrokenProcessPool(result)
+        return result
+
+    def shutdown(self):
+        """Stop the worker process; closing its stdin lets it shut the pool down first"""
+        try:
+            self.process.stdin.close()
+            self.process.wait(5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+
+
+class ProjectionEngine:
+    """Runs Monte Carlo projections for a snapshot on a lazily started process pool"""
+
+    def __init__(self, simulations=DEFAULT_SIMULATIONS, workers=DEFAULT_WORKERS):
+        self.simulations = simulations
+        self.workers = workers
+        self.pool = None
+        self.pool_lock = threading.Lock()
+        self.runs = 0
+        self.last_duration = None
+
+    def get_pool(self):
+        # A pool spawned from here would re-import the server's __main__ (app.py) in every worker,
+        # and forking a process that already runs the event loop and refresher threads isn't safe
+        # Projections of different snapshots run concurrently, only one of them may start the pool
+        if self.pool is None and self.workers > 0:
+            with self.pool_lock:
+                if self.pool is None and self.workers > 0:
+                    self.pool = WorkerPool(self.workers)
+        return self.pool
+
+    def run(self, jobs):
+        """Simulate each chunk on the pool, in-process when there is no pool or it can't start"""
+        if not jobs:
+            return []
+        try:
+            pool = self.get_pool()
+            if pool:
+                return pool.map(jobs)
+        except (OSError, EOFError, RuntimeError, BrokenProcessPool) as e:
+            print(f"⚠️ Projection pool unavailable ({e}), simulating in-process")
+            with self.pool_lock:
+                if self.pool:
+                    self.pool.shutdown()
+                self.pool = None
+                self.workers = 0
+        return [simulate_players(*job) for job in jobs]
+
+    def project(self, players, seed_text=''):
+        """Percentile bands per player (aligned with players) for value, season_points and games"""
+        start_time = time.time()
+        per_game = player_per_game_matrix(players)
+        games_played = np.array([player.get('games_played') or 0 for player in players], dtype=float)
+        totals = np.rint(per_game * games_played[:, None])
+        team_games = max(games_played.max(initial=0), 1)
+        games_missed = np.array([
+            expected_games_missed(player.get('injury_status'), player.get('injury_timeline'))
+            for player in players
+        ])
+        age_factors = smooth_age_multipliers(parse_ages([player.get('age') for player in players]))
+        weights = weight_vector()
+
+        # Seeded from the snapshot so every worker process projects the same snapshot identically
+        seed = int(hashlib.sha256(seed_text.encode('utf-8')).hexdigest()[:16], 16)
+        chunks = max(self.workers, 1)
+        bounds = np.linspace(0, len(players), chunks + 1).astype(int)
+        seeds = np.random.SeedSequence(seed).spawn(chunks)
+        jobs = [
+            (totals[lo:hi], games_played[lo:hi], team_games, games_missed[lo:hi], age_factors[lo:hi],
+             weights, self.simulations, seeds[i])
+            for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])) if hi > lo
+        ]
+
+        results = self.run(jobs)
+        bands = {
+            name: np.concatenate([result[name] for result in results], axis=1)
+            for name in ('value', 'season_points', 'games')
+        } if results else {}
+        self.runs += 1
+        self.last_duration = time.time() - start_time
+        return {
+            'bands': bands,
+            'simulations': self.simulations,
+            'duration': self.last_duration,
+            'computed_at': time.time()
+        }
+
+    def stats(self):
+        """Engine counters for the health endpoint"""
+        return {
+            'simulations': self.simulations,
+            'workers': self.workers,
+            'runs': self.runs,
+            'last_duration': round(self.last_duration, 3) if self.last_duration is not None else None
+        }
+
+
+def band(bands, name, row, digits=1):
+    """P10/P50/P90 of one projected quantity for a snapshot row (digits=None rounds to ints)"""
+    return {f'p{p}': round(float(bands[name][i][row]), digits) for i, p in enumerate(PERCENTILES)}
@@ -0,0 +1,163 @@
+"""
+League rankings under custom scoring weights.
+Each snapshot gets a RankingMatrix built once, holding the per-game stat matrix and the
+games played and age multipliers, so ranking the league under any weight vector is one
+matrix-vector product plus an argsort. Results are kept in an LRU
+keyed by the normalized weight vector, age adjustment and season.
+"""
+
+import copy
+import math
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from metrics import CACHE_REQUESTS
+from scoring import (
+    CATEGORIES, DEFAULT_WEIGHTS, age_multipliers, games_played_multipliers, parse_ages,
+    player_per_game_matrix, position_masks
+)
+
+# Names accepted in ?weights= (the category names themselves plus box score abbreviations)
+WEIGHT_ALIASES = dict({category: category for category in CATEGORIES}, **{
+    '3pm': 'fg3m',
+    '2pm': 'fg2m',
+    'reb': 'rebounds',
+    'ast': 'assists',
+    'stl': 'steals',
+    'blk': 'blocks',
+    'tov': 'turnovers',
+    'to': 'turnovers'
+})
+
+# Weights are rounded before keying the cache so 1.2 and 1.20000001 share an entry
+WEIGHT_PRECISION = 4
+MAX_WEIGHT = 100
+
+# Ranked weight vectors kept in memory (about 6 KB each for a 500-player league)
+DEFAULT_CACHE_SIZE = int(os.environ.get('RANKINGS_CACHE_SIZE', 4096))
+
+FLAG_VALUES = {'on': True, 'true': True, '1': True, 'yes': True,
+               'off': False, 'false': False, '0': False, 'no': False}
+
+
+def parse_weights(text):
+    """Parse 'fg3m:3,reb:1.2' into a full weights dict; categories left out keep their default weight"""
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in (text or '').split(','):
+        if not part.strip():
+            continue
+        name, _, value = part.partition(':')
+        category = WEIGHT_ALIASES.get(name.strip().lower())
+        if category is None:
+            raise ValueError(f"Unknown category '{name.strip()}', use one of: {', '.join(WEIGHT_ALIASES)}")
+        try:
+            weight = float(value)
+        except ValueError:
+            raise ValueError(f"Weight for '{name.strip()}' must be a number")
+        if not math.isfinite(weight) or abs(weight) > MAX_WEIGHT:
+            raise ValueError(f"Weight for '{name.strip()}' must be between -{MAX_WEIGHT} and {MAX_WEIGHT}")
+        weights[category] = weight
+    return weights
+
+
+def parse_flag(text, default=True):
+    """Parse an on/off query flag"""
+    if text is None or text == '':
+        return default
+    flag = FLAG_VALUES.get(text.lower())
+    if flag is None:
+        raise ValueError(f"Expected on or off, got '{text}'")
+    return flag
+
+
+def weights_key(weights):
+    """Normalized weight vector aligned with CATEGORIES, usable as a cache key"""
+    # Adding 0.0 turns -0.0 into 0.0 so both spellings share an entry
+    return tuple(round(float(weights.get(category, 0.0)), WEIGHT_PRECISION) + 0.0 for category in CATEGORIES)
+
+
+class RankingMatrix:
+    """Per-game stat matrix of a snapshot plus its games played and age multipliers"""
+
+    def __init__(self, players):
+        self.per_game = player_per_game_matrix(players)
+        games_played = np.array([player.get('games_played') or 0 for player in players], dtype=float)
+
+        # Applied in the same order as scoring.fantasy_values so default weights reproduce fantasy_value exactly;
+        # players without games are worth nothing, whatever the weights
+        self.games_multipliers = np.where(games_played > 0, games_played_multipliers(games_played), 0.0)
+        self.age_multipliers = age_multipliers(parse_ages([player.get('age') for player in players]))
+        self.position_masks = position_masks([player.get('position') for player in players])
+
+    def patched(self, players, fields):
+        """
+        Copy with age multipliers and position masks rebuilt from a patched table when a bio patch
+        changed them. Otherwise the same matrix, so ranking cache entries stay valid.
+        """
+        if 'age' not in fields and 'position' not in fields:
+            return self
+        matrix = copy.copy(self)
+        matrix.age_multipliers = age_multipliers(parse_ages(players.column('age')))
+        matrix.position_masks = position_masks(players.column('position'))
+        return matrix
+
+    def rank(self, weight_key, age_adjust=True):
+        """Fantasy values and row order (best first) under a weight vector"""
+        values = self.per_game @ np.asarray(weight_key, dtype=float)
+        values *= self.games_multipliers
+        if age_adjust:
+            values *= self.age_multipliers
+        values = np.maximum(values, 0.0)
+        order = np.argsort(-values, kind='stable')
+        return values, order.astype(np.int32)
+
+
+class RankingCache:
+    """LRU of ranked weight vectors; entries computed from an older snapshot are recomputed"""
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def rank(self, snapshot, season, weights, age_adjust=True):
+        """(values, order) for a snapshot's league under a weights dict"""
+        matrix = snapshot['ranking']
+        key = (season, weights_key(weights), age_adjust)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] is matrix:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                CACHE_REQUESTS.inc(cache='rankings', result='hit')
+                return entry[1]
+
+        CACHE_REQUESTS.inc(cache='rankings', result='stale' if entry else 'miss')
+        result = matrix.rank(key[1], age_adjust)
+
+        with self.lock:
+            self.entries[key] = (matrix, result)
+            self.entries.move_to_end(key)
+            self.misses += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def stats(self):
+        """Cache counters for the health endpoint"""
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,135 @@
+"""
+Background refresher that keeps the caches warm (stale-while-revalidate).
+Each cache is rebuilt on a schedule shortly before it expires and the new data is
+swapped in by the fetch functions, so requests always get the last good snapshot
+immediately and never wait on upstream latency.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Defaults for cache dicts that don't define their own refresh policy
+DEFAULT_REFRESH_AHEAD = 300   # Start refreshing 5 minutes before expiry
+DEFAULT_RETRY_INTERVAL = 60   # Wait a minute before retrying a failed refresh
+
+
+def apply_env_policy(name, cache_dict):
+    """
+    Override a cache's refresh policy from environment variables, e.g. for name='players':
+    PLAYERS_CACHE_DURATION, PLAYERS_REFRESH_AHEAD, PLAYERS_REFRESH_INTERVAL,
+    PLAYERS_RETRY_INTERVAL, PLAYERS_REFRESH_EAGER
+    """
+    prefix = name.upper()
+    for key, env_name in (('duration', f'{prefix}_CACHE_DURATION'),
+                          ('refresh_ahead', f'{prefix}_REFRESH_AHEAD'),
+                          ('refresh_interval', f'{prefix}_REFRESH_INTERVAL'),
+                          ('retry_interval', f'{prefix}_RETRY_INTERVAL')):
+        if os.environ.get(env_name):
+            cache_dict[key] = int(os.environ[env_name])
+
+    eager = os.environ.get(f'{prefix}_REFRESH_EAGER')
+    if eager:
+        cache_dict['eager'] = eager.lower() in ('1', 'true', 'yes', 'on')
+
+    return cache_dict
+
+
+class BackgroundRefresher:
+    """Periodically refreshes registered caches before they expire"""
+
+    def __init__(self, tick=5, max_workers=4):
+        self.tick = tick
+        self.jobs = {}
+        self.running = set()
+        self.last_attempt = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='refresh')
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def register(self, name, cache_dict, refresh):
+        """Register a cache dict and the function that rebuilds it"""
+        apply_env_policy(name, cache_dict)
+        self.jobs[name] = (cache_dict, refresh)
+
+    def is_due(self, name, now=None):
+        """Check whether a cache should be rebuilt now according to its policy"""
+        cache_dict, _ = self.jobs[name]
+        now = now or time.time()
+
+        # Back off after a failed attempt so a down upstream isn't hammered
+        retry_interval = cache_dict.get('retry_interval', DEFAULT_RETRY_INTERVAL)
+        if now - self.last_attempt.get(name, 0) < retry_interval:
+            return False
+
+        if not cache_dict['data']:
+            return cache_dict.get('eager', True)
+
+        # Caches with a refresh interval are polled on that schedule instead
+        age = now - cache_dict['timestamp']
+        if cache_dict.get('refresh_interval'):
+            return age >= cache_dict['refresh_interval']
+
+        refresh_ahead = cache_dict.get('refresh_ahead', DEFAULT_REFRESH_AHEAD)
+        return age >= cache_dict['duration'] - refresh_ahead
+
+    def is_stale(self, name, now=None):
+        """Check whether a cache is past its duration (it is still served while refreshing)"""
+        cache_dict, _ = self.jobs[name]
+        now = now or time.time()
+        return (now - cache_dict['timestamp']) >= cache_dict['duration']
+
+    def trigger(self, name):
+        """Start a background refresh of one cache unless one is already running"""
+        with self.lock:
+            if name in self.running:
+                return False
+            self.running.add(name)
+            self.last_attempt[name] = time.time()
+
+        self.executor.submit(self._run, name)
+        return True
+
+    def _run(self, name):
+        """Run a refresh job and record how it went"""
+        cache_dict, refresh = self.jobs[name]
+        start_time = time.time()
+        try:
+            result = refresh()
+            elapsed_time = time.time() - start_time
+            if result:
+                # Successful refreshes don't count towards the retry backoff
+                self.last_attempt[name] = 0
+                print(f"♻️ Refreshed {name} in {elapsed_time:.3f}s")
+            else:
+                print(f"⚠️ Refresh of {name} returned no data, keeping last snapshot")
+        except Exception as e:
+            print(f"⚠️ Refresh of {name} failed, keeping last snapshot: {e}")
+        finally:
+            with self.lock:
+                self.running.discard(name)
+
+    def _loop(self):
+        """Scheduler loop checking every registered cache each tick"""
+        while not self.stop_event.is_set():
+            now = time.time()
+            for name in list(self.jobs):
+                if self.is_due(name, now):
+                    self.trigger(name)
+            self.stop_event.wait(self.tick)
+
+    def start(self):
+        """Start the scheduler thread (safe to call more than once)"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, name='cache-refresher', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread, in-flight refreshes are allowed to finish"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=self.tick + 1)
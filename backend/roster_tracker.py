@@ -0,0 +1,120 @@
+"""
+Per-team roster freshness tracking for incremental bio refreshes.
+Each team keeps its last parsed roster, a content hash of ESPN's athlete list and
+when it was last checked, so a rolling refresh only revisits the stalest teams and
+only rebuilds a team's bio entries when its hash actually changes.
+"""
+
+import hashlib
+import json
+import threading
+import time
+
+# Player fields that come from ESPN rosters
+BIO_FIELDS = ('position', 'height', 'weight', 'jersey', 'age', 'birthdate', 'birthplace', 'college')
+
+
+def content_hash(athletes):
+    """Stable hash of a roster's athlete list"""
+    encoded = json.dumps(athletes, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+def diff_bios(previous, current):
+    """Bio entries that are new or whose bio fields changed, keyed by ESPN id"""
+    changed = {}
+    for key, bio in current.items():
+        old = previous.get(key)
+        if old is None or any(old.get(field) != bio.get(field) for field in BIO_FIELDS):
+            changed[key] = bio
+    return changed
+
+
+class RosterTracker:
+    """Last parsed roster, content hash and check times per ESPN team id"""
+
+    def __init__(self):
+        self.teams = {}
+        self.lock = threading.Lock()
+        self.rebuilds = 0
+        self.unchanged = 0
+
+    def clear(self):
+        """Forget every team, so each one is fetched and parsed again"""
+        with self.lock:
+            self.teams = {}
+
+    def seed(self, bio_data, timestamp, team_ids):
+        """
+        Rebuild per-team state from a merged bio dict (e.g. loaded from disk).
+        Hashes are unknown, so each team's next check re-parses it once.
+        """
+        rosters = {}
+        for key, bio in bio_data.items():
+            team_id = team_ids.get(bio.get('team'))
+            if team_id is not None:
+                rosters.setdefault(team_id, {})[key] = bio
+
+        with self.lock:
+            self.teams = {
+                team_id: {'roster': roster, 'hash': None, 'checked': timestamp, 'changed': timestamp}
+                for team_id, roster in rosters.items()
+            }
+
+    def record(self, team_id, athletes, parse):
+        """Store a fetched roster; parse() only runs when the content hash changed. Returns True if changed"""
+        digest = content_hash(athletes)
+        now = time.time()
+        with self.lock:
+            team = self.teams.get(team_id)
+            if team and team['hash'] == digest:
+                team['checked'] = now
+                self.unchanged += 1
+                return False
+
+        roster = parse()
+        with self.lock:
+            self.teams[team_id] = {'roster': roster, 'hash': digest, 'checked': now, 'changed': now}
+            self.rebuilds += 1
+        return True
+
+    def touch(self, team_id):
+        """Mark a team as checked without changes (e.g. after a 304)"""
+        with self.lock:
+            if team_id in self.teams:
+                self.teams[team_id]['checked'] = time.time()
+                self.unchanged += 1
+
+    def roster(self, team_id):
+        with self.lock:
+            team = self.teams.get(team_id)
+            return team['roster'] if team else None
+
+    def stale_teams(self, team_ids, max_age, limit, now=None):
+        """Up to limit team ids not checked within max_age seconds, never-checked and oldest first"""
+        now = now or time.time()
+        with self.lock:
+            checked = {team_id: self.teams[team_id]['checked'] for team_id in self.teams}
+        stale = [team_id for team_id in team_ids if now - checked.get(team_id, 0) >= max_age]
+        stale.sort(key=lambda team_id: checked.get(team_id, 0))
+        return stale[:limit]
+
+    def merged(self):
+        """All teams' rosters as one bio dict keyed by ESPN id"""
+        bio_data = {}
+        with self.lock:
+            for team in self.teams.values():
+                bio_data.update(team['roster'])
+        return bio_data
+
+    def stats(self, now=None):
+        """Freshness counters for the health endpoint"""
+        now = now or time.time()
+        with self.lock:
+            ages = [now - team['checked'] for team in self.teams.values()]
+            return {
+                'teams': len(self.teams),
+                'oldest_check_age': round(max(ages)) if ages else None,
+                'rebuilds': self.rebuilds,
+                'unchanged': self.unchanged
+            }
@@ -0,0 +1,189 @@
+"""
+Fantasy scoring engine for NBA player statistics.
+Scores a whole LeagueDashPlayerStats frame in one vectorized NumPy pass so
+clients only need to render the precomputed values and ranks.
+"""
+
+import numpy as np
+
+# Per-game categories used by the fantasy algorithm, in matrix column order
+CATEGORIES = ['fg3m', 'fg2m', 'ftm', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers']
+
+# Default weights for each category (mirrors frontend/js/fantasy_algorithm.js)
+DEFAULT_WEIGHTS = {
+    'fg3m': 3.0,         # Three Point Field Goals: 3 points
+    'fg2m': 2.0,         # Two Point Field Goals: 2 points
+    'ftm': 1.0,          # Free Throws Made: 1 point
+    'rebounds': 1.2,     # Rebounds: 1.2 points
+    'assists': 1.5,      # Assists: 1.5 points
+    'steals': 2.0,       # Steals: 2 points
+    'blocks': 2.0,       # Blocked Shots: 2 points
+    'turnovers': -1.5    # Turnovers: -1.5 points
+}
+
+# Games played multiplier: full boost starts at 70 games and is capped at 1.07x
+GAMES_PLAYED_THRESHOLD = 70
+GAMES_PLAYED_CAP = 1.07
+
+# Age brackets: an age <= AGE_BRACKET_EDGES[i] gets AGE_MULTIPLIERS[i],
+# anything above the last edge gets the final multiplier
+AGE_BRACKET_EDGES = np.array([20, 22, 24, 26, 29, 31, 33, 35])
+AGE_MULTIPLIERS = np.array([0.99, 1.02, 1.03, 1.04, 1.05, 1.00, 0.99, 0.98, 0.97])
+MIN_VALID_AGE = 18
+MAX_VALID_AGE = 45
+
+# Position buckets used for per-position ranks (same rules as the position filter in ui.js)
+POSITION_BUCKETS = ['G', 'F', 'C']
+
+
+def weight_vector(weights=None):
+    """Build a weight vector aligned with CATEGORIES, falling back to the defaults"""
+    weights = weights or DEFAULT_WEIGHTS
+    return np.array([weights.get(category, 0.0) for category in CATEGORIES], dtype=float)
+
+
+def per_game_matrix(stats_frame):
+    """Convert season totals from a LeagueDashPlayerStats frame into an (n, 8) per-game matrix"""
+    def column(name):
+        return stats_frame[name].fillna(0).to_numpy(dtype=float)
+
+    games_played = column('GP')
+    fg3m = column('FG3M')
+    totals = np.column_stack([
+        fg3m,
+        column('FGM') - fg3m,
+        column('FTM'),
+        column('REB'),
+        column('AST'),
+        column('STL'),
+        column('BLK'),
+        column('TOV')
+    ])
+
+    return per_game_rates(totals, games_played)
+
+
+def player_per_game_matrix(players):
+    """Same (n, 8) per-game matrix, built from cached player dicts instead of a stats frame"""
+    def column(name):
+        return np.array([player.get(name) or 0 for player in players], dtype=float)
+
+    games_played = column('games_played')
+    fg3m = column('fg3m')
+    totals = np.column_stack([
+        fg3m,
+        column('fgm') - fg3m,
+        column('ftm'),
+        column('rebounds'),
+        column('assists'),
+        column('steals'),
+        column('blocks'),
+        column('turnovers')
+    ]).reshape(len(players), len(CATEGORIES))
+    return per_game_rates(totals, games_played)
+
+
+def per_game_rates(totals, games_played):
+    """Divide an (n, 8) matrix of season totals by games played"""
+    # Avoid division by zero, players without games are zeroed out below
+    safe_games = np.where(games_played > 0, games_played, 1.0)
+    per_game = totals / safe_games[:, None]
+    per_game[games_played <= 0] = 0.0
+    return per_game
+
+
+def parse_ages(ages):
+    """Parse ESPN age strings into a float array, using NaN for missing or invalid values"""
+    parsed = np.full(len(ages), np.nan)
+    for i, age in enumerate(ages):
+        try:
+            parsed[i] = int(float(age))
+        except (TypeError, ValueError):
+            continue
+    return parsed
+
+
+def age_multipliers(ages):
+    """Vectorized age multiplier, neutral (1.0) for missing or out of range ages"""
+    ages = np.asarray(ages, dtype=float)
+    valid = (ages >= MIN_VALID_AGE) & (ages <= MAX_VALID_AGE)
+    brackets = np.searchsorted(AGE_BRACKET_EDGES, np.where(valid, ages, 0), side='left')
+    return np.where(valid, AGE_MULTIPLIERS[brackets], 1.0)
+
+
+def games_played_multipliers(games_played):
+    """Vectorized games played multiplier, only players with 70+ games get a boost"""
+    games_played = np.asarray(games_played, dtype=float)
+    boosted = np.minimum(games_played / GAMES_PLAYED_THRESHOLD, GAMES_PLAYED_CAP)
+    return np.where(games_played >= GAMES_PLAYED_THRESHOLD, boosted, 1.0)
+
+
+def fantasy_values(per_game, games_played, ages, weights=None, age_adjust=True):
+    """Compute fantasy values for every player from a per-game matrix"""
+    games_played = np.asarray(games_played, dtype=float)
+    scores = per_game @ weight_vector(weights)
+    scores *= games_played_multipliers(games_played)
+    if age_adjust:
+        scores *= age_multipliers(ages)
+
+    # Don't allow negative scores, and players without games are worth nothing
+    scores = np.maximum(scores, 0.0)
+    scores[games_played <= 0] = 0.0
+    return scores
+
+
+def rank_values(values, mask=None):
+    """Return 1-based descending ranks (ties keep input order), 0 for rows outside the mask"""
+    values = np.asarray(values, dtype=float)
+    if mask is None:
+        mask = np.ones(len(values), dtype=bool)
+
+    rows = np.flatnonzero(mask)
+    order = rows[np.argsort(-values[rows], kind='stable')]
+    ranks = np.zeros(len(values), dtype=int)
+    ranks[order] = np.arange(1, len(order) + 1)
+    return ranks
+
+
+def position_masks(positions):
+    """Build a boolean mask per position bucket from ESPN position abbreviations"""
+    upper = np.array([(position or '').upper() for position in positions], dtype=object)
+    return {
+        bucket: np.array([bucket in position for position in upper], dtype=bool)
+        for bucket in POSITION_BUCKETS
+    }
+
+
+def score_frame(stats_frame, ages, positions):
+    """
+    Score a whole league in one pass.
+    Returns fantasy values, overall ranks and a dict of per-position ranks (0 = not in bucket).
+    """
+    per_game = per_game_matrix(stats_frame)
+    games_played = stats_frame['GP'].fillna(0).to_numpy(dtype=float)
+    values = fantasy_values(per_game, games_played, parse_ages(ages))
+
+    overall = rank_values(values)
+    by_position = {
+        bucket: rank_values(values, mask)
+        for bucket, mask in position_masks(positions).items()
+    }
+    return values, overall, by_position
+
+
+def apply_scores(players, stats_frame):
+    """Attach fantasy_value, overall_rank and position_ranks to player dicts aligned with stats_frame rows"""
+    values, overall, by_position = score_frame(
+        stats_frame,
+        [player.get('age') for player in players],
+        [player.get('position') for player in players]
+    )
+
+    for i, player in enumerate(players):
+        player['fantasy_value'] = round(float(values[i]), 3)
+        player['overall_rank'] = int(overall[i])
+        player['position_ranks'] = {
+            bucket: int(ranks[i]) for bucket, ranks in by_position.items() if ranks[i]
+        }
+
+    return players
@@ -0,0 +1,120 @@
+"""
+Season-keyed player dataset store with a memory budget and LRU eviction.
+Historical seasons never change: once fetched they are persisted permanently in the
+snapshot store and later loads come from disk, never from stats.nba.com.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from single_flight import SingleFlight
+
+# First season LeagueDashPlayerStats has data for
+FIRST_SEASON_START = 1996
+
+# Default memory budget for historical seasons kept in RAM
+DEFAULT_MEMORY_BUDGET = int(os.environ.get('SEASON_STORE_BUDGET_MB', 64)) * 1024 * 1024
+
+SEASON_PATTERN = re.compile(r'^(\d{4})-(\d{2})$')
+
+
+def season_start_year(season):
+    """Start year of a 'YYYY-YY' season string, None if it isn't a valid season"""
+    match = SEASON_PATTERN.match(season or '')
+    if not match:
+        return None
+    start_year = int(match.group(1))
+    if (start_year + 1) % 100 != int(match.group(2)):
+        return None
+    return start_year
+
+
+def season_string(start_year):
+    """Format a start year as a 'YYYY-YY' season string"""
+    return f"{start_year}-{str(start_year + 1)[2:]}"
+
+
+def snapshot_size(snapshot):
+    """Rough in-memory size of a player snapshot in bytes"""
+    body = snapshot['body']
+    encoded = sum(len(body[key]) for key in ('raw', 'gzip', 'br') if body.get(key))
+    # The player table is measured, its indexes take roughly the raw JSON size
+    return encoded + snapshot['data']['players'].nbytes() + len(body['raw'])
+
+
+class SeasonStore:
+    """LRU store of historical season snapshots with a memory budget"""
+
+    def __init__(self, fetch, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.fetch = fetch
+        self.memory_budget = memory_budget
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.lock = threading.Lock()
+        self.evictions = 0
+        # Concurrent first requests for a season share one load
+        self.flight = SingleFlight()
+
+    def new_entry(self):
+        """Cache dict for a historical season, it never expires"""
+        return {
+            'data': None,
+            'timestamp': 0,
+            'duration': float('inf'),
+            'refresh_ahead': 0
+        }
+
+    def cached(self, season):
+        """A season's snapshot if it is in memory, marked as recently used"""
+        with self.lock:
+            entry = self.entries.get(season)
+            if entry:
+                self.entries.move_to_end(season)
+                return entry['snapshot']
+        return None
+
+    def get(self, season):
+        """Return a season's snapshot, loading it from disk or fetching it once if needed"""
+        return self.cached(season) or self.flight.do(season, self.load, season)
+
+    def load(self, season):
+        """Load a season into the store, unless a load that just finished already did"""
+        snapshot = self.cached(season)
+        if snapshot:
+            return snapshot
+
+        # fetch_players reuses a persisted snapshot before going to the network
+        entry = self.new_entry()
+        if not self.fetch(entry, season) or not entry.get('snapshot'):
+            return None
+
+        with self.lock:
+            self.entries[season] = entry
+            self.entries.move_to_end(season)
+            self.sizes[season] = snapshot_size(entry['snapshot'])
+            self._evict()
+        return entry['snapshot']
+
+    def _evict(self):
+        """Drop least recently used seasons until the store fits its budget (always keeps one)"""
+        while len(self.entries) > 1 and self.memory_usage() > self.memory_budget:
+            season, _ = self.entries.popitem(last=False)
+            self.sizes.pop(season, None)
+            self.evictions += 1
+            print(f"🗑️ Evicted {season} from memory (still on disk)")
+
+    def memory_usage(self):
+        """Estimated bytes held by seasons in memory"""
+        return sum(self.sizes.values())
+
+    def stats(self):
+        """Store counters for the health endpoint"""
+        with self.lock:
+            return {
+                'seasons_in_memory': list(self.entries),
+                'memory_usage': self.memory_usage(),
+                'memory_budget': self.memory_budget,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,99 @@
+"""
+Pre-serialized response bodies for cache snapshots.
+Each snapshot is encoded to JSON and compressed once when it is built, so a warm
+request only has to pick the right bytes and compare ETags.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+# Brotli is optional, gzip is always available
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Bodies are compressed on every refresh and every injury/bio patch, so these trade a few
+# percent of compressed size for compression that costs milliseconds instead of about a second
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Bodies serialized on demand (e.g. ?fields= projections) kept across requests
+BODY_CACHE_SIZE = 64
+
+# NDJSON streams send a small first chunk so clients can paint the top rows right away
+NDJSON_FIRST_CHUNK = 25
+NDJSON_CHUNK = 100
+
+
+def encode_json(data):
+    """Encode data as compact UTF-8 JSON"""
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def serialize_payload(data):
+    """Serialize a payload once into raw, gzip and (if available) brotli bytes plus a content-hash ETag"""
+    raw = encode_json(data)
+    return {
+        'raw': raw,
+        'gzip': gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0),
+        'br': brotli.compress(raw, quality=BROTLI_QUALITY) if BROTLI_AVAILABLE else None,
+        # Weak ETag: the encodings are semantically equivalent representations
+        'etag': hashlib.sha256(raw).hexdigest()[:32]
+    }
+
+
+def choose_encoding(body, accept_encodings):
+    """Pick the best encoding the client accepts: brotli, then gzip, then identity"""
+    if body['br'] is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def iter_ndjson(rows, first_chunk=NDJSON_FIRST_CHUNK, chunk=NDJSON_CHUNK):
+    """Yield rows (any iterable, read lazily) as newline-delimited JSON, a small first chunk and then larger ones"""
+    lines, size = [], first_chunk
+    for row in rows:
+        lines.append(encode_json(row) + b'\n')
+        if len(lines) == size:
+            yield b''.join(lines)
+            lines, size = [], chunk
+    if lines:
+        yield b''.join(lines)
+
+
+class BodyCache:
+    """LRU of bodies serialized on demand, keyed by snapshot ETag plus the request options"""
+
+    def __init__(self, max_entries=BODY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            body = self.entries.get(key)
+            if body is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            return body
+
+    def put(self, key, body):
+        with self.lock:
+            self.entries[key] = body
+            self.misses += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        """Cache counters for the health endpoint"""
+        with self.lock:
+            return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,193 @@
+"""
+Async serving mode: an aiohttp server running on the same long-lived event loop
+as the ESPN fetches (see event_loop.py).
+
+Snapshot hits for /api/players and /api/players/last-season (in either wire format,
+once serialized) are answered directly on the loop from the pre-serialized bodies, so they keep flowing at full
+concurrency while a refresh is in flight. Every other request (and a cold cache)
+is handed to the Flask app on a worker thread pool, so slow upstream work never
+blocks the loop.
+
+    python3 serve_async.py
+"""
+
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote_to_bytes
+
+from aiohttp import web
+from werkzeug.http import parse_accept_header, parse_etags
+
+import app as flask_app
+from get_data import upstream_loop
+from metrics import ENDPOINT_LATENCY
+from startup import boot_timeline
+
+# Worker threads for requests handed to the Flask app
+WSGI_THREADS = int(os.environ.get('ASYNC_WSGI_THREADS', 32))
+
+wsgi_executor = ThreadPoolExecutor(max_workers=WSGI_THREADS, thread_name_prefix='wsgi')
+
+# Routes answered on the loop straight from a cached snapshot
+SNAPSHOT_ROUTES = {
+    '/api/players': ('players', flask_app.cache),
+    '/api/players/last-season': ('last_season', flask_app.last_season_cache)
+}
+
+
+def build_environ(request, body):
+    """WSGI environ for an aiohttp request"""
+    raw_path = request.raw_path.split('?', 1)[0]
+    host, _, port = (request.host or 'localhost').partition(':')
+    environ = {
+        'REQUEST_METHOD': request.method,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': unquote_to_bytes(raw_path).decode('latin-1'),
+        'QUERY_STRING': request.query_string,
+        'SERVER_NAME': host,
+        'SERVER_PORT': port or ('443' if request.secure else '80'),
+        'SERVER_PROTOCOL': f'HTTP/{request.version.major}.{request.version.minor}',
+        'REMOTE_ADDR': request.remote or '',
+        'CONTENT_TYPE': request.headers.get('Content-Type', ''),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': request.scheme,
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False
+    }
+    for name in request.headers.keys():
+        key = 'HTTP_' + name.upper().replace('-', '_')
+        if key not in ('HTTP_CONTENT_TYPE', 'HTTP_CONTENT_LENGTH'):
+            environ[key] = ','.join(request.headers.getall(name))
+    return environ
+
+
+def call_wsgi(environ):
+    """
+    Run the Flask app for one request on a worker thread, returning (status, headers, body, stream).
+    Bodies with a Content-Length are read whole and stream is None; for streamed bodies, body is
+    the first chunk (None if there is none) and stream is the (result, iterator) still to be read.
+    """
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = headers
+
+    result = flask_app.app.wsgi_app(environ, start_response)
+    streamed = not any(name.lower() == 'content-length' for name, _ in response['headers'])
+    try:
+        if not streamed:
+            return response['status'], response['headers'], b''.join(result), None
+        iterator = iter(result)
+        return response['status'], response['headers'], next(iterator, None), (result, iterator)
+    except BaseException:
+        streamed = False
+        raise
+    finally:
+        # A streamed body is closed by handle_wsgi once it has been sent
+        if not streamed and hasattr(result, 'close'):
+            result.close()
+
+
+async def handle_wsgi(request):
+    """Hand a request to the Flask app without blocking the loop, streaming bodies without a length"""
+    environ = build_environ(request, await request.read())
+    loop = upstream_loop.loop
+    status, headers, body, stream = await loop.run_in_executor(wsgi_executor, call_wsgi, environ)
+    response = web.Response(status=status, body=body) if stream is None else web.StreamResponse(status=status)
+    for name, value in headers:
+        if name.lower() != 'content-length':
+            response.headers.add(name, value)
+    if stream is None:
+        return response
+
+    # Each chunk is produced on a worker thread and sent as soon as it is ready
+    result, iterator = stream
+    try:
+        await response.prepare(request)
+        chunk = body
+        while chunk is not None:
+            if chunk:
+                await response.write(chunk)
+            chunk = await loop.run_in_executor(wsgi_executor, next, iterator, None)
+        await response.write_eof()
+    finally:
+        if hasattr(result, 'close'):
+            await loop.run_in_executor(wsgi_executor, result.close)
+    return response
+
+
+async def handle_request(request):
+    """Serve snapshot hits on the loop, everything else through Flask"""
+    route = SNAPSHOT_ROUTES.get(request.path) if request.method == 'GET' else None
+    if route:
+        start_time = time.perf_counter()
+        # Only counted once answered here, Flask counts the requests it is handed
+        snapshot = flask_app.peek_snapshot(*route, record=False)
+        # Field projections, streams and formats not serialized yet (or unknown) are left to Flask
+        body = None
+        if snapshot and 'fields' not in request.query:
+            body = flask_app.peek_body(snapshot, request.query.get('format', 'rows'))
+        if body:
+            status, headers, payload = flask_app.negotiate_body(
+                body,
+                parse_etags(request.headers.get('If-None-Match')),
+                parse_accept_header(request.headers.get('Accept-Encoding'))
+            )
+            headers['Access-Control-Allow-Origin'] = '*'
+            headers.update(flask_app.freshness_headers(route[0], snapshot))
+            flask_app.record_snapshot_request(route[0], snapshot)
+            boot_timeline.mark('first_request')
+            ENDPOINT_LATENCY.observe(
+                time.perf_counter() - start_time,
+                endpoint=request.path, method=request.method, status=status
+            )
+            return web.Response(status=status, body=payload, headers=headers)
+
+    return await handle_wsgi(request)
+
+
+def create_app():
+    application = web.Application()
+    application.router.add_route('*', '/{tail:.*}', handle_request)
+    return application
+
+
+async def start_server(host, port):
+    runner = web.AppRunner(create_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+if __name__ == '__main__':
+    print("🚀 Starting async server...")
+
+    # Serve the last persisted snapshot right away (BOOT_MODE=fetch waits for a full fetch instead)
+    flask_app.boot()
+
+    # Keep caches warm in the background from here on, stale snapshots are rebuilt on the first tick
+    flask_app.refresher.start()
+
+    port = int(os.environ.get('PORT', 5000))
+    runner = upstream_loop.run(start_server('0.0.0.0', port))
+    boot_timeline.mark('ready')
+
+    phases = boot_timeline.report()['phases_ms']
+    stale = ' (stale snapshot, refreshing)' if boot_timeline.info['booted_stale'] else ''
+    print(f"✅ Startup: {phases['ready'] / 1000:.3f}s, {flask_app.BOOT_MODE} boot{stale}")
+    print(f"🌐 Async server running on port {port}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        upstream_loop.run(runner.cleanup())
+        upstream_loop.stop()
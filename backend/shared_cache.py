@@ -0,0 +1,94 @@
+"""
+Cross-process cache coordination for multi-worker deployments.
+Workers share snapshots through the snapshot store: a file lock per snapshot elects
+one refresh leader while the others wait and then load the leader's generation,
+and pre-serialized bodies are memory-mapped so every worker serves the same pages.
+"""
+
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+
+from snapshot_store import CACHE_DIR, blob_path, read_blob
+
+# File locks need fcntl (POSIX); elsewhere every worker refreshes on its own
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# How long a worker waits for another worker's refresh before fetching itself (seconds)
+LEADER_WAIT = 60
+
+# Body encodings persisted as snapshot blobs
+BODY_ENCODINGS = ('raw', 'gzip', 'br')
+
+
+class RefreshLock:
+    """Exclusive advisory lock on cache/<name>.lock, held by the worker refreshing a snapshot"""
+
+    def __init__(self, name, directory=CACHE_DIR):
+        self.path = os.path.join(directory, f'{name}.lock')
+        self.file = None
+
+    def acquire(self, timeout=0, poll=0.1):
+        """Try to take the lock, waiting up to timeout seconds; True when held"""
+        if not FCNTL_AVAILABLE:
+            return True
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.file = open(self.path, 'a')
+        deadline = time.time() + timeout
+        while True:
+            try:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.time() >= deadline:
+                    self.file.close()
+                    self.file = None
+                    return False
+                time.sleep(poll)
+
+    def release(self):
+        if self.file is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            self.file.close()
+            self.file = None
+
+
+@contextmanager
+def refresh_leadership(name, timeout=LEADER_WAIT, directory=CACHE_DIR):
+    """
+    Become the refresh leader for a snapshot, waiting while another worker holds it.
+    Yields True when leading; False means the wait timed out and the caller proceeds unlocked.
+    """
+    lock = RefreshLock(name, directory)
+    leader = lock.acquire(timeout)
+    try:
+        yield leader
+    finally:
+        lock.release()
+
+
+def body_blobs(body):
+    """Snapshot blobs for a pre-serialized body"""
+    return {encoding: body.get(encoding) for encoding in BODY_ENCODINGS}
+
+
+def shared_body(sidecar, directory=CACHE_DIR):
+    """
+    Pre-serialized body backed by a snapshot's memory-mapped blobs, None if it has none.
+    'files' lets WSGI servers stream the blobs with sendfile instead of copying them.
+    """
+    raw = read_blob(sidecar, 'raw', directory)
+    if raw is None:
+        return None
+    body = {encoding: read_blob(sidecar, encoding, directory) for encoding in BODY_ENCODINGS}
+    body['etag'] = hashlib.sha256(raw).hexdigest()[:32]
+    body['files'] = {
+        encoding: blob_path(sidecar, encoding, directory)
+        for encoding in BODY_ENCODINGS if body[encoding] is not None
+    }
+    return body
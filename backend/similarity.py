@@ -0,0 +1,120 @@
+"""
+Nearest-neighbor index for "players like X" queries.
+Each snapshot gets a SimilarityIndex built once: per-game stat vectors are z-scored
+across the league, pairwise distances are computed in NumPy blocks and every player
+keeps their closest neighbors presorted, so a query is a slice plus optional filters.
+Filters that leave too few precomputed neighbors fall back to one vectorized scan.
+"""
+
+import copy
+
+import numpy as np
+
+from scoring import per_game_rates
+
+# Season totals compared per game
+PER_GAME_FIELDS = ['minutes', 'points', 'rebounds', 'assists', 'steals', 'blocks', 'fg3m', 'ftm', 'turnovers']
+
+# Shooting percentages compared as they are
+PERCENT_FIELDS = ['fg_pct', 'ft_pct']
+
+FEATURES = PER_GAME_FIELDS + PERCENT_FIELDS
+
+# Players need this many games for their per-game stats to be compared
+MIN_GAMES = 5
+
+# Neighbors kept per player, and the most a query may ask for
+NEIGHBORS = 50
+MAX_K = 50
+
+# Rows per distance block, bounds the temporary matrix to BLOCK_ROWS x players
+BLOCK_ROWS = 256
+
+
+def feature_matrix(players):
+    """(n, len(FEATURES)) matrix of per-game stats and shooting percentages"""
+    def column(name):
+        return np.array([player.get(name) or 0 for player in players], dtype=float)
+
+    games_played = column('games_played')
+    totals = np.column_stack([column(name) for name in PER_GAME_FIELDS]).reshape(len(players), -1)
+    percents = np.column_stack([column(name) for name in PERCENT_FIELDS]).reshape(len(players), -1)
+    return np.hstack([per_game_rates(totals, games_played), percents]), games_played
+
+
+def zscores(matrix):
+    """Standardize each column, leaving constant columns at 0"""
+    std = matrix.std(axis=0)
+    return (matrix - matrix.mean(axis=0)) / np.where(std > 0, std, 1.0)
+
+
+def healthy_mask(statuses):
+    """True for players without an injury status (or listed as Healthy)"""
+    return np.array([not status or status == 'Healthy' for status in statuses], dtype=bool)
+
+
+class SimilarityIndex:
+    """Presorted nearest neighbors by z-scored per-game stats for one snapshot"""
+
+    def __init__(self, players, neighbors=NEIGHBORS):
+        matrix, games_played = feature_matrix(players)
+        self.rows = np.flatnonzero(games_played >= MIN_GAMES)
+        self.vectors = zscores(matrix[self.rows]).astype(np.float32)
+        self.slots = {player.get('player_id'): slot
+                      for slot, player in enumerate(players[row] for row in self.rows)}
+        self.healthy = healthy_mask([player.get('injury_status') for player in players])
+
+        count = len(self.rows)
+        keep = min(neighbors, max(count - 1, 0))
+        self.neighbors = np.zeros((count, keep), dtype=np.int32)
+        self.distances = np.zeros((count, keep), dtype=np.float32)
+        if not keep:
+            return
+
+        # Squared distances as |a|^2 + |b|^2 - 2ab, one block of rows at a time
+        norms = (self.vectors ** 2).sum(axis=1)
+        for start in range(0, count, BLOCK_ROWS):
+            block = slice(start, start + BLOCK_ROWS)
+            squared = norms[block, None] + norms[None, :] - 2 * self.vectors[block] @ self.vectors.T
+            squared[np.arange(len(squared)), np.arange(start, start + len(squared))] = np.inf  # not yourself
+            nearest = np.argpartition(squared, keep - 1, axis=1)[:, :keep]
+            nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+            order = np.argsort(nearest_squared, axis=1, kind='stable')
+            self.neighbors[block] = np.take_along_axis(nearest, order, axis=1)
+            self.distances[block] = np.sqrt(np.maximum(np.take_along_axis(nearest_squared, order, axis=1), 0))
+
+    def patched(self, players, fields):
+        """Copy with the injury mask rebuilt from a patched table; stats never change, so neighbors are shared"""
+        if 'injury_status' not in fields:
+            return self
+        index = copy.copy(self)
+        index.healthy = healthy_mask(players.column('injury_status'))
+        return index
+
+    def row(self, player_id):
+        """Snapshot row of an indexed player, None if they aren't indexed"""
+        slot = self.slots.get(player_id)
+        return int(self.rows[slot]) if slot is not None else None
+
+    def query(self, player_id, k=10, mask=None):
+        """
+        (rows, distances) of the k players closest to player_id, nearest first, restricted
+        to snapshot rows where mask is True. None if the player isn't indexed.
+        """
+        slot = self.slots.get(player_id)
+        if slot is None:
+            return None
+        rows = self.rows[self.neighbors[slot]]
+        distances = self.distances[slot]
+        if mask is not None:
+            keep = mask[rows]
+            rows, distances = rows[keep], distances[keep]
+        if len(rows) >= k or len(self.neighbors[slot]) == len(self.rows) - 1:
+            return rows[:k], distances[:k]
+
+        # Too few precomputed neighbors pass the filters, scan every eligible player instead
+        candidates = np.flatnonzero(mask[self.rows]) if mask is not None else np.arange(len(self.rows))
+        candidates = candidates[candidates != slot]
+        distances = np.sqrt(((self.vectors[candidates] - self.vectors[slot]) ** 2).sum(axis=1))
+        order = np.argsort(distances, kind='stable')[:k]
+        return self.rows[candidates[order]], distances[order]
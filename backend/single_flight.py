@@ -0,0 +1,70 @@
+"""
+Single-flight call coalescing.
+Concurrent callers asking for the same key share one in-flight call instead of
+each hitting the upstream APIs on a cache miss.
+"""
+
+import threading
+
+
+class _Call:
+    """An in-flight call that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time, concurrent callers wait for its result"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.coalesced = 0
+        self.coalesced_by_key = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """Call fn for key, or wait for the call already in flight for that key and share its result"""
+        with self.lock:
+            call = self.calls.get(key)
+            if call:
+                self.coalesced += 1
+                self.coalesced_by_key[key] = self.coalesced_by_key.get(key, 0) + 1
+                leader = False
+            else:
+                call = _Call()
+                self.calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """Keys that currently have a call in flight"""
+        with self.lock:
+            return list(self.calls)
+
+    def stats(self):
+        """Coalescing counters for the health/metrics endpoints"""
+        with self.lock:
+            return {
+                'coalesced': self.coalesced,
+                'coalesced_by_key': dict(self.coalesced_by_key),
+                'in_flight': list(self.calls)
+            }
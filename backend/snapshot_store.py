@@ -0,0 +1,245 @@
+"""
+Atomic, versioned on-disk snapshot store.
+Each snapshot is a table of records stored column by column: numeric columns are
+.npy arrays that can be memory-mapped, everything else goes into a JSON column file.
+A small JSON sidecar (schema version, timestamps, column list) is written last with an
+atomic rename, so readers in any process only ever see complete snapshots.
+Opaque byte blobs (e.g. pre-serialized response bodies) can be stored alongside and
+memory-mapped, so every worker process shares one copy through the page cache.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import time
+
+import numpy as np
+
+# Bump when the on-disk layout changes, older snapshots are then ignored
+SCHEMA_VERSION = 1
+
+# Default directory for persistent caching
+CACHE_DIR = 'cache'
+
+# Number of generations kept per snapshot so readers of the previous one aren't cut off
+KEEP_GENERATIONS = 2
+
+
+def _sidecar_path(directory, name):
+    return os.path.join(directory, f'{name}.json')
+
+
+def _generation_dir(directory, name, generation):
+    return os.path.join(directory, name, generation)
+
+
+def _is_int(value):
+    return isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+
+
+def _is_number(value):
+    return _is_int(value) or isinstance(value, (float, np.floating))
+
+
+def _column_kind(values):
+    """Decide how a column is stored: 'int' or 'float' arrays, or 'json' for anything else"""
+    present = [value for value in values if value is not None]
+    if not present or not all(_is_number(value) for value in present):
+        return 'json'
+    if len(present) == len(values) and all(_is_int(value) for value in present):
+        return 'int'
+    return 'float'
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file and rename it into place"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _save_array(path, array):
+    """Write a .npy file and flush it to disk"""
+    with open(path, 'wb') as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _save_blob(path, data):
+    """Write a blob and flush it to disk"""
+    with open(path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def write_snapshot(name, records, meta=None, timestamp=None, sources=None, blobs=None, directory=CACHE_DIR):
+    """
+    Persist a list of flat record dicts as a new snapshot generation.
+    meta holds any extra JSON-serializable payload fields, sources maps data source -> fetch timestamp,
+    blobs maps a blob name -> bytes stored as-is (None values are skipped).
+    """
+    timestamp = timestamp or time.time()
+    generation = f'gen-{time.time_ns()}-{os.getpid()}'
+    gen_dir = _generation_dir(directory, name, generation)
+    os.makedirs(gen_dir, exist_ok=True)
+
+    # Monotonic generation counter so readers can tell a new snapshot from a sidecar glance
+    previous = read_sidecar(name, directory)
+    sequence = (previous.get('sequence', 0) if previous else 0) + 1
+
+    # Union of keys in first-seen order so records with optional fields still round-trip
+    names = list(dict.fromkeys(key for record in records for key in record))
+    columns = []
+    json_columns = {}
+    for column in names:
+        values = [record.get(column) for record in records]
+        kind = _column_kind(values)
+        entry = {'name': column, 'kind': kind}
+
+        if kind == 'json':
+            json_columns[column] = values
+        else:
+            nulls = [row for row, value in enumerate(values) if value is None]
+            array = np.array([np.nan if value is None else value for value in values],
+                             dtype=np.int64 if kind == 'int' else np.float64)
+            entry['file'] = f'{len(columns)}.npy'
+            if nulls:
+                entry['nulls'] = nulls
+            _save_array(os.path.join(gen_dir, entry['file']), array)
+
+        # Keys missing from some records are restored as missing, not as None
+        missing = [row for row, record in enumerate(records) if column not in record]
+        if missing:
+            entry['missing'] = missing
+        columns.append(entry)
+
+    if json_columns:
+        write_json_atomic(os.path.join(gen_dir, 'columns.json'), json_columns)
+
+    blob_files = {}
+    for blob, data in (blobs or {}).items():
+        if data is not None:
+            blob_files[blob] = f'blob-{blob}.bin'
+            _save_blob(os.path.join(gen_dir, blob_files[blob]), data)
+
+    # The sidecar is the commit point: until it is renamed into place readers keep the old generation
+    write_json_atomic(_sidecar_path(directory, name), {
+        'schema_version': SCHEMA_VERSION,
+        'name': name,
+        'generation': generation,
+        'sequence': sequence,
+        'timestamp': timestamp,
+        'written_at': time.time(),
+        'sources': sources or {},
+        'meta': meta or {},
+        'row_count': len(records),
+        'columns': columns,
+        'blobs': blob_files
+    })
+
+    _prune_generations(directory, name)
+    return generation
+
+
+def _prune_generations(directory, name):
+    """Delete all but the newest KEEP_GENERATIONS generation directories"""
+    base = os.path.join(directory, name)
+    try:
+        generations = sorted(
+            (entry for entry in os.listdir(base) if entry.startswith('gen-')),
+            key=lambda entry: int(entry.split('-')[1])
+        )
+    except OSError:
+        return
+    for generation in generations[:-KEEP_GENERATIONS]:
+        shutil.rmtree(os.path.join(base, generation), ignore_errors=True)
+
+
+def read_sidecar(name, directory=CACHE_DIR):
+    """Read a snapshot's sidecar, None if missing, unreadable or from another schema version"""
+    try:
+        with open(_sidecar_path(directory, name), encoding='utf-8') as f:
+            sidecar = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if sidecar.get('schema_version') != SCHEMA_VERSION:
+        return None
+    return sidecar
+
+
+def read_columns(sidecar, directory=CACHE_DIR):
+    """Load a snapshot's columns, numeric ones memory-mapped"""
+    gen_dir = _generation_dir(directory, sidecar['name'], sidecar['generation'])
+    json_columns = {}
+    if any(entry['kind'] == 'json' for entry in sidecar['columns']):
+        with open(os.path.join(gen_dir, 'columns.json'), encoding='utf-8') as f:
+            json_columns = json.load(f)
+
+    columns = {}
+    for entry in sidecar['columns']:
+        if entry['kind'] == 'json':
+            columns[entry['name']] = json_columns[entry['name']]
+        else:
+            columns[entry['name']] = np.load(os.path.join(gen_dir, entry['file']), mmap_mode='r')
+    return columns
+
+
+def blob_path(sidecar, blob, directory=CACHE_DIR):
+    """Path of a snapshot blob, None if the snapshot has no such blob"""
+    file_name = sidecar.get('blobs', {}).get(blob)
+    if not file_name:
+        return None
+    return os.path.join(_generation_dir(directory, sidecar['name'], sidecar['generation']), file_name)
+
+
+def read_blob(sidecar, blob, directory=CACHE_DIR):
+    """
+    Memory-map a snapshot blob read-only and return a memoryview over it (None if missing).
+    The mapping stays valid even after the generation is pruned.
+    """
+    path = blob_path(sidecar, blob, directory)
+    if not path:
+        return None
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b'')
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def iter_records(sidecar, columns):
+    """Decode a snapshot's columns back into record dicts one row at a time"""
+    decoded = []
+    for entry in sidecar['columns']:
+        values = columns[entry['name']]
+        if entry['kind'] != 'json':
+            values = values.tolist()
+            for row in entry.get('nulls', ()):
+                values[row] = None
+        decoded.append((entry['name'], values, set(entry.get('missing', ()))))
+
+    for row in range(sidecar['row_count']):
+        yield {name: values[row] for name, values, missing in decoded if row not in missing}
+
+
+def read_snapshot(name, directory=CACHE_DIR):
+    """Read a whole snapshot as {'records', 'meta', 'timestamp', 'sources'}, None if unavailable"""
+    sidecar = read_sidecar(name, directory)
+    if not sidecar:
+        return None
+    try:
+        records = list(iter_records(sidecar, read_columns(sidecar, directory)))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error reading snapshot {name}: {e}")
+        return None
+    return {
+        'records': records,
+        'meta': sidecar['meta'],
+        'timestamp': sidecar['timestamp'],
+        'sources': sidecar['sources']
+    }
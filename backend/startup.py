@@ -0,0 +1,51 @@
+"""
+Startup timeline and lazy imports for heavy optional dependencies.
+nba_api (which pulls in pandas and requests) and aiohttp are only needed once an
+upstream fetch actually runs, so they are imported on first use instead of at
+module load. Boot phases and the time each lazy import took are recorded here and
+reported by the health endpoint.
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+# Taken when the server first imports this module, the zero point of every boot phase
+STARTED = time.perf_counter()
+
+
+class BootTimeline:
+    """Milliseconds from process start to each boot phase, plus lazy import costs"""
+
+    def __init__(self):
+        self.phases = {}
+        self.imports = {}
+        self.info = {}
+        self.lock = threading.Lock()
+
+    def mark(self, phase):
+        """Record when a phase was reached (only the first time)"""
+        if phase not in self.phases:
+            with self.lock:
+                self.phases.setdefault(phase, round((time.perf_counter() - STARTED) * 1000, 1))
+
+    def report(self):
+        """Boot phases and lazy import timings for the health endpoint"""
+        with self.lock:
+            return dict(self.info, phases_ms=dict(self.phases), lazy_imports_ms=dict(self.imports))
+
+
+boot_timeline = BootTimeline()
+
+
+def lazy_import(name):
+    """Import a module on first use, recording how long the first import took"""
+    # import_module (rather than a bare sys.modules lookup) waits for an import in progress on another thread
+    first = name not in sys.modules
+    start_time = time.perf_counter()
+    module = importlib.import_module(name)
+    if first:
+        with boot_timeline.lock:
+            boot_timeline.imports.setdefault(name, round((time.perf_counter() - start_time) * 1000, 1))
+    return module
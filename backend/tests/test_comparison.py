@@ -0,0 +1,78 @@
+import pytest
+
+from comparison import STAT_FIELDS, ComparisonCache, SeasonComparison
+from player_index import PlayerIndex
+from player_table import PlayerTable
+
+
+def make_snapshot(players, etag):
+    records = [
+        dict(player, games_played=player.get('games_played', 10), fantasy_value=10.0 - player['overall_rank'])
+        for player in players
+    ]
+    return {'data': {'players': PlayerTable(records)}, 'index': PlayerIndex(records), 'body': {'etag': etag}}
+
+
+@pytest.fixture
+def seasons():
+    # player_id: (rank last season, rank this season, season points)
+    moves = {1: (1, 1, 100), 2: (2, 3, 150), 3: (3, 2, 250), 4: (4, 4, 50)}
+    last = make_snapshot([{'player_id': pid, 'overall_rank': old, 'points': 100} for pid, (old, _, _) in moves.items()], 'a')
+    # Player 5 only played last season, player 6 only this season
+    last['data']['players'] = PlayerTable(last['data']['players'].records() + [
+        {'player_id': 5, 'overall_rank': 5, 'games_played': 10, 'fantasy_value': 5.0, 'points': 10}])
+    last['index'] = PlayerIndex(last['data']['players'].records())
+    current = make_snapshot(
+        [{'player_id': pid, 'overall_rank': new, 'points': points} for pid, (_, new, points) in moves.items()]
+        + [{'player_id': 6, 'overall_rank': 5, 'points': 10}], 'b')
+    return last, current
+
+
+def player_ids(snapshot, rows):
+    return [snapshot['data']['players'].column('player_id')[row] for row in rows]
+
+
+def test_joins_players_by_id(seasons):
+    last, current = seasons
+    comparison = SeasonComparison(last, current)
+    assert len(comparison) == 4
+    assert (comparison.only_from, comparison.only_to) == (1, 1)
+    by_id = dict(zip(player_ids(current, comparison.to_rows), comparison.rank_change))
+    assert by_id == {1: 0, 2: -1, 3: 1, 4: 0}
+
+
+def test_movers_only_list_players_who_moved_that_way(seasons):
+    last, current = seasons
+    comparison = SeasonComparison(last, current)
+    assert player_ids(current, comparison.to_rows[comparison.risers]) == [3]
+    assert player_ids(current, comparison.to_rows[comparison.fallers]) == [2]
+
+
+def test_query_sorts_filters_and_paginates(seasons):
+    last, current = seasons
+    comparison = SeasonComparison(last, current)
+    points = STAT_FIELDS.index('points')
+
+    total, positions = comparison.query('points', 'desc')
+    assert total == 4
+    changes = comparison.stat_change[positions, points]
+    assert list(changes) == sorted(changes, reverse=True)
+    assert changes[0] == pytest.approx(15.0)  # (250 - 100) / 10 games
+
+    assert comparison.query('rank', 'desc', offset=1, limit=2)[1].tolist() == \
+        comparison.orders['rank', 'desc'][1:3].tolist()
+    assert comparison.query(min_games=11)[0] == 0
+    with pytest.raises(ValueError):
+        comparison.query('height')
+    with pytest.raises(ValueError):
+        comparison.query(direction='up')
+
+
+def test_cache_reuses_comparisons_per_etag_pair(seasons):
+    last, current = seasons
+    cache = ComparisonCache(max_entries=1)
+    first = cache.compare(last, current)
+    assert cache.compare(last, current) is first
+    cache.compare(current, last)
+    assert cache.compare(last, current) is not first
+    assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 3}
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from draft import (
+    DEFAULT_SLOTS, DraftSimulator, availability_curves, parse_slots, replacement_levels, simulate_drafts,
+    snake_order, value_over_replacement
+)
+from player_table import PlayerTable
+
+# G, F, C eligibility
+GUARD, FORWARD, CENTER, WING = [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 0]
+
+
+def test_snake_order_reverses_every_other_round():
+    assert snake_order(3, 3).tolist() == [0, 1, 2, 2, 1, 0, 0, 1, 2]
+
+
+def test_parse_slots():
+    assert parse_slots('c:2, bench:0') == dict(DEFAULT_SLOTS, C=2, BENCH=0)
+    for text in ('X:1', 'G:two', 'G:-1', 'G:0,F:0,C:0,UTIL:0,BENCH:0', 'BENCH:20'):
+        with pytest.raises(ValueError):
+            parse_slots(text)
+
+
+def test_replacement_levels_fill_positions_then_util():
+    values = np.array([10.0, 9.0, 8.0, 7.0, 6.0, 5.0, 4.0])
+    eligibility = np.array([GUARD, GUARD, CENTER, GUARD, CENTER, CENTER, FORWARD], dtype=bool)
+    slots = {'G': 1, 'F': 0, 'C': 1, 'UTIL': 1, 'BENCH': 0}
+    # Two teams: guards 10 and 9, centers 8 and 6, UTIL 7 and 5
+    levels = replacement_levels(values, eligibility, 2, slots)
+    assert levels == {'G': 0.0, 'F': 4.0, 'C': 0.0, 'UTIL': 4.0}
+
+
+def test_vorp_uses_the_lowest_replacement_level_a_player_can_fill():
+    levels = {'G': 5.0, 'F': 3.0, 'C': 8.0, 'UTIL': 2.0}
+    eligibility = np.array([GUARD, WING, CENTER, [0, 0, 0]], dtype=bool)
+    vorp = value_over_replacement(np.array([10.0, 10.0, 10.0, 10.0]), eligibility, levels)
+    assert vorp.tolist() == [5.0, 7.0, 2.0, 8.0]
+
+
+def test_simulated_drafts_fill_every_roster_legally():
+    rng = np.random.default_rng(1)
+    n, teams = 40, 4
+    eligibility = np.array([[GUARD, FORWARD, CENTER, WING][i % 4] for i in range(n)], dtype=bool)
+    vorp = rng.uniform(0, 10, n)
+    slots = {'G': 2, 'F': 1, 'C': 1, 'UTIL': 1, 'BENCH': 0}
+    pick_taken, picks = simulate_drafts(vorp, eligibility, teams, slots, 50, seed=7)
+    assert picks == teams * 5
+    order = snake_order(teams, 5)
+    for sim in pick_taken:
+        drafted = np.flatnonzero(sim < picks)
+        assert sorted(sim[drafted].tolist()) == list(range(picks))
+        for team in range(teams):
+            roster = [player for player in drafted if order[sim[player]] == team]
+            # Every roster has its center, however the guard and flex slots were filled
+            assert eligibility[roster, 2].sum() >= 1
+            assert eligibility[roster, 0].sum() + eligibility[roster, 1].sum() >= 3
+
+    again, _ = simulate_drafts(vorp, eligibility, teams, slots, 50, seed=7)
+    assert np.array_equal(pick_taken, again)
+
+
+def test_availability_curves_start_at_one_and_never_rise():
+    pick_taken = np.array([[0, 2, 3], [1, 3, 0]])
+    curves = availability_curves(pick_taken, picks=3)
+    assert curves.tolist() == [[1.0, 0.5, 0.0], [1.0, 1.0, 1.0], [1.0, 0.5, 0.5]]
+
+
+def test_simulator_caches_per_snapshot_and_settings():
+    players = [{'position': ['PG', 'SF', 'C'][i % 3]} for i in range(30)]
+    snapshot = {'body': {'etag': 'a'}, 'data': {'players': PlayerTable(players)}}
+    values = np.linspace(30, 1, 30)
+    slots = {'G': 1, 'F': 1, 'C': 1, 'UTIL': 0, 'BENCH': 1}
+    simulator = DraftSimulator()
+    result = simulator.analyze(snapshot, values, 4, slots, 100)
+    assert simulator.analyze(snapshot, values, 4, slots, 100) is result
+    assert simulator.stats() == {'entries': 1, 'runs': 1}
+    assert result['adp'][0] <= 3 and result['adp'][0] < result['adp'][9]
+    assert np.all(result['draft_rate'] <= 1) and result['draft_rate'].sum() == pytest.approx(16)
+    assert 'availability' not in simulator.analyze(snapshot, values, 4, slots, 0)
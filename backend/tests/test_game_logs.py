@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from game_logs import RECORD_DTYPE, STAT_FIELDS, GameLogStore, PlayerLog, day_date, day_number, fantasy_per_game
+
+
+def stats(points, **fields):
+    row = np.zeros(len(STAT_FIELDS))
+    row[STAT_FIELDS.index('pts')] = points
+    for name, value in fields.items():
+        row[STAT_FIELDS.index(name)] = value
+    return row
+
+
+def records(rows):
+    """rows of (player_id, game_id, 'YYYY-MM-DD', points)"""
+    result = np.zeros(len(rows), dtype=RECORD_DTYPE)
+    for i, (player_id, game_id, game_date, points) in enumerate(rows):
+        result[i] = (player_id, game_id, day_number(game_date), stats(points))
+    return result
+
+
+def points(per_game):
+    return per_game[STAT_FIELDS.index('pts')]
+
+
+def test_day_numbers_round_trip():
+    assert day_number('1970-01-02T00:00:00') == 1
+    assert day_date(day_number('2025-03-01')).isoformat() == '2025-03-01'
+
+
+def test_windows_match_naive_means_past_the_initial_capacity():
+    log = PlayerLog(capacity=2)
+    games = list(range(1, 40))
+    for day, value in enumerate(games):
+        log.append(day, day, stats(value))
+    for size in (1, 5, 10, 30, 100):
+        count, per_game = log.window(size)
+        assert count == min(size, len(games))
+        assert points(per_game) == pytest.approx(np.mean(games[-size:]))
+    assert log.window()[0] == len(games)
+    assert PlayerLog().window(5) == (0, pytest.approx(np.zeros(len(STAT_FIELDS))))
+
+
+def test_late_correction_rebuilds_sums_in_date_order():
+    log = PlayerLog()
+    for day, value in ((1, 10), (3, 30), (4, 40)):
+        log.append(day, day, stats(value))
+    log.append(2, 2, stats(20))
+    assert [day for day, _, _ in log.games()] == [1, 2, 3, 4]
+    assert [points(game) for _, _, game in log.games()] == pytest.approx([10, 20, 30, 40])
+    assert points(log.window(2)[1]) == pytest.approx(35)
+    log.append(5, 5, stats(50))
+    assert points(log.window(3)[1]) == pytest.approx(40)
+
+
+def test_fantasy_per_game_uses_default_weights():
+    # 2 threes among 5 makes, 4 FTM, 6 REB, 3 AST, 1 STL, 1 BLK, 2 TOV
+    row = stats(20, fgm=5, fg3m=2, ftm=4, reb=6, ast=3, stl=1, blk=1, tov=2)
+    assert fantasy_per_game(row) == pytest.approx(28.7)
+    assert fantasy_per_game(stats(0, tov=5)) == 0
+
+
+def test_store_appends_new_games_only_and_reloads(tmp_path):
+    store = GameLogStore('2025-26', directory=str(tmp_path))
+    players = {7: {'name': 'A', 'team': 'BOS'}, 8: {'name': 'B', 'team': 'LAL'}}
+    assert store.append(records([(7, 1, '2025-11-01', 10), (8, 1, '2025-11-01', 20)]), players) == 2
+    assert store.append(records([(7, 1, '2025-11-01', 10), (7, 2, '2025-11-03', 30)]), players) == 1
+    assert store.date_from().isoformat() == '2025-11-03'
+
+    # A crashed run's uncommitted tail is ignored on load and overwritten by the next append
+    with open(store.data_path, 'ab') as f:
+        f.write(records([(9, 3, '2025-11-04', 99)]).tobytes())
+    reloaded = GameLogStore('2025-26', directory=str(tmp_path))
+    assert reloaded.stats() == {'season': '2025-26', 'players': 2, 'games': 3, 'last_date': '2025-11-03'}
+    assert reloaded.append(records([(8, 4, '2025-11-05', 40)]), players) == 1
+    assert (tmp_path / '2025-26.bin').stat().st_size == 4 * RECORD_DTYPE.itemsize
+
+    player = reloaded.player(7)
+    assert [game['pts'] for game in player['games']] == [30, 10]
+    assert player['rolling']['5']['per_game']['pts'] == 20
+    rolling = {row['player_id']: row for row in reloaded.rolling(1)}
+    assert rolling[8]['per_game']['pts'] == 40 and rolling[8]['name'] == 'B'
+    assert reloaded.player(9) is None
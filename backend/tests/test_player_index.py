@@ -0,0 +1,122 @@
+import random
+
+import pytest
+
+from player_index import PlayerIndex, fold_text, sort_value
+from player_table import PlayerTable
+
+TEAMS = ['BOS', 'LAL', 'NYK']
+POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C', 'G-F', None]
+STATUSES = ['Healthy', 'Out', 'Day-To-Day', None]
+
+
+@pytest.fixture(scope='module')
+def players():
+    rng = random.Random(7)
+    players = []
+    for i in range(60):
+        games = rng.randint(0, 40)
+        players.append({
+            'name': f'Player {i:02d}',
+            'espn_id': str(1000 + i),
+            'team': rng.choice(TEAMS),
+            'position': rng.choice(POSITIONS),
+            'injury_status': rng.choice(STATUSES),
+            'games_played': games,
+            'points': rng.randint(0, 20) * games,
+            'turnovers': rng.randint(0, 4) * games,
+            'fantasy_value': round(rng.uniform(0, 50), 1)
+        })
+    players[0]['name'] = 'Nikola Jokić'
+    return players
+
+
+def brute_force(players, keep, key, reverse):
+    rows = [row for row, player in enumerate(players) if keep(player)]
+    # Stable sorts, ties keep snapshot order either way
+    return sorted(rows, key=lambda row: sort_value(players[row], key), reverse=reverse)
+
+
+def names(page):
+    return [player['name'] for player in page]
+
+
+def test_unfiltered_pages_slice_the_fantasy_order(players):
+    index = PlayerIndex(players)
+    total, page = index.query(offset=5, limit=10)
+    expected = sorted(players, key=lambda player: -player['fantasy_value'])[5:15]
+    assert total == len(players)
+    assert names(page) == names(expected)
+
+
+@pytest.mark.parametrize('team,position,injury', [
+    ('LAL', None, None), ('bos', 'G', None), (None, 'C', 'injured'), ('NYK', 'F', 'healthy'), (None, None, 'out')
+])
+def test_filters_match_brute_force(players, team, position, injury):
+    index = PlayerIndex(players)
+
+    def injury_matches(status):
+        healthy = status in (None, 'Healthy')
+        if injury == 'healthy':
+            return healthy
+        if injury == 'injured':
+            return not healthy
+        return not healthy and status.lower() == injury
+
+    def keep(player):
+        return ((not team or player['team'] == team.upper())
+                and (not position or position in (player['position'] or ''))
+                and (not injury or injury_matches(player['injury_status'])))
+
+    total, page = index.query(team=team, position=position, injury=injury, limit=100)
+    expected = brute_force(players, keep, 'fantasy', reverse=True)
+    assert total == len(expected)
+    assert names(page) == [players[row]['name'] for row in expected]
+
+
+def test_stat_sorts_apply_min_games_and_direction(players):
+    index = PlayerIndex(players)
+    total, page = index.query(sort='ppg', limit=100)
+    qualified = [player for player in players if player['games_played'] >= 10]
+    assert total == len(qualified)
+    ppg = [player['points'] / player['games_played'] for player in page]
+    assert ppg == sorted(ppg, reverse=True)
+
+    # Fewer turnovers is better, so the best-first order is ascending
+    _, page = index.query(sort='tpg', min_games=1, limit=100)
+    tpg = [player['turnovers'] / player['games_played'] for player in page]
+    assert tpg == sorted(tpg)
+    _, reverse_page = index.query(sort='tpg', direction='asc', min_games=1, limit=100)
+    assert [player['turnovers'] / player['games_played'] for player in reverse_page] == sorted(tpg, reverse=True)
+
+
+def test_name_prefix_ignores_case_and_accents(players):
+    index = PlayerIndex(players)
+    assert names(index.query(name_prefix='joki')[1]) == ['Nikola Jokić']
+    assert names(index.query(name_prefix='NIKOLA J')[1]) == ['Nikola Jokić']
+    assert fold_text('Dončić') == 'doncic'
+    assert index.query(name_prefix='zzz') == (0, [])
+
+
+def test_rejects_unknown_sort_and_direction(players):
+    index = PlayerIndex(players)
+    with pytest.raises(ValueError):
+        index.query(sort='height')
+    with pytest.raises(ValueError):
+        index.query(direction='sideways')
+
+
+def test_patched_index_rebuilds_injury_buckets(players):
+    table = PlayerTable(players)
+    index = PlayerIndex(table, players)
+    row = index.row_for('1003')
+    patched_table = table.patched({row: {'injury_status': 'Out'}})
+    patched = index.patched(patched_table, {'injury_status'})
+
+    rows = [dict(player) for player in players]
+    rows[row]['injury_status'] = 'Out'
+    rebuilt = PlayerIndex(PlayerTable(rows), rows)
+    for bucket, bucket_rows in rebuilt.injuries.items():
+        assert patched.injuries[bucket].tolist() == bucket_rows.tolist()
+    assert patched.positions is index.positions
+    assert patched.query(injury='out', limit=100)[1] == rebuilt.query(injury='out', limit=100)[1]
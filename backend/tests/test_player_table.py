@@ -0,0 +1,68 @@
+import pytest
+
+from player_table import Column, PlayerTable, columnar_payload, parse_fields, rows_payload
+
+RECORDS = [
+    {'name': 'Ana', 'team': 'BOS', 'games_played': 40, 'points': 812.0, 'age': '24',
+     'position_ranks': {'G': 3}, 'injury_status': 'Healthy', 'player_id': 2**40},
+    {'name': 'Bo', 'team': 'BOS', 'games_played': 0, 'points': None, 'age': None,
+     'position_ranks': {}, 'injury_status': None, 'player_id': None, 'college': 'Duke'},
+    {'name': 'Cy', 'team': None, 'games_played': 12, 'points': 30.5, 'age': '31',
+     'position_ranks': {'F': 1, 'C': 2}, 'injury_status': 'Out', 'player_id': 5},
+]
+
+
+def test_round_trips_records_with_nulls_and_missing_keys():
+    table = PlayerTable(RECORDS)
+    assert table.records() == RECORDS
+    assert list(table) == RECORDS
+    assert [table[row] for row in range(3)] == RECORDS
+    assert table[-1] == RECORDS[-1]
+    # Bo is the only one with a college, the others lack the key rather than holding None
+    assert 'college' not in table[0] and table[1]['college'] == 'Duke'
+    with pytest.raises(IndexError):
+        table.row(3)
+
+
+def test_columns_are_typed_and_compact():
+    table = PlayerTable(RECORDS)
+    kinds = {name: column.kind for name, column in table.columns.items()}
+    assert kinds['team'] == 'str' and kinds['games_played'] == 'int' and kinds['points'] == 'float'
+    assert kinds['position_ranks'] == 'dict' and kinds['player_id'] == 'int'
+    assert table.columns['team'].vocabulary == ['BOS']
+    assert table.column('team') == ['BOS', 'BOS', None]
+    assert table.column('height') == [None, None, None]
+    assert Column([2**70, 1]).kind == 'object'
+    assert table.nbytes() > 0
+
+
+def test_projections_and_columnar_format():
+    table = PlayerTable(RECORDS)
+    assert table.row(1, ('name', 'college', 'height')) == {'name': 'Bo', 'college': 'Duke'}
+    assert table.records(('name', 'college')) == [{'name': 'Ana'}, {'name': 'Bo', 'college': 'Duke'}, {'name': 'Cy'}]
+    columns = table.to_columns(('name', 'position_ranks'))
+    assert columns['name'] == ['Ana', 'Bo', 'Cy']
+    assert columns['position_ranks'] == {'G': [3, None, None], 'F': [None, None, 1], 'C': [None, None, 2]}
+
+    data = {'players': table, 'stats_season': '2025-26'}
+    assert rows_payload(data, ('name',))['players'] == [{'name': 'Ana'}, {'name': 'Bo'}, {'name': 'Cy'}]
+    assert columnar_payload(data)['format'] == 'columnar'
+    assert parse_fields(' name, team,name', table.names) == ('name', 'team')
+    assert parse_fields('', table.names) is None
+    with pytest.raises(ValueError):
+        parse_fields('name,height', table.names)
+
+
+def test_patched_matches_a_rebuild_and_shares_untouched_columns():
+    table = PlayerTable(RECORDS)
+    updates = {1: {'injury_status': 'Day-To-Day', 'college': 'UNC'}, 2: {'jersey': '7'}}
+    patched = table.patched(updates)
+
+    expected = [dict(record) for record in RECORDS]
+    for row, fields in updates.items():
+        expected[row].update(fields)
+    assert patched.records() == expected
+    assert patched.columns['points'] is table.columns['points']
+    assert patched.columns['injury_status'] is not table.columns['injury_status']
+    # The original table is unchanged
+    assert table.records() == RECORDS
@@ -0,0 +1,100 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import projections
+from projections import ProjectionEngine, expected_games_missed, simulate_players, smooth_age_multipliers
+
+PLAYERS = [
+    {'games_played': 40, 'points': 800, 'rebounds': 200, 'assists': 150, 'age': '24'},
+    {'games_played': 10, 'points': 150, 'rebounds': 60, 'assists': 20, 'age': '31',
+     'injury_status': 'Out', 'injury_timeline': 'long-term'},
+    {'games_played': 35, 'points': 500, 'rebounds': 300, 'assists': 40},
+]
+
+
+def test_expected_games_missed():
+    assert expected_games_missed('Healthy', '') == 0
+    assert expected_games_missed('Out', 'long-term') == projections.SEASON_GAMES
+    assert expected_games_missed('Out', '2 months') == pytest.approx(60 * 82 / 174)
+    assert expected_games_missed('Questionable', None) == 0.5
+
+
+def test_smooth_age_multipliers_are_neutral_for_missing_ages():
+    multipliers = smooth_age_multipliers([np.nan, 17, 23.5])
+    assert multipliers[0] == multipliers[1] == 1.0
+    assert multipliers[2] > 1.0
+
+
+def test_projection_bands_are_ordered_and_seeded():
+    engine = ProjectionEngine(simulations=2000, workers=0)
+    first = engine.project(PLAYERS, 'etag')
+    again = engine.project(PLAYERS, 'etag')
+    for name, bands in first['bands'].items():
+        assert bands.shape == (3, len(PLAYERS))
+        assert np.all(bands[0] <= bands[1]) and np.all(bands[1] <= bands[2])
+        assert np.array_equal(bands, again['bands'][name])
+    # Out for the season
+    assert first['bands']['games'][:, 1].tolist() == [0, 0, 0]
+
+
+class FakePool:
+    created = 0
+
+    def __init__(self, workers):
+        type(self).created += 1
+        time.sleep(0.05)
+
+    def map(self, jobs):
+        return [simulate_players(*job) for job in jobs]
+
+    def shutdown(self):
+        pass
+
+
+def test_concurrent_first_runs_start_one_pool(monkeypatch):
+    monkeypatch.setattr(projections, 'WorkerPool', FakePool)
+    FakePool.created = 0
+    engine = ProjectionEngine(simulations=100, workers=2)
+    barrier = threading.Barrier(4)
+
+    def project(seed_text):
+        barrier.wait()
+        return engine.project(PLAYERS, seed_text)
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(project, ['a', 'b', 'c', 'd']))
+    assert FakePool.created == 1
+
+
+def test_falls_back_in_process_with_the_same_results(monkeypatch):
+    class BrokenPool(FakePool):
+        def map(self, jobs):
+            raise RuntimeError('An attempt has been made to start a new process before bootstrapping')
+
+    monkeypatch.setattr(projections, 'WorkerPool', FakePool)
+    expected = ProjectionEngine(simulations=500, workers=2).project(PLAYERS, 'etag')
+    monkeypatch.setattr(projections, 'WorkerPool', BrokenPool)
+    engine = ProjectionEngine(simulations=500, workers=2)
+    result = engine.project(PLAYERS, 'etag')
+    assert engine.workers == 0 and engine.pool is None
+    for name, bands in expected['bands'].items():
+        assert np.array_equal(bands, result['bands'][name])
+
+
+def test_worker_process_pool_matches_in_process():
+    engine = ProjectionEngine(simulations=500, workers=2)
+    try:
+        pooled = engine.project(PLAYERS, 'etag')
+        assert engine.workers == 2 and engine.pool is not None
+    finally:
+        if engine.pool:
+            engine.pool.shutdown()
+    jobs_engine = ProjectionEngine(simulations=500, workers=2)
+    jobs_engine.get_pool = lambda: None
+    in_process = jobs_engine.project(PLAYERS, 'etag')
+    for name, bands in pooled['bands'].items():
+        assert np.array_equal(bands, in_process['bands'][name])
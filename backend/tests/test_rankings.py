@@ -0,0 +1,86 @@
+import random
+
+import numpy as np
+import pytest
+
+from player_table import PlayerTable
+from rankings import RankingCache, RankingMatrix, parse_flag, parse_weights, weights_key
+from scoring import DEFAULT_WEIGHTS, fantasy_values, parse_ages, player_per_game_matrix
+
+STATS = ['fg3m', 'fgm', 'ftm', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers']
+
+
+@pytest.fixture(scope='module')
+def players():
+    rng = random.Random(3)
+    players = []
+    for _ in range(40):
+        games = rng.choice([0, 5, 30, 70, 78])
+        player = {name: rng.randint(0, 8) * games for name in STATS}
+        player['fgm'] += player['fg3m']
+        player.update(games_played=games, age=rng.choice(['19', '24', '30', '36', None]),
+                      position=rng.choice(['PG', 'C', 'SF-PF']))
+        players.append(player)
+    return players
+
+
+def test_default_weights_reproduce_fantasy_values(players):
+    values, order = RankingMatrix(players).rank(weights_key(DEFAULT_WEIGHTS))
+    expected = fantasy_values(
+        player_per_game_matrix(players), [player['games_played'] for player in players],
+        parse_ages([player['age'] for player in players])
+    )
+    assert np.array_equal(values, expected)
+    assert order.tolist() == np.argsort(-expected, kind='stable').tolist()
+
+
+def test_custom_weights_and_age_adjustment(players):
+    matrix = RankingMatrix(players)
+    blocks_only = dict(dict.fromkeys(DEFAULT_WEIGHTS, 0.0), blocks=1.0)
+    values, order = matrix.rank(weights_key(blocks_only), age_adjust=False)
+    per_game_blocks = [p['blocks'] / p['games_played'] if p['games_played'] else 0 for p in players]
+    assert values == pytest.approx(np.array(per_game_blocks) * matrix.games_multipliers)
+    assert values[order[0]] == max(values)
+
+
+def test_parse_weights():
+    weights = parse_weights('3pm:4, TOV:-2,reb:1')
+    assert (weights['fg3m'], weights['turnovers'], weights['rebounds']) == (4.0, -2.0, 1.0)
+    assert weights['assists'] == DEFAULT_WEIGHTS['assists']
+    assert parse_weights('') == DEFAULT_WEIGHTS
+    for text in ('height:2', 'reb:x', 'reb:1000', 'reb:nan'):
+        with pytest.raises(ValueError):
+            parse_weights(text)
+    assert parse_flag('OFF') is False and parse_flag(None) is True
+    with pytest.raises(ValueError):
+        parse_flag('maybe')
+
+
+def test_weights_key_normalizes_rounding_and_negative_zero():
+    assert weights_key({'fg3m': 1.20000001}) == weights_key({'fg3m': 1.2})
+    assert weights_key({'turnovers': -0.0}) == weights_key({})
+
+
+def test_cache_hits_then_recomputes_for_a_new_snapshot(players):
+    cache = RankingCache(max_entries=1)
+    snapshot = {'ranking': RankingMatrix(players)}
+    first = cache.rank(snapshot, '2025-26', DEFAULT_WEIGHTS)
+    assert cache.rank(snapshot, '2025-26', dict(DEFAULT_WEIGHTS)) is first
+    refreshed = {'ranking': RankingMatrix(players)}
+    assert cache.rank(refreshed, '2025-26', DEFAULT_WEIGHTS) is not first
+    cache.rank(refreshed, '2024-25', DEFAULT_WEIGHTS)
+    assert cache.stats() == {'entries': 1, 'max_entries': 1, 'hits': 1, 'misses': 3, 'evictions': 1}
+
+
+def test_patched_matrix_only_changes_for_age_or_position(players):
+    table = PlayerTable(players)
+    matrix = RankingMatrix(players)
+    assert matrix.patched(table.patched({0: {'injury_status': 'Out'}}), {'injury_status'}) is matrix
+
+    patched_table = table.patched({0: {'age': '36', 'position': 'C'}})
+    patched = matrix.patched(patched_table, {'age', 'position'})
+    rebuilt = RankingMatrix(patched_table.records())
+    assert np.array_equal(patched.age_multipliers, rebuilt.age_multipliers)
+    for bucket, mask in rebuilt.position_masks.items():
+        assert np.array_equal(patched.position_masks[bucket], mask)
+    assert patched.per_game is matrix.per_game
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring import (
+    CATEGORIES, DEFAULT_WEIGHTS, age_multipliers, apply_scores, fantasy_values, games_played_multipliers,
+    parse_ages, player_per_game_matrix, rank_values, weight_vector
+)
+
+
+def stats_frame(rows):
+    columns = ['GP', 'FG3M', 'FGM', 'FTM', 'REB', 'AST', 'STL', 'BLK', 'TOV']
+    return pd.DataFrame(rows, columns=columns)
+
+
+def test_weight_vector_follows_categories():
+    assert weight_vector().tolist() == [DEFAULT_WEIGHTS[category] for category in CATEGORIES]
+    assert weight_vector({'steals': 4.0}).tolist() == [4.0 if c == 'steals' else 0.0 for c in CATEGORIES]
+
+
+def test_multipliers():
+    assert age_multipliers([19, 20, 27, 29, 36, np.nan, 60]).tolist() == [0.99, 0.99, 1.05, 1.05, 0.97, 1.0, 1.0]
+    assert games_played_multipliers([10, 69, 70, 72, 82]).tolist() == pytest.approx([1.0, 1.0, 1.0, 72 / 70, 1.07])
+    assert np.isnan(parse_ages(['25', None, 'n/a'])[1:]).all()
+
+
+def test_rank_values_breaks_ties_in_input_order_and_masks():
+    assert rank_values([5, 9, 5, 1]).tolist() == [2, 1, 3, 4]
+    assert rank_values([5, 9, 5, 1], np.array([True, False, True, True])).tolist() == [1, 0, 2, 3]
+
+
+def test_apply_scores_by_hand():
+    # 10 games of 2 threes, 3 twos, 4 FTM, 6 REB, 3 AST, 1 STL, 1 BLK, 2 TOV per game
+    frame = stats_frame([
+        [10, 20, 50, 40, 60, 30, 10, 10, 20],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [75, 75, 150, 75, 300, 75, 75, 0, 0]
+    ])
+    players = apply_scores(
+        [{'age': '27', 'position': 'PG'}, {'age': '22', 'position': 'C'}, {'position': 'F-C'}],
+        frame
+    )
+    per_game = 2 * 3 + 3 * 2 + 4 + 6 * 1.2 + 3 * 1.5 + 2 + 2 - 2 * 1.5
+    assert players[0]['fantasy_value'] == pytest.approx(per_game * 1.05)
+    assert players[1]['fantasy_value'] == 0
+    assert players[2]['fantasy_value'] == pytest.approx((3 + 2 + 1 + 4.8 + 1.5 + 2) * 1.07, abs=1e-3)
+    assert [player['overall_rank'] for player in players] == [1, 3, 2]
+    assert players[0]['position_ranks'] == {'G': 1}
+    assert players[2]['position_ranks'] == {'F': 1, 'C': 1}
+
+
+def test_player_matrix_matches_frame_scoring():
+    players = [
+        {'games_played': 10, 'fg3m': 20, 'fgm': 50, 'ftm': 40, 'rebounds': 60, 'assists': 30,
+         'steals': 10, 'blocks': 10, 'turnovers': 20, 'age': '27'},
+        {'games_played': 0}
+    ]
+    values = fantasy_values(player_per_game_matrix(players), [10, 0], parse_ages(['27', None]))
+    assert values.tolist() == pytest.approx([30.135, 0.0])
+    assert fantasy_values(player_per_game_matrix(players), [10, 0], [27, np.nan], age_adjust=False)[0] == \
+        pytest.approx(28.7)
@@ -0,0 +1,67 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from player_table import PlayerTable
+from season_store import SeasonStore, season_start_year, season_string, snapshot_size
+
+
+def make_snapshot(raw=b'[]'):
+    return {
+        'data': {'players': PlayerTable([{'name': 'A', 'fantasy_value': 1.0}])},
+        'body': {'raw': raw, 'gzip': raw, 'br': None}
+    }
+
+
+def test_season_strings():
+    assert season_start_year('2019-20') == 2019
+    assert season_start_year('2019-21') is None
+    assert season_start_year('19-20') is None
+    assert season_string(1999) == '1999-00'
+
+
+def test_concurrent_first_gets_share_one_load():
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch(entry, season):
+        calls.append(season)
+        started.set()
+        release.wait(5)
+        entry['snapshot'] = make_snapshot()
+        return True
+
+    store = SeasonStore(fetch)
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(store.get, '2019-20') for _ in range(4)]
+        started.wait(5)
+        while store.flight.stats()['coalesced'] < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        snapshots = [future.result() for future in futures]
+
+    assert calls == ['2019-20']
+    assert snapshots[0] is not None
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert store.get('2019-20') is snapshots[0]
+
+
+def test_failed_fetch_returns_none_and_isnt_cached():
+    store = SeasonStore(lambda entry, season: False)
+    assert store.get('2019-20') is None
+    assert store.stats()['seasons_in_memory'] == []
+
+
+def test_evicts_least_recently_used_over_budget():
+    def fetch(entry, season):
+        entry['snapshot'] = make_snapshot(b'x' * 1000)
+        return True
+
+    # Room for two seasons
+    store = SeasonStore(fetch, memory_budget=2 * snapshot_size(make_snapshot(b'x' * 1000)))
+    store.get('2017-18')
+    store.get('2018-19')
+    store.get('2017-18')
+    store.get('2019-20')
+    assert store.stats()['seasons_in_memory'] == ['2017-18', '2019-20']
+    assert store.evictions == 1
@@ -0,0 +1,43 @@
+import gzip
+import json
+
+from serialization import BodyCache, iter_ndjson, serialize_payload
+
+
+def test_serialize_payload_encodings_match_raw():
+    body = serialize_payload({'players': [{'name': 'A', 'points': 1.5}]})
+    assert json.loads(body['raw']) == {'players': [{'name': 'A', 'points': 1.5}]}
+    assert gzip.decompress(body['gzip']) == body['raw']
+    assert body['etag'] == serialize_payload({'players': [{'name': 'A', 'points': 1.5}]})['etag']
+    assert body['etag'] != serialize_payload({'players': []})['etag']
+
+
+def test_iter_ndjson_chunks_rows():
+    chunks = list(iter_ndjson([{'rank': i} for i in range(7)], first_chunk=2, chunk=3))
+    assert [chunk.count(b'\n') for chunk in chunks] == [2, 3, 2]
+    lines = b''.join(chunks).splitlines()
+    assert [json.loads(line) for line in lines] == [{'rank': i} for i in range(7)]
+
+
+def test_iter_ndjson_reads_rows_lazily():
+    produced = []
+
+    def rows():
+        for i in range(100):
+            produced.append(i)
+            yield {'rank': i}
+
+    stream = iter_ndjson(rows(), first_chunk=5, chunk=10)
+    next(stream)
+    assert len(produced) == 5
+    assert list(iter_ndjson([])) == []
+
+
+def test_body_cache_evicts_least_recently_used():
+    cache = BodyCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
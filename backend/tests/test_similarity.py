@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import similarity
+from player_table import PlayerTable
+from similarity import PER_GAME_FIELDS, SimilarityIndex, feature_matrix, zscores
+
+
+@pytest.fixture(scope='module')
+def players():
+    rng = np.random.default_rng(11)
+    players = []
+    for i in range(80):
+        games = int(rng.integers(0, 60))
+        player = {name: int(rng.integers(0, 30)) * games for name in PER_GAME_FIELDS}
+        player.update(player_id=100 + i, games_played=games, fg_pct=float(rng.uniform(0.35, 0.6)),
+                      ft_pct=float(rng.uniform(0.5, 0.9)), injury_status=['Healthy', 'Out', None][i % 3])
+        players.append(player)
+    return players
+
+
+def brute_force(players, player_id, k, keep=lambda player: True):
+    matrix, games_played = feature_matrix(players)
+    rows = np.flatnonzero(games_played >= similarity.MIN_GAMES)
+    vectors = zscores(matrix[rows])
+    slot = list(rows).index(next(row for row, player in enumerate(players) if player['player_id'] == player_id))
+    distances = np.sqrt(((vectors - vectors[slot]) ** 2).sum(axis=1))
+    order = [i for i in np.argsort(distances, kind='stable') if i != slot and keep(players[rows[i]])]
+    return rows[order[:k]].tolist(), distances[order[:k]]
+
+
+def test_neighbors_match_brute_force_across_blocks(players, monkeypatch):
+    monkeypatch.setattr(similarity, 'BLOCK_ROWS', 16)
+    index = SimilarityIndex(players, neighbors=20)
+    for player in players:
+        result = index.query(player['player_id'], k=10)
+        if player['games_played'] < similarity.MIN_GAMES:
+            assert result is None and index.row(player['player_id']) is None
+            continue
+        rows, distances = result
+        expected_rows, expected_distances = brute_force(players, player['player_id'], 10)
+        assert distances == pytest.approx(expected_distances, rel=1e-4, abs=1e-4)
+        assert rows.tolist() == expected_rows
+
+
+def test_filters_fall_back_to_a_full_scan(players):
+    index = SimilarityIndex(players, neighbors=3)
+    player_id = next(player['player_id'] for player in players if player['games_played'] >= similarity.MIN_GAMES)
+    rows, distances = index.query(player_id, k=5, mask=index.healthy)
+    expected_rows, expected_distances = brute_force(
+        players, player_id, 5, lambda player: player['injury_status'] in ('Healthy', None))
+    assert rows.tolist() == expected_rows
+    assert distances == pytest.approx(expected_distances, rel=1e-4, abs=1e-4)
+    assert all(index.healthy[row] for row in rows)
+
+
+def test_patched_index_only_rebuilds_the_injury_mask(players):
+    table = PlayerTable(players)
+    index = SimilarityIndex(players)
+    assert index.patched(table, {'age'}) is index
+    patched = index.patched(table.patched({0: {'injury_status': 'Out'}, 1: {'injury_status': 'Healthy'}}),
+                            {'injury_status'})
+    assert not patched.healthy[0] and patched.healthy[1]
+    assert index.healthy[0] and not index.healthy[1]
+    assert patched.neighbors is index.neighbors
@@ -0,0 +1,294 @@
+"""
+Resilient client for the NBA and ESPN upstreams.
+Every call goes through a per-host token bucket and circuit breaker, transient
+failures are retried with jittered exponential backoff, and ESPN responses are
+revalidated with If-None-Match / If-Modified-Since so unchanged data costs a 304.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from metrics import (
+    CIRCUIT_OPEN, UPSTREAM_ERRORS, UPSTREAM_LATENCY, UPSTREAM_NOT_MODIFIED, UPSTREAM_RETRIES
+)
+from startup import lazy_import
+
+# Statuses worth retrying, anything else is returned to the caller as-is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Requests per second and burst size per host (stats.nba.com throttles aggressive clients)
+RATE_LIMITS = {
+    'stats.nba.com': (2, 4),
+    'default': (50, 30)  # a full round of 30 roster requests goes out in one burst
+}
+
+
+class UpstreamError(Exception):
+    """An upstream call failed after all retries"""
+
+
+class CircuitOpenError(UpstreamError):
+    """The host's circuit breaker is open, the call was not attempted"""
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failed calls and fails fast until
+    reset_timeout has passed, then lets a single probe call through (half-open).
+    """
+
+    def __init__(self, host, failure_threshold=5, reset_timeout=30):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if self.probing or time.time() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self):
+        """Whether a call may go out now"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if not self.probing and time.time() - self.opened_at >= self.reset_timeout:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+        CIRCUIT_OPEN.set(0, host=self.host)
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self.probing:
+                    print(f"⛔ Circuit open for {self.host} after {self.failures} failures")
+                self.opened_at = time.time()
+            self.probing = False
+        if self.opened_at is not None:
+            CIRCUIT_OPEN.set(1, host=self.host)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; reserve() returns how long the caller must wait for its token"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+
+class UpstreamClient:
+    """Retrying, rate-limited, circuit-broken GETs shared by all upstream fetches"""
+
+    def __init__(self, loop_thread, attempts=3, backoff=0.25, max_backoff=4, timeout=10, connect_timeout=3):
+        self.loop_thread = loop_thread
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeouts = {'total': timeout, 'connect': connect_timeout}
+        self.timeout = None  # aiohttp.ClientTimeout, built on the first request
+        self.breakers = {}
+        self.limiters = {}
+        self.validators = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def breaker(self, host):
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(host)
+            return self.breakers[host]
+
+    def limiter(self, host):
+        with self.lock:
+            if host not in self.limiters:
+                self.limiters[host] = TokenBucket(*RATE_LIMITS.get(host, RATE_LIMITS['default']))
+            return self.limiters[host]
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, honouring a numeric Retry-After"""
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    @contextmanager
+    def budget(self, seconds):
+        """
+        Give the upstream calls made by this thread until seconds from now, retries included,
+        so a fetch that its caller has given up on stops retrying instead of holding a worker
+        """
+        previous = self.current_deadline()
+        self.local.deadline = time.monotonic() + seconds
+        try:
+            yield self.local.deadline
+        finally:
+            self.local.deadline = previous
+
+    def current_deadline(self):
+        """time.monotonic() deadline of this thread's budget, None when unbounded"""
+        return getattr(self.local, 'deadline', None)
+
+    def next_attempt(self, deadline, attempt, retry_after=None):
+        """Backoff before the next attempt, None when there is none (out of attempts or the budget)"""
+        if attempt + 1 >= self.attempts:
+            return None
+        delay = self.backoff_delay(attempt, retry_after)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    def check_breaker(self, host, source, team=''):
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            UPSTREAM_ERRORS.inc(source=source, team=team, reason='circuit_open')
+            raise CircuitOpenError(f'{host} circuit open')
+        return breaker
+
+    async def get_json(self, url, source, team='', deadline=None):
+        """
+        GET a JSON resource on the shared session. Returns (status, data): 200 with fresh data,
+        304 with the data last returned for this URL, or a non-retryable error status with None.
+        Attempts are cut short at deadline (a time.monotonic() value, see budget()).
+        Raises UpstreamError when retries or the deadline are exhausted or the circuit is open.
+        """
+        host = urlsplit(url).netloc
+        breaker = self.check_breaker(host, source, team)
+        session = await self.loop_thread.get_session()
+        aiohttp = lazy_import('aiohttp')
+        if self.timeout is None:
+            self.timeout = aiohttp.ClientTimeout(**self.timeouts)
+
+        cached = self.validators.get(url)
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        reason = None
+        for attempt in range(self.attempts):
+            wait = self.limiter(host).reserve()
+            if wait:
+                await asyncio.sleep(wait)
+
+            timeout = self.timeout
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    reason = reason or 'deadline'
+                    break
+                timeout = aiohttp.ClientTimeout(total=min(self.timeouts['total'], left),
+                                                connect=min(self.timeouts['connect'], left))
+
+            retry_after = None
+            try:
+                with UPSTREAM_LATENCY.time(source=source, team=team):
+                    async with session.get(url, headers=headers, timeout=timeout) as response:
+                        if response.status == 304 and cached:
+                            breaker.record_success()
+                            UPSTREAM_NOT_MODIFIED.inc(source=source)
+                            return 304, cached['data']
+
+                        if response.status == 200:
+                            data = await response.json(content_type=None)
+                            breaker.record_success()
+                            etag = response.headers.get('ETag')
+                            last_modified = response.headers.get('Last-Modified')
+                            if etag or last_modified:
+                                self.validators[url] = {'etag': etag, 'last_modified': last_modified, 'data': data}
+                            return 200, data
+
+                        reason = f'http_{response.status}'
+                        if response.status not in RETRY_STATUSES:
+                            # Client errors won't improve with retries and don't mean the host is down
+                            breaker.record_success()
+                            UPSTREAM_ERRORS.inc(source=source, team=team, reason=reason)
+                            return response.status, None
+                        retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                reason = type(e).__name__
+
+            UPSTREAM_ERRORS.inc(source=source, team=team, reason=reason)
+            delay = self.next_attempt(deadline, attempt, retry_after)
+            if delay is None:
+                break
+            UPSTREAM_RETRIES.inc(host=host)
+            await asyncio.sleep(delay)
+
+        if reason != 'deadline':
+            breaker.record_failure()
+        raise UpstreamError(f'{host}: {reason}')
+
+    def call(self, host, source, fn, *args, **kwargs):
+        """
+        Run a blocking upstream call (e.g. an nba_api endpoint) with the same retry, rate limit and
+        breaker. Attempts stop at the calling thread's budget, and a timeout keyword argument is
+        capped to the time left in it.
+        """
+        deadline = self.current_deadline()
+        breaker = self.check_breaker(host, source)
+        reason = None
+        for attempt in range(self.attempts):
+            wait = self.limiter(host).reserve()
+            if wait:
+                time.sleep(wait)
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    reason = reason or 'deadline'
+                    break
+                if 'timeout' in kwargs:
+                    kwargs['timeout'] = min(kwargs['timeout'], left)
+            try:
+                with UPSTREAM_LATENCY.time(source=source, team=''):
+                    result = fn(*args, **kwargs)
+                breaker.record_success()
+                return result
+            except Exception as e:
+                reason = type(e).__name__
+                UPSTREAM_ERRORS.inc(source=source, team='', reason=reason)
+            delay = self.next_attempt(deadline, attempt)
+            if delay is None:
+                break
+            UPSTREAM_RETRIES.inc(host=host)
+            time.sleep(delay)
+
+        if reason != 'deadline':
+            breaker.record_failure()
+        raise UpstreamError(f'{host}: {reason}')
+
+    def stats(self):
+        """Circuit breaker states per host for the health endpoint"""
+        with self.lock:
+            breakers = list(self.breakers.values())
+        return {breaker.host: breaker.state for breaker in breakers}
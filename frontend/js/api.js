@@ -78,6 +78,11 @@ async function checkBackend() {
             }
         }
         
+        // Add older seasons to the season dropdown
+        if (data.available_seasons) {
+            populateSeasonDropdown(data.available_seasons);
+        }
+        
         return data;
     } catch (error) {
         throw new Error('Backend server not running. Start it with: python3 backend/app.py');
@@ -165,3 +170,54 @@ async function fetchLastSeasonPlayerData() {
     }
 }
 
+
+
+// Season label shown in the dropdown for a stats season (rankings use the previous season's stats)
+function displaySeasonFor(statsSeason) {
+    const startYear = parseInt(statsSeason.split('-')[0]) + 1;
+    return `${startYear}-${String(startYear + 1).slice(2)}`;
+}
+
+// Add dropdown items for historical seasons (the first two are the current and last season)
+function populateSeasonDropdown(availableSeasons) {
+    const dropdownMenu = document.getElementById('season-dropdown-menu');
+    if (!dropdownMenu) return;
+    
+    availableSeasons.slice(2).forEach(statsSeason => {
+        const displaySeason = displaySeasonFor(statsSeason);
+        if (dropdownMenu.querySelector(`[data-season="${displaySeason}"]`)) return;
+        
+        const item = document.createElement('div');
+        item.className = 'season-dropdown-item';
+        item.dataset.season = displaySeason;
+        item.dataset.statsSeason = statsSeason;
+        item.textContent = `${displaySeason} Season`;
+        dropdownMenu.appendChild(item);
+    });
+}
+
+// Fetch player data for any stats season from backend
+async function fetchSeasonPlayerData(statsSeason) {
+    updateStatus(`Fetching ${statsSeason} player data...`, 'loading');
+    
+    try {
+        const response = await fetch(`${API_BASE_URL}/players/${statsSeason}`);
+        
+        if (!response.ok) {
+            const errorData = await response.json();
+            throw new Error(errorData.message || `Failed to fetch ${statsSeason} data`);
+        }
+        
+        const data = await response.json();
+        
+        // Hide the status message completely after successful load
+        const statusEl = document.getElementById('status');
+        statusEl.style.display = 'none';
+        
+        return data.players;
+        
+    } catch (error) {
+        updateStatus(`Error: ${error.message}`, 'error');
+        throw error;
+    }
+}
\ No newline at end of file
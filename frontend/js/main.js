@@ -8,7 +8,7 @@ async function fetchAndDisplayPlayers() {
         // Calculate fantasy values for ALL players
         const playersWithFantasyValues = players.map(player => ({
             ...player,
-            fantasyValue: fantasyAlgorithm.calculateFantasyValue(player)
+            fantasyValue: player.fantasy_value ?? fantasyAlgorithm.calculateFantasyValue(player)
         }));
         
         // Update the global playersData with fantasy values
@@ -176,7 +176,7 @@ function setupSeasonToggle() {
                     // Calculate fantasy values for last season data
                     const playersWithFantasyValues = lastSeasonData.map(player => ({
                         ...player,
-                        fantasyValue: fantasyAlgorithm.calculateFantasyValue(player)
+                        fantasyValue: player.fantasy_value ?? fantasyAlgorithm.calculateFantasyValue(player)
                     }));
                     lastSeasonData = playersWithFantasyValues;
                     window.lastSeasonData = lastSeasonData;
@@ -227,12 +227,16 @@ async function updateRankingsForSeason(selectedSeason) {
         } else if (selectedSeason === '2024-25') {
             // Last season - use last season API endpoint
             playersData = await fetchLastSeasonPlayerData();
+        } else {
+            // Older seasons - use the generic season endpoint
+            const item = document.querySelector(`.season-dropdown-item[data-season="${selectedSeason}"]`);
+            playersData = await fetchSeasonPlayerData(item.dataset.statsSeason);
         }
         
         // Calculate fantasy values
         const playersWithFantasyValues = playersData.map(player => ({
             ...player,
-            fantasyValue: fantasyAlgorithm.calculateFantasyValue(player)
+            fantasyValue: player.fantasy_value ?? fantasyAlgorithm.calculateFantasyValue(player)
         }));
         
         // Update global data and display
@@ -362,12 +362,16 @@ function displayPlayers(players, searchTerm = '', teamFilter = 'all', positionFi
     countInfo.textContent = `Showing ${filteredPlayers.length} of ${players.length} players`;
     playerListEl.parentElement.insertBefore(countInfo, playerListEl);
     
-    // Calculate fantasy rankings for all players (sorted by fantasy value)
-    const allPlayersSorted = [...players].sort((a, b) => (b.fantasyValue || 0) - (a.fantasyValue || 0));
+    // Use server-computed overall ranks, only fall back to sorting when they are missing
     const fantasyRankings = new Map();
-    allPlayersSorted.forEach((player, index) => {
-        fantasyRankings.set(player.player_id, index + 1);
-    });
+    if (players.every(player => player.overall_rank)) {
+        players.forEach(player => fantasyRankings.set(player.player_id, player.overall_rank));
+    } else {
+        const allPlayersSorted = [...players].sort((a, b) => (b.fantasyValue || 0) - (a.fantasyValue || 0));
+        allPlayersSorted.forEach((player, index) => {
+            fantasyRankings.set(player.player_id, index + 1);
+        });
+    }
 
 
     // Create and set player cards